@@ -1,14 +1,16 @@
 from typing import Dict, List, Any
 from core_scraping.base.base_scrape import BaseScraper
+from core_scraping.base.html_parser import get_html_parser
 import aiohttp
 import logging
 
 class BaseTextScraper(BaseScraper):
     """Base class for all text-based scrapers"""
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, parser: str = None):
         super().__init__(name)
         self.session = None
+        self.parser = get_html_parser(parser)
         
     async def __aenter__(self):
         """Setup async context with HTTP session"""
@@ -40,15 +42,19 @@ class BaseTextScraper(BaseScraper):
         # Normalize unicode if needed
         return text.strip()
         
-    async def _extract_text_content(self, html_content: str, selectors: List[str]) -> str:
-        """Extract text content using CSS selectors"""
+    async def _extract_text_content(self, html_content: str, selectors: List[str],
+                                    limit: int = None) -> str:
+        """Extract text content using CSS selectors, at most limit elements per selector"""
         try:
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
+            if limit is None:
+                document = self.parser.parse(html_content)
+                matches = [document.select(selector) for selector in selectors]
+            else:
+                # Partial parsing can stop early, so run each selector separately
+                matches = [self.parser.select(html_content, selector, limit) for selector in selectors]
             text_parts = []
-            for selector in selectors:
-                elements = soup.select(selector)
-                text_parts.extend([elem.get_text() for elem in elements])
+            for elements in matches:
+                text_parts.extend([elem.text() for elem in elements])
             return "\n".join(text_parts)
         except Exception as e:
             self.logger.error(f"Error extracting text content: {str(e)}")
@@ -1,13 +1,19 @@
 from typing import Dict, List, Any
-from bs4 import BeautifulSoup
 from .base_text_scraper import BaseTextScraper
 from datetime import datetime
 
+# CSS equivalents of the tag/class patterns common to news sites
+ARTICLE_SELECTOR = 'article.article, article.post, div.article, div.post'
+TITLE_SELECTOR = 'h1, h2'
+CONTENT_SELECTOR = 'p.content, p.article-body, div.content, div.article-body'
+AUTHOR_SELECTOR = 'span.author, span.byline, a.author, a.byline'
+DATE_SELECTOR = 'time.date, time.published, span.date, span.published'
+
 class NewsScraper(BaseTextScraper):
     """Scraper for news articles"""
     
-    def __init__(self):
-        super().__init__(name="news")
+    def __init__(self, parser: str = None):
+        super().__init__(name="news", parser=parser)
         
     async def scrape(self, params: Dict[str, Any]) -> List[Dict]:
         """Scrape news articles based on provided parameters"""
@@ -21,11 +27,10 @@ class NewsScraper(BaseTextScraper):
             if not html_content:
                 return []
                 
-            soup = BeautifulSoup(html_content, 'html.parser')
             articles = []
             
             # Extract articles based on common news site patterns
-            for article in soup.find_all(['article', 'div'], class_=['article', 'post']):
+            for article in self.parser.select(html_content, ARTICLE_SELECTOR):
                 article_data = {
                     'url': url,
                     'timestamp': datetime.utcnow().isoformat(),
@@ -44,20 +49,20 @@ class NewsScraper(BaseTextScraper):
             
     def _extract_title(self, article_soup) -> str:
         """Extract article title"""
-        title_tag = article_soup.find(['h1', 'h2'])
-        return title_tag.get_text().strip() if title_tag else ""
+        title_tag = article_soup.select_one(TITLE_SELECTOR)
+        return title_tag.text().strip() if title_tag else ""
         
     def _extract_content(self, article_soup) -> str:
         """Extract article content"""
-        content_tags = article_soup.find_all(['p', 'div'], class_=['content', 'article-body'])
-        return " ".join(tag.get_text().strip() for tag in content_tags)
+        content_tags = article_soup.select(CONTENT_SELECTOR)
+        return " ".join(tag.text().strip() for tag in content_tags)
         
     def _extract_author(self, article_soup) -> str:
         """Extract article author"""
-        author_tag = article_soup.find(['span', 'a'], class_=['author', 'byline'])
-        return author_tag.get_text().strip() if author_tag else ""
+        author_tag = article_soup.select_one(AUTHOR_SELECTOR)
+        return author_tag.text().strip() if author_tag else ""
         
     def _extract_date(self, article_soup) -> str:
         """Extract article publication date"""
-        date_tag = article_soup.find(['time', 'span'], class_=['date', 'published'])
-        return date_tag.get('datetime', '') if date_tag else ""
+        date_tag = article_soup.select_one(DATE_SELECTOR)
+        return date_tag.attrs.get('datetime', '') if date_tag else ""
@@ -0,0 +1,78 @@
+import pytest
+from core_scraping.base.html_parser import available_backends, get_html_parser
+from src.scrapers.news_scraper import ARTICLE_SELECTOR, NewsScraper
+
+ARTICLE = '''
+<article class="post">
+  <h2>Headline {n}</h2>
+  <span class="byline">Reporter {n}</span>
+  <time class="published" datetime="2024-05-0{n}">May {n}</time>
+  <p class="content">First paragraph of story {n}.</p>
+  <div class="article-body">Second <b>paragraph</b> of story {n}.</div>
+</article>
+'''
+
+PAGE = (
+    '<html><body><div class="post"><h1>Pinned</h1></div>'
+    + ''.join(ARTICLE.format(n=n) for n in range(1, 6))
+    + '<aside><p class="content">Not in an article</p></aside></body></html>'
+)
+
+async def scrape(backend):
+    scraper = NewsScraper(parser=backend)
+    
+    async def fetch(url, headers=None):
+        return PAGE
+        
+    scraper._fetch_url = fetch
+    articles = await scraper.scrape({'url': 'https://news.example/latest'})
+    for article in articles:
+        article.pop('timestamp')
+    return articles
+    
+@pytest.mark.asyncio
+@pytest.mark.parametrize('backend', available_backends())
+async def test_backends_extract_the_same_articles(backend):
+    expected = await scrape('bs4')
+    articles = await scrape(backend)
+    
+    assert len(articles) == 6
+    assert articles == expected
+    assert articles[1] == {
+        'url': 'https://news.example/latest',
+        'title': 'Headline 1',
+        'content': 'First paragraph of story 1. Second paragraph of story 1.',
+        'author': 'Reporter 1',
+        'published_date': '2024-05-01'
+    }
+    
+@pytest.mark.asyncio
+@pytest.mark.parametrize('backend', available_backends())
+async def test_backends_extract_the_same_text_content(backend):
+    selectors = ['h2', 'p.content']
+    expected = await NewsScraper(parser='bs4')._extract_text_content(PAGE, selectors)
+    
+    text = await NewsScraper(parser=backend)._extract_text_content(PAGE, selectors)
+    limited = await NewsScraper(parser=backend)._extract_text_content(PAGE, selectors, limit=2)
+    
+    assert text == expected
+    assert limited.split('\n') == [
+        'Headline 1', 'Headline 2', 'First paragraph of story 1.', 'First paragraph of story 2.'
+    ]
+    
+NESTED_PAGE = (
+    '<article class="post"><h2>Outer</h2>'
+    '<article class="post"><h2>Inner</h2></article></article>'
+    '<article class="post"><h2>Last</h2></article>'
+)
+
+@pytest.mark.parametrize('backend', available_backends())
+@pytest.mark.parametrize('limit', [None, 1, 2])
+def test_backends_keep_nested_matches_in_document_order(backend, limit):
+    expected = get_html_parser('bs4').select(NESTED_PAGE, ARTICLE_SELECTOR, limit)
+    
+    articles = get_html_parser(backend).select(NESTED_PAGE, ARTICLE_SELECTOR, limit)
+    
+    titles = [article.select_one('h2').text() for article in articles]
+    assert titles == [article.select_one('h2').text() for article in expected]
+    assert titles == ['Outer', 'Inner', 'Last'][:limit]
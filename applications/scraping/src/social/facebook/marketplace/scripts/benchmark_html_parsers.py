@@ -0,0 +1,51 @@
+"""Time listing extraction from saved pages with each HTML parser backend.
+
+Usage: python scripts/benchmark_html_parsers.py [PAGE_DIR] [--repeat N]
+
+PAGE_DIR defaults to tests/fixtures/pages; every *.html file in it is parsed
+by each installed backend, with and without a listing limit.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.scraper.html_parser import available_backends, get_html_parser
+from src.scraper.static_scraper import LISTING_SELECTOR
+
+def time_parse(parser, html: str, repeat: int, limit: int = None) -> float:
+    """Median seconds to select and read every listing in one document"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for listing in parser.select(html, LISTING_SELECTOR, limit):
+            listing.select_one('h2').text()
+            listing.select_one('a').attrs.get('href')
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arguments.add_argument('pages', nargs='?', default='tests/fixtures/pages')
+    arguments.add_argument('--repeat', type=int, default=20)
+    arguments.add_argument('--limit', type=int, default=10)
+    options = arguments.parse_args()
+    
+    pages = sorted(Path(options.pages).glob('*.html'))
+    if not pages:
+        sys.exit(f"No .html pages in {options.pages}")
+        
+    print(f"{'page':<32} {'backend':<12} {'KiB':>6} {'full ms':>9} {f'first {options.limit} ms':>12}")
+    for page in pages:
+        html = page.read_text()
+        for backend in available_backends():
+            parser = get_html_parser(backend)
+            full = time_parse(parser, html, options.repeat)
+            partial = time_parse(parser, html, options.repeat, options.limit)
+            print(f"{page.name:<32} {backend:<12} {len(html) / 1024:>6.0f} {full * 1000:>9.2f} {partial * 1000:>12.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+class MemoryBackend:
+    """In-process TTL-LRU of cached responses"""
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generation = 0
+        
+    async def generation(self) -> int:
+        return self._generation
+        
+    async def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+        
+    async def set(self, key: str, value: dict, ttl: float):
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            
+    async def bump(self):
+        self._generation += 1
+        self._entries.clear()
+        
+    async def close(self):
+        pass
+
+class RedisBackend:
+    """Cached responses in Redis (or anything speaking its protocol).
+    
+    Entries live under the current generation, which ``bump`` increments,
+    so every API process sharing the server sees an invalidation at once.
+    Entries of old generations simply expire.
+    """
+    def __init__(self, url: str, prefix: str = 'marketplace:response'):
+        import redis.asyncio as redis
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+        
+    async def generation(self) -> int:
+        return int(await self.client.get(f"{self.prefix}:generation") or 0)
+        
+    async def get(self, key: str):
+        value = await self.client.get(f"{self.prefix}:{key}")
+        return json.loads(value) if value is not None else None
+        
+    async def set(self, key: str, value: dict, ttl: float):
+        await self.client.set(f"{self.prefix}:{key}", json.dumps(value), px=int(ttl * 1000))
+        
+    async def bump(self):
+        await self.client.incr(f"{self.prefix}:generation")
+        
+    async def close(self):
+        await self.client.close()
+
+class ResponseCache:
+    """Cache of serialized GET responses keyed by path and query parameters.
+    
+    Entries carry a strong ETag, so clients sending If-None-Match get a
+    304 without a body. ``invalidate`` drops everything cached so far and
+    is called by the pipeline whenever it commits new listings; ``ttl``
+    bounds staleness from anything else, such as the sliding ``hours``
+    window. Backend errors are logged and treated as misses.
+    """
+    def __init__(self, backend=None, ttl: float = 60):
+        self.backend = backend or MemoryBackend()
+        self.ttl = ttl
+        
+    @staticmethod
+    def make_key(request: Request) -> str:
+        params = sorted(request.query_params.multi_items())
+        return hashlib.sha256(
+            json.dumps([request.url.path, params]).encode()
+        ).hexdigest()
+        
+    async def respond(self, request: Request, compute) -> Response:
+        """Serve request from the cache, calling compute() on a miss.
+        
+        ``compute`` returns the JSON-serializable body and extra headers.
+        """
+        key = self.make_key(request)
+        entry = None
+        try:
+            key = f"{await self.backend.generation()}:{key}"
+            entry = await self.backend.get(key)
+        except Exception as e:
+            logger.error(f"Response cache lookup failed: {str(e)}")
+            
+        if entry is None:
+            content, headers = await compute()
+            body = json.dumps(jsonable_encoder(content))
+            entry = {
+                'body': body,
+                'headers': headers,
+                'etag': f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"'
+            }
+            try:
+                # Written under the generation read above: if the pipeline
+                # invalidated in between, this entry is never served
+                await self.backend.set(key, entry, self.ttl)
+            except Exception as e:
+                logger.error(f"Response cache store failed: {str(e)}")
+                
+        headers = {**entry['headers'], 'ETag': entry['etag'], 'Cache-Control': 'no-cache'}
+        if _etag_matches(request.headers.get('if-none-match'), entry['etag']):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry['body'], media_type='application/json', headers=headers)
+        
+    async def invalidate(self):
+        try:
+            await self.backend.bump()
+        except Exception as e:
+            logger.error(f"Response cache invalidation failed: {str(e)}")
+            
+    async def close(self):
+        await self.backend.close()
+
+def _etag_matches(if_none_match, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or any((tag[2:] if tag.startswith('W/') else tag) == etag for tag in tags)
+
+_response_cache = None
+
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache.
+    
+    Set RESPONSE_CACHE_URL (e.g. redis://localhost:6379/0) to share it
+    through Redis; without it, or without the redis package, responses
+    are cached in process.
+    """
+    global _response_cache
+    if _response_cache is None:
+        backend = None
+        url = os.getenv('RESPONSE_CACHE_URL')
+        if url:
+            try:
+                backend = RedisBackend(url)
+            except ImportError:
+                logger.warning("redis is not installed; caching responses in process")
+        _response_cache = ResponseCache(backend)
+    return _response_cache
@@ -1,49 +1,165 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.database.session import get_db_session
+from src.database.session import get_primary_read_session, read_session
 from src.database.models import MarketplaceListing, ListingAnalysis
+from src.api.cache import get_response_cache
 from typing import List, Optional
 from datetime import datetime, timedelta
+import base64
+import json
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Columns clients may request through ?fields=
+LISTING_COLUMNS = {column.name: column for column in MarketplaceListing.__table__.columns}
+
 @router.get("/listings/")
 async def get_listings(
+    request: Request,
     category: Optional[str] = None,
     hours: Optional[int] = 24,
-    session: AsyncSession = Depends(get_db_session)
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    format: str = Query("json", regex="^(json|ndjson)$"),
+    session: AsyncSession = Depends(get_primary_read_session)
 ):
-    """Get marketplace listings with optional filtering"""
+    """Get marketplace listings, newest first, one keyset page at a time.
+    
+    ``fields`` is a comma-separated column list. The next page's cursor is
+    returned in the X-Next-Cursor header, or for ``format=ndjson`` as a
+    final {"next_cursor": ...} line. JSON pages are served from the
+    response cache and so read from the primary; uncached NDJSON streams
+    read from the replica when there is one.
+    """
     try:
-        query = session.query(MarketplaceListing)
+        columns = _listing_columns(fields)
+        query = _listings_query(columns, category, hours, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
         
-        if category:
-            query = query.filter(MarketplaceListing.category == category)
+    try:
+        if format == "ndjson":
+            return StreamingResponse(
+                _stream_listings(query, columns, limit),
+                media_type="application/x-ndjson"
+            )
             
-        if hours:
-            time_threshold = datetime.utcnow() - timedelta(hours=hours)
-            query = query.filter(MarketplaceListing.created_at >= time_threshold)
+        async def compute():
+            rows = (await session.execute(query)).mappings().all()
+            listings = [_project(row, columns) for row in rows[:limit]]
+            headers = {}
+            if len(rows) > limit:
+                headers["X-Next-Cursor"] = encode_cursor(rows[limit - 1])
+            return listings, headers
             
-        return await query.all()
+        return await get_response_cache().respond(request, compute)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def encode_cursor(row) -> str:
+    """Opaque cursor for the position after row"""
+    position = json.dumps([row["created_at"].isoformat(), row["id"]])
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, listing_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(listing_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def _listing_columns(fields: Optional[str]) -> List[str]:
+    if not fields:
+        return list(LISTING_COLUMNS)
+    columns = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [column for column in columns if column not in LISTING_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return columns
+
+def _listings_query(columns, category, hours, cursor, limit):
+    # created_at and id are always read: they order the page and build the cursor
+    selected = list(dict.fromkeys(columns + ["created_at", "id"]))
+    query = select(*(LISTING_COLUMNS[column] for column in selected))
+    
+    if category:
+        query = query.where(MarketplaceListing.category == category)
+        
+    if hours:
+        time_threshold = datetime.utcnow() - timedelta(hours=hours)
+        query = query.where(MarketplaceListing.created_at >= time_threshold)
+        
+    if cursor:
+        query = query.where(
+            tuple_(MarketplaceListing.created_at, MarketplaceListing.id) < decode_cursor(cursor)
+        )
+        
+    # One extra row tells whether another page follows
+    return query.order_by(
+        MarketplaceListing.created_at.desc(), MarketplaceListing.id.desc()
+    ).limit(limit + 1)
+
+def _project(row, columns) -> dict:
+    return {column: row[column] for column in columns}
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+async def _stream_listings(query, columns, limit):
+    """Stream a page as NDJSON from a server-side cursor"""
+    # A session of its own: the request's dependency may close before streaming ends
+    async with read_session() as session:
+        result = await session.stream(query)
+        count = 0
+        last = None
+        async for row in result.mappings():
+            if count == limit:
+                yield json.dumps({"next_cursor": encode_cursor(last)}) + "\n"
+                break
+            yield json.dumps(_project(row, columns), default=_json_default) + "\n"
+            last = row
+            count += 1
+
 @router.get("/listings/{listing_id}/analysis")
 async def get_listing_analysis(
     listing_id: int,
-    session: AsyncSession = Depends(get_db_session)
+    request: Request,
+    session: AsyncSession = Depends(get_primary_read_session)
 ):
     """Get analysis for a specific listing"""
     try:
-        analysis = await session.query(ListingAnalysis)\
-            .filter(ListingAnalysis.listing_id == listing_id)\
-            .first()
+        async def compute():
+            result = await session.execute(
+                select(ListingAnalysis.__table__)
+                .where(ListingAnalysis.listing_id == listing_id)
+                .order_by(ListingAnalysis.analyzed_at.desc())
+                .limit(1)
+            )
+            analysis = result.mappings().first()
+            if not analysis:
+                raise HTTPException(status_code=404, detail="Analysis not found")
+            return dict(analysis), {}
             
-        if not analysis:
-            raise HTTPException(status_code=404, detail="Analysis not found")
-            
-        return analysis
+        return await get_response_cache().respond(request, compute)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/schedule")
+async def get_schedule(request: Request):
+    """Get the category polling schedule"""
+    scheduler = getattr(request.app.state, 'scheduler', None)
+    if scheduler is None:
+        raise HTTPException(status_code=503, detail="Scheduler not started")
+    return scheduler.schedule()
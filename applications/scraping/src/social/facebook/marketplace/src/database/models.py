@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, ForeignKey, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -6,6 +6,11 @@ Base = declarative_base()
 
 class MarketplaceListing(Base):
     __tablename__ = 'marketplace_listings'
+    __table_args__ = (
+        # Keyset pages are ordered by (created_at, id), optionally within a category
+        Index('ix_marketplace_listings_category_created_at', 'category', 'created_at', 'id'),
+        Index('ix_marketplace_listings_created_at', 'created_at', 'id'),
+    )
     
     id = Column(Integer, primary_key=True)
     listing_id = Column(String(100), unique=True)
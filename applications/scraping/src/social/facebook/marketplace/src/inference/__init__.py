@@ -0,0 +1,12 @@
+from .batching import BatchInferenceEngine
+from .cache import InferenceCache, get_result_cache
+from .registry import ModelRegistry, model_registry, get_pipeline
+
+__all__ = [
+    'BatchInferenceEngine',
+    'InferenceCache',
+    'get_result_cache',
+    'ModelRegistry',
+    'model_registry',
+    'get_pipeline'
+]
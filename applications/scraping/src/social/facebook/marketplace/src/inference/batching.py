@@ -0,0 +1,149 @@
+import asyncio
+import time
+from src.inference.registry import model_registry
+from src.logging.logger import get_logger
+from src.monitoring.metrics import INFERENCE_BATCH_SIZE
+
+logger = get_logger(__name__)
+
+class BatchInferenceEngine:
+    """Micro-batches single-text calls to a HuggingFace pipeline.
+    
+    Texts submitted concurrently are collected for up to ``max_wait`` seconds
+    or until ``max_batch_size`` are queued, then run as one padded batch in a
+    worker thread so inference never blocks the event loop. Results come back
+    in submission order.
+    
+    With a ``cache``, texts already seen by the same model with the same call
+    parameters skip inference, and identical texts in flight share one call.
+    """
+    def __init__(self, model, name: str = 'default', max_batch_size: int = 16,
+                 max_wait: float = 0.05, executor=None, cache=None,
+                 model_id: str = None, **call_kwargs):
+        self.model = model
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.call_kwargs = call_kwargs
+        self.cache = cache
+        self.model_id = model_id or model_registry.describe(model) or name
+        # Shared with every other engine on this pipeline; the registry shuts it down
+        self.executor = executor or model_registry.executor(model, name)
+        self._queue = None
+        self._worker = None
+        self._loop = None
+        self._inflight = {}
+        
+    async def submit(self, text: str):
+        """Queue one text and wait for its model output"""
+        self._ensure_worker()
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(self.model_id, text, self.call_kwargs)
+            cached = self.cache.get_memory(key)
+            if cached is None:
+                cached = await self._loop.run_in_executor(None, self.cache.get, key)
+            if cached is not None:
+                return cached
+            if key in self._inflight:
+                return await asyncio.shield(self._inflight[key])
+                
+        future = self._loop.create_future()
+        if key is not None:
+            self._inflight[key] = future
+        try:
+            await self._queue.put((text, key, future))
+            return await asyncio.shield(future)
+        finally:
+            if key is not None and self._inflight.get(key) is future:
+                del self._inflight[key]
+                
+    async def submit_many(self, texts):
+        """Run several texts, returning outputs in the same order"""
+        return await asyncio.gather(*(self.submit(text) for text in texts))
+        
+    async def close(self):
+        """Stop the batching worker, failing anything still queued"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError('Inference engine closed'))
+        self._worker = None
+        self._queue = None
+        
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._inflight = {}
+            self._worker = loop.create_task(self._run())
+            
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+                    
+            texts = [text for text, _, _ in batch]
+            keys = [key for _, key, _ in batch]
+            futures = [future for _, _, future in batch]
+            try:
+                outputs = await self._loop.run_in_executor(
+                    self.executor, self._infer_and_cache, texts, keys
+                )
+            except Exception as e:
+                outputs = [e] * len(batch)
+            for future, output in zip(futures, outputs):
+                if future.done():
+                    continue
+                if isinstance(output, Exception):
+                    future.set_exception(output)
+                else:
+                    future.set_result(output)
+                    
+    def _infer_and_cache(self, texts, keys):
+        outputs = self._infer(texts)
+        if self.cache is not None:
+            try:
+                self.cache.set_many([
+                    (key, output) for key, output in zip(keys, outputs)
+                    if not isinstance(output, Exception)
+                ])
+            except Exception as e:
+                logger.error(f"Caching {self.name} results failed: {str(e)}")
+        return outputs
+        
+    def _infer(self, texts):
+        """Run one batch in the worker thread, isolating failing inputs"""
+        start_time = time.time()
+        # HF pipelines default to batch_size=1 and would run the texts one by one
+        call_kwargs = {'batch_size': len(texts), **self.call_kwargs}
+        try:
+            outputs = self.model(texts, **call_kwargs)
+            if isinstance(outputs, dict):
+                outputs = [outputs]
+            if len(outputs) != len(texts):
+                raise ValueError(f"Expected {len(texts)} outputs, got {len(outputs)}")
+        except Exception as e:
+            if len(texts) == 1:
+                return [e]
+            logger.warning(f"Batch of {len(texts)} failed on {self.name}, retrying one by one: {str(e)}")
+            return [self._infer([text])[0] for text in texts]
+        INFERENCE_BATCH_SIZE.labels(model=self.name).observe(len(texts))
+        logger.debug(f"{self.name} ran a batch of {len(texts)} in {time.time() - start_time:.2f}s")
+        return [output[0] if isinstance(output, list) else output for output in outputs]
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+class InferenceCache:
+    """Two-level cache of model outputs keyed by (model, text hash, params).
+    
+    An in-memory LRU of ``memory_size`` entries sits in front of a SQLite
+    table. The table is capped at ``max_bytes`` of stored output; when a
+    write takes it over the cap, the least recently used rows are evicted
+    until it is back under 90% of the cap. The database is opened on first
+    use.
+    
+    The LRU and the database have separate locks, so ``get_memory`` (called
+    on the event loop) never waits behind a disk write or eviction running
+    on an inference thread.
+    """
+    def __init__(self, path: str = 'data/llm_cache.sqlite', memory_size: int = 10000,
+                 max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.memory_size = memory_size
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._connection = None
+        self._size = 0
+        
+    @property
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                'size INTEGER NOT NULL, accessed_at REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at)')
+            connection.commit()
+            self._size = connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+            self._connection = connection
+        return self._connection
+        
+    @staticmethod
+    def make_key(model: str, text: str, params: dict) -> str:
+        """Cache key for one model call"""
+        text_hash = hashlib.sha256(text.encode()).hexdigest()
+        return hashlib.sha256(
+            json.dumps([model, text_hash, params], sort_keys=True, default=str).encode()
+        ).hexdigest()
+        
+    def get_memory(self, key: str):
+        """Look a key up in the in-memory LRU only (never touches disk)"""
+        with self._memory_lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+            return value
+            
+    def get(self, key: str):
+        """Look a key up in memory, then on disk, or return None"""
+        value = self.get_memory(key)
+        if value is not None:
+            return value
+        with self._db_lock:
+            row = self._db.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute('UPDATE results SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            self._db.commit()
+        value = json.loads(row[0])
+        self._remember(key, value)
+        return value
+            
+    def set_many(self, items):
+        """Store (key, value) pairs in memory and on disk"""
+        now = time.time()
+        rows = []
+        for key, value in items:
+            self._remember(key, value)
+            encoded = json.dumps(value, default=str)
+            rows.append((key, encoded, len(encoded), now))
+        if not rows:
+            return
+        with self._db_lock:
+            replaced = self._db.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM results WHERE key IN ({','.join('?' * len(rows))})",
+                [row[0] for row in rows]
+            ).fetchone()[0]
+            self._db.executemany('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)', rows)
+            self._size += sum(row[2] for row in rows) - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+            self._db.commit()
+            
+    def set(self, key: str, value):
+        self.set_many([(key, value)])
+        
+    def close(self):
+        with self._db_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+                
+    def _remember(self, key: str, value):
+        with self._memory_lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+            
+    def _evict(self):
+        # Drop least recently used rows until back under 90% of the cap
+        target = self.max_bytes * 0.9
+        evicted = 0
+        cursor = self._db.execute('SELECT key, size FROM results ORDER BY accessed_at')
+        keys = []
+        for key, size in cursor:
+            if self._size <= target:
+                break
+            keys.append((key,))
+            self._size -= size
+            evicted += 1
+        self._db.executemany('DELETE FROM results WHERE key = ?', keys)
+        logger.info(f"Evicted {evicted} cached LLM results to stay under {self.max_bytes} bytes")
+        
+_cache = None
+
+def get_result_cache() -> InferenceCache:
+    """Get the process-wide LLM result cache, creating it on first use"""
+    global _cache
+    if _cache is None:
+        _cache = InferenceCache()
+    return _cache
@@ -0,0 +1,129 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from transformers import pipeline
+from src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+VARIANTS = ('default', 'int8', 'onnx')
+
+class ModelRegistry:
+    """Process-wide cache of loaded transformers pipelines.
+    
+    Each (task, model, variant) is loaded once, on first request, and then
+    shared by every scraper and handler. Variants trade accuracy for CPU
+    speed: ``int8`` applies dynamic int8 quantization to the torch model's
+    linear layers, ``onnx`` runs an ONNX Runtime export (requires
+    ``optimum[onnxruntime]`` and an explicit model name).
+    
+    The registry also owns one single-worker executor per pipeline, which
+    every batching engine wrapping that pipeline runs it on.
+    """
+    def __init__(self):
+        self._pipelines = {}
+        self._locks = {}
+        self._executors = {}
+        self._lock = threading.Lock()
+        
+    def get(self, task: str, model: str = None, variant: str = 'default'):
+        """Return the shared pipeline, loading it if needed"""
+        if variant not in VARIANTS:
+            raise ValueError(f"Invalid model variant: {variant}")
+        key = (task, model, variant)
+        loaded = self._pipelines.get(key)
+        if loaded is not None:
+            return loaded
+            
+        # Per-key lock: concurrent callers wait for one load instead of duplicating it
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key not in self._pipelines:
+                start_time = time.time()
+                self._pipelines[key] = self._load(task, model, variant)
+                logger.info(f"Loaded {variant} {task} model {model or '(default)'} in {time.time() - start_time:.2f} seconds")
+        return self._pipelines[key]
+        
+    def preload(self, tasks, model: str = None, variant: str = 'default'):
+        """Load several task pipelines up front, e.g. at startup"""
+        for task in tasks:
+            self.get(task, model=model, variant=variant)
+            
+    def describe(self, loaded):
+        """Stable identifier of a pipeline held by the registry, or None"""
+        for (task, model, variant), candidate in list(self._pipelines.items()):
+            if candidate is loaded:
+                name = model or getattr(getattr(loaded, 'model', None), 'name_or_path', None)
+                return f"{task}:{name or 'default'}:{variant}"
+        return None
+        
+    def executor(self, loaded, name: str = 'default') -> ThreadPoolExecutor:
+        """The worker thread a pipeline runs on.
+        
+        Pipelines are not re-entrant, so engines sharing a pipeline share
+        its single worker. torch parallelises each batch itself.
+        """
+        with self._lock:
+            entry = self._executors.get(id(loaded))
+            if entry is None or entry[0] is not loaded:
+                entry = (loaded, ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'inference-{name}'))
+                self._executors[id(loaded)] = entry
+            return entry[1]
+            
+    def loaded(self):
+        """Keys of the pipelines currently held"""
+        return list(self._pipelines)
+        
+    def shutdown(self, wait: bool = True):
+        """Stop the inference worker threads, e.g. on application shutdown"""
+        with self._lock:
+            executors = [executor for _, executor in self._executors.values()]
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=wait)
+            
+    def clear(self):
+        """Drop every loaded pipeline so its memory can be reclaimed"""
+        self.shutdown()
+        with self._lock:
+            self._pipelines.clear()
+            self._locks.clear()
+            
+    def _load(self, task: str, model: str, variant: str):
+        if variant == 'onnx':
+            return self._load_onnx(task, model)
+        loaded = pipeline(task, model=model)
+        if variant == 'int8':
+            import torch
+            loaded.model = torch.quantization.quantize_dynamic(
+                loaded.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        return loaded
+        
+    def _load_onnx(self, task: str, model: str):
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTModelForSequenceClassification
+        except ImportError:
+            raise ImportError("The onnx model variant requires optimum[onnxruntime]")
+        from transformers import AutoTokenizer
+        
+        model_classes = {
+            'summarization': ORTModelForSeq2SeqLM,
+            'text-classification': ORTModelForSequenceClassification
+        }
+        if task not in model_classes:
+            raise ValueError(f"No ONNX model class for task: {task}")
+        if model is None:
+            raise ValueError("The onnx model variant needs an explicit model name")
+        return pipeline(
+            task,
+            model=model_classes[task].from_pretrained(model, export=True),
+            tokenizer=AutoTokenizer.from_pretrained(model)
+        )
+        
+model_registry = ModelRegistry()
+
+def get_pipeline(task: str, model: str = None, variant: str = 'default'):
+    """Get a shared transformers pipeline from the process-wide registry"""
+    return model_registry.get(task, model=model, variant=variant)
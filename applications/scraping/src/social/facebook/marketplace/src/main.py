@@ -1,31 +1,53 @@
 import asyncio
+import os
 from fastapi import FastAPI
 from src.api import app
 from src.pipeline.data_pipeline import MarketplacePipeline
+from src.pipeline.scheduler import CategoryScheduler
+from src.inference import model_registry, get_result_cache
+from src.scraper.utils import close_http_session
+from src.api.cache import get_response_cache
+from src.database.session import dispose_engines
+from src.scraper.browser_pool import get_browser_pool, close_browser_pool
 from src.logging.logger import get_logger
-from src.monitoring.metrics import SCRAPE_COUNTER
 
 logger = get_logger(__name__)
 
+CATEGORIES = ["bikes", "electronics", "furniture"]
+
+# Seconds one category run may take before it is cancelled
+SCRAPE_RUN_TIMEOUT = float(os.getenv("SCRAPE_RUN_TIMEOUT", 900))
+
 async def scrape_categories():
     """Background task to scrape marketplace categories"""
+    # Load the shared models off the event loop so the API stays responsive
+    await asyncio.get_running_loop().run_in_executor(
+        None, model_registry.preload, ["summarization", "text-classification"]
+    )
+    try:
+        await get_browser_pool().start()
+    except Exception as e:
+        logger.error(f"Could not warm the browser pool: {str(e)}")
     pipeline = MarketplacePipeline()
-    categories = ["bikes", "electronics", "furniture"]
-    
-    while True:
-        for category in categories:
-            try:
-                await pipeline.process_category(category)
-                SCRAPE_COUNTER.labels(category=category).inc()
-            except Exception as e:
-                logger.error(f"Error processing category {category}: {str(e)}")
-        await asyncio.sleep(300)  # 5 minutes between scrapes
+    scheduler = CategoryScheduler(pipeline, CATEGORIES, run_timeout=SCRAPE_RUN_TIMEOUT)
+    app.state.scheduler = scheduler
+    await scheduler.run()
 
 @app.on_event("startup")
 async def startup_event():
     """Start background scraping task on application startup"""
     asyncio.create_task(scrape_categories())
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release shared HTTP connections, browsers, caches, inference threads and database pools on shutdown"""
+    await close_http_session()
+    await close_browser_pool()
+    get_result_cache().close()
+    await get_response_cache().close()
+    model_registry.shutdown()
+    await dispose_engines()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -2,12 +2,14 @@ from .metrics import (
     SCRAPE_COUNTER,
     SCRAPE_DURATION,
     PROCESSING_ERRORS,
-    SUMMARY_GENERATION_TIME
+    SUMMARY_GENERATION_TIME,
+    INFERENCE_BATCH_SIZE
 )
 
 __all__ = [
     'SCRAPE_COUNTER',
     'SCRAPE_DURATION',
     'PROCESSING_ERRORS',
-    'SUMMARY_GENERATION_TIME'
+    'SUMMARY_GENERATION_TIME',
+    'INFERENCE_BATCH_SIZE'
 ]
@@ -26,3 +26,10 @@ SUMMARY_GENERATION_TIME = Histogram(
     'Time spent generating summaries with LLM',
     ['model']
 )
+
+INFERENCE_BATCH_SIZE = Histogram(
+    'marketplace_llm_inference_batch_size',
+    'Number of texts per batched LLM inference call',
+    ['model'],
+    buckets=(1, 2, 4, 8, 16, 32, 64)
+)
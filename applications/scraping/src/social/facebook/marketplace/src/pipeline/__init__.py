@@ -1,5 +1,6 @@
 from .data_pipeline import MarketplacePipeline
 from .error_handler import with_error_handling, ScraperError
 from .llm_handler import LLMHandler
+from .scheduler import CategoryScheduler
 
-__all__ = ['MarketplacePipeline', 'with_error_handling', 'ScraperError', 'LLMHandler']
+__all__ = ['MarketplacePipeline', 'with_error_handling', 'ScraperError', 'LLMHandler', 'CategoryScheduler']
@@ -3,70 +3,244 @@ from src.monitoring.metrics import SCRAPE_COUNTER, SCRAPE_DURATION
 from src.logging.logger import get_logger
 from src.database.models import MarketplaceListing, ListingAnalysis
 from src.pipeline.error_handler import with_error_handling
-from src.database.session import get_db_session
+from src.database.session import async_session
+from src.api.cache import get_response_cache
+from sqlalchemy import insert, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime
+import asyncio
 
 logger = get_logger('pipeline')
 
+# Marks the end of a stage's output on the queue to the next stage
+STAGE_DONE = object()
+
+# Rows per statement; keeps bind parameters well under PostgreSQL's 32767 limit
+STORE_BATCH_SIZE = 1000
+
+# Columns refreshed when a re-scraped listing already exists
+LISTING_UPDATE_COLUMNS = (
+    'title', 'price', 'location', 'listing_url', 'category',
+    'description', 'seller_id', 'images'
+)
+
+def parse_price(price):
+    """Listing price as a float, or None when it is missing or not a number.
+    
+    Accepts numbers from the embedded-data extractor and display text such as
+    "$1,200" from the DOM parsers; text like "Free" has no numeric value.
+    """
+    if price is None:
+        return None
+    if isinstance(price, (int, float)):
+        return float(price)
+    try:
+        return float(str(price).replace('$', '').replace(',', '').strip())
+    except ValueError:
+        return None
+
+def listing_row(listing_data: dict) -> dict:
+    """Map a processed listing to marketplace_listings column values"""
+    return {
+        'listing_id': listing_data['url'].split('/')[-1],
+        'title': listing_data['title'],
+        'price': parse_price(listing_data.get('price')),
+        'location': listing_data['location'],
+        'listing_url': listing_data['url'],
+        'category': listing_data.get('category', 'unknown'),
+        'description': listing_data.get('description', ''),
+        'seller_id': listing_data.get('seller_id'),
+        'images': listing_data.get('images', [])
+    }
+
+def build_listing_upsert(rows: list):
+    """INSERT ... ON CONFLICT (listing_id) DO UPDATE ... RETURNING id, listing_id, inserted"""
+    statement = pg_insert(MarketplaceListing).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=[MarketplaceListing.listing_id],
+        set_={
+            **{column: statement.excluded[column] for column in LISTING_UPDATE_COLUMNS},
+            'updated_at': datetime.utcnow()
+        }
+    ).returning(
+        MarketplaceListing.id,
+        MarketplaceListing.listing_id,
+        # xmax is 0 only for rows this statement inserted rather than updated
+        literal_column('xmax = 0').label('inserted')
+    )
+
+async def take_batch(queue: asyncio.Queue, size: int, max_wait: float):
+    """Wait for one item, then take up to size within max_wait.
+    
+    Returns the batch and whether the upstream stage has finished. The end
+    marker is put back so every worker reading the queue sees it.
+    """
+    item = await queue.get()
+    if item is STAGE_DONE:
+        queue.put_nowait(STAGE_DONE)
+        return [], True
+    batch = [item]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_wait
+    while len(batch) < size:
+        timeout = deadline - loop.time()
+        try:
+            if timeout <= 0:
+                item = queue.get_nowait()
+            else:
+                item = await asyncio.wait_for(queue.get(), timeout)
+        except (asyncio.QueueEmpty, asyncio.TimeoutError):
+            break
+        if item is STAGE_DONE:
+            queue.put_nowait(STAGE_DONE)
+            return batch, True
+        batch.append(item)
+    return batch, False
+
+async def run_until_first_error(coroutines):
+    """Run coroutines concurrently; if one fails, cancel the rest and raise"""
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if task.exception() is not None:
+                raise task.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
 class MarketplacePipeline:
-    def __init__(self):
+    """Scrape, enrich, analyse and store listings as a streaming pipeline.
+    
+    Stages are connected by bounded queues (``queue_size``), so listings move
+    on as soon as the previous stage releases them and a slow stage applies
+    backpressure upstream. Each stage takes batches from its input queue,
+    waiting at most ``batch_wait`` seconds to fill one, and runs
+    ``*_concurrency`` batches at a time.
+    """
+    def __init__(self, queue_size: int = 100, enrich_concurrency: int = 4,
+                 llm_concurrency: int = 2, llm_batch_size: int = 16,
+                 store_batch_size: int = 200, batch_wait: float = 0.5):
         self.dynamic_scraper = ScraperFactory.get_scraper('dynamic')
         self.api_scraper = ScraperFactory.get_scraper('api')
         self.llm_scraper = ScraperFactory.get_scraper('llm')
-    
+        self.queue_size = queue_size
+        self.enrich_concurrency = enrich_concurrency
+        self.llm_concurrency = llm_concurrency
+        self.llm_batch_size = llm_batch_size
+        self.store_batch_size = store_batch_size
+        self.batch_wait = batch_wait
+        
     @with_error_handling
     async def process_category(self, category: str):
-        try:
-            # Get raw listings
-            raw_listings = await self.dynamic_scraper.scrape_category(category)
+        """Stream one category through every stage, returning stored and new counts"""
+        scraped = asyncio.Queue(self.queue_size)
+        enriched = asyncio.Queue(self.queue_size)
+        processed = asyncio.Queue(self.queue_size)
+        stored = set()
+        new = set()
+        
+        async def store(batch):
+            ids, inserted = await self._store_listings(batch)
+            stored.update(ids)
+            new.update(inserted)
             
+        stages = [
+            # Get raw listings
+            self._scrape_stage(category, scraped),
             # Enrich with API data
-            enriched_listings = await self.api_scraper.enrich_listings(raw_listings)
-            
+            self._run_stage(self.api_scraper.enrich_listings, scraped, enriched,
+                            self.enrich_concurrency, self.api_scraper.batch_size),
             # Process with LLM
-            processed_listings = await self.llm_scraper.process_listings(
-                enriched_listings
-            )
-            
+            self._run_stage(self.llm_scraper.process_listings, enriched, processed,
+                            self.llm_concurrency, self.llm_batch_size),
             # Store results
-            await self._store_listings(processed_listings)
-            
+            self._run_stage(store, processed, None, 1, self.store_batch_size)
+        ]
+        try:
+            await run_until_first_error(stages)
         except Exception as e:
             logger.error(f"Pipeline failed: {str(e)}")
             raise
-
+        return {'stored': len(stored), 'new': len(new)}
+        
+    async def _scrape_stage(self, category: str, output: asyncio.Queue):
+        async for listing in self.dynamic_scraper.iter_category(category):
+            if listing:
+                await output.put(listing)
+        # Only a stage that finished signals the next one: when any stage
+        # fails, run_until_first_error cancels the others, and waiting on a
+        # full queue nobody reads any more would never return
+        await output.put(STAGE_DONE)
+        
+    async def _run_stage(self, handler, input: asyncio.Queue, output, concurrency: int,
+                         batch_size: int):
+        """Feed batches from input through handler, passing its results on"""
+        async def worker():
+            while True:
+                batch, done = await take_batch(input, batch_size, self.batch_wait)
+                if batch:
+                    results = await handler(batch)
+                    if output is not None:
+                        for item in results or []:
+                            await output.put(item)
+                if done:
+                    return
+                    
+        # A failed worker cancels its siblings instead of leaving them blocked
+        await run_until_first_error(worker() for _ in range(concurrency))
+        if output is not None:
+            await output.put(STAGE_DONE)
+            
     async def _store_listings(self, listings):
-        """Store processed listings in the database"""
-        async for session in get_db_session():
-            try:
-                for listing_data in listings:
-                    # Create marketplace listing
-                    listing = MarketplaceListing(
-                        listing_id=listing_data['url'].split('/')[-1],
-                        title=listing_data['title'],
-                        price=float(listing_data['price'].replace('$', '')),
-                        location=listing_data['location'],
-                        listing_url=listing_data['url'],
-                        category=listing_data.get('category', 'unknown'),
-                        description=listing_data.get('description', ''),
-                        seller_id=listing_data.get('seller_id'),
-                        images=listing_data.get('images', [])
+        """Upsert processed listings in bulk, adding analyses for new ones.
+        
+        Returns the listing_id -> id map and the listing_ids that were new.
+        """
+        # One row per listing_id: a statement cannot upsert the same row twice
+        by_listing_id = {}
+        for listing_data in listings:
+            row = listing_row(listing_data)
+            by_listing_id[row['listing_id']] = (row, listing_data)
+        if not by_listing_id:
+            return {}, set()
+            
+        ids = {}
+        inserted = set()
+        entries = list(by_listing_id.values())
+        try:
+            # One transaction, committed when the block exits
+            async with async_session() as session, session.begin():
+                for start in range(0, len(entries), STORE_BATCH_SIZE):
+                    rows = [row for row, _ in entries[start:start + STORE_BATCH_SIZE]]
+                    result = await session.execute(build_listing_upsert(rows))
+                    for id, listing_id, is_new in result:
+                        ids[listing_id] = id
+                        if is_new:
+                            inserted.add(listing_id)
+                            
+                # Re-scrapes arrive every polling cycle; only a listing's
+                # first sighting gets an analysis row
+                analyses = [
+                    {
+                        'listing_id': ids[row['listing_id']],
+                        'quality_score': listing_data['analysis'].get('confidence', 0.0),
+                        'keywords': listing_data['analysis'].get('keywords', []),
+                        'category_confidence': listing_data['analysis'].get('category_confidence', 0.0)
+                    }
+                    for row, listing_data in entries
+                    if listing_data.get('analysis') and row['listing_id'] in inserted
+                ]
+                for start in range(0, len(analyses), STORE_BATCH_SIZE):
+                    await session.execute(
+                        insert(ListingAnalysis).values(analyses[start:start + STORE_BATCH_SIZE])
                     )
-                    session.add(listing)
-                    await session.flush()
-
-                    # Create listing analysis
-                    if 'analysis' in listing_data:
-                        analysis = ListingAnalysis(
-                            listing_id=listing.id,
-                            quality_score=listing_data['analysis'].get('confidence', 0.0),
-                            keywords=listing_data['analysis'].get('keywords', []),
-                            category_confidence=listing_data['analysis'].get('category_confidence', 0.0)
-                        )
-                        session.add(analysis)
-
-                await session.commit()
-                
-            except Exception as e:
-                await session.rollback()
-                self.logger.error(f"Error storing listings: {str(e)}")
-                raise
\ No newline at end of file
+                    
+        except Exception as e:
+            logger.error(f"Error storing listings: {str(e)}")
+            raise
+            
+        # Cached API responses predate these rows
+        await get_response_cache().invalidate()
+        return ids, inserted
@@ -1,14 +1,28 @@
-from transformers import pipeline
+from src.inference import BatchInferenceEngine, get_pipeline, get_result_cache
 from src.logging.logger import get_logger, log_execution_time
 from src.monitoring.metrics import SUMMARY_GENERATION_TIME
+import asyncio
 import time
 
 logger = get_logger('llm_handler')
 
 class LLMHandler:
-    def __init__(self):
-        self.summarizer = pipeline("summarization")
-        self.classifier = pipeline("text-classification")
+    def __init__(self, max_batch_size: int = 16, max_wait: float = 0.05,
+                 model_variant: str = 'default', result_cache=None):
+        self.summarizer = get_pipeline("summarization", variant=model_variant)
+        self.classifier = get_pipeline("text-classification", variant=model_variant)
+        # Listings are re-scraped often; unchanged text skips inference
+        self.result_cache = result_cache or get_result_cache()
+        self.summary_engine = BatchInferenceEngine(
+            self.summarizer, name='summarization',
+            max_batch_size=max_batch_size, max_wait=max_wait, cache=self.result_cache,
+            max_length=100, min_length=30, truncation=True
+        )
+        self.classification_engine = BatchInferenceEngine(
+            self.classifier, name='text-classification',
+            max_batch_size=max_batch_size, max_wait=max_wait, cache=self.result_cache,
+            truncation=True
+        )
         
     @log_execution_time
     async def process_listing(self, listing_data: dict) -> dict:
@@ -16,11 +30,11 @@ class LLMHandler:
         try:
             start_time = time.time()
             
-            # Generate summary
-            summary = await self._generate_summary(listing_data.get('description', ''))
-            
-            # Classify content
-            classification = await self._classify_content(listing_data.get('title', ''))
+            # Generate summary and classify content
+            summary, classification = await asyncio.gather(
+                self._generate_summary(listing_data.get('description', '')),
+                self._classify_content(listing_data.get('title', ''))
+            )
             
             duration = time.time() - start_time
             SUMMARY_GENERATION_TIME.labels(model='default').observe(duration)
@@ -35,13 +49,17 @@ class LLMHandler:
             logger.error(f"Error in LLM processing: {str(e)}")
             raise
             
+    async def process_listings(self, listings: list) -> list:
+        """Process several listings, batching their model calls"""
+        return await asyncio.gather(*(self.process_listing(listing) for listing in listings))
+        
     async def _generate_summary(self, text: str) -> str:
         """Generate a summary of the listing description"""
         if not text:
             return ''
         try:
-            result = self.summarizer(text, max_length=100, min_length=30)
-            return result[0]['summary_text']
+            result = await self.summary_engine.submit(text)
+            return result['summary_text']
         except Exception as e:
             logger.error(f"Summary generation failed: {str(e)}")
             return text[:100]
@@ -49,10 +67,10 @@ class LLMHandler:
     async def _classify_content(self, text: str) -> dict:
         """Classify the listing content"""
         try:
-            result = self.classifier(text)
+            result = await self.classification_engine.submit(text)
             return {
-                'label': result[0]['label'],
-                'confidence': result[0]['score']
+                'label': result['label'],
+                'confidence': result['score']
             }
         except Exception as e:
             logger.error(f"Classification failed: {str(e)}")
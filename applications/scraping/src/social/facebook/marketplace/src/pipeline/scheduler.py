@@ -0,0 +1,157 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from src.logging.logger import get_logger
+from src.monitoring.metrics import SCRAPE_COUNTER, SCRAPE_DURATION
+
+logger = get_logger('scheduler')
+
+class CategorySchedule:
+    """Polling state for one category"""
+    def __init__(self, category: str, interval: float, clock=time.monotonic):
+        self.category = category
+        self.interval = interval
+        self.clock = clock
+        self.next_run = clock()
+        self.started = None
+        self.new_rate = None
+        self.runs = 0
+        self.running = False
+        self.last_run_at = None
+        self.last_new = None
+        self.last_error = None
+        
+    def to_dict(self) -> dict:
+        return {
+            'category': self.category,
+            'interval_seconds': round(self.interval, 1),
+            'next_run_at': datetime.utcnow() + timedelta(seconds=max(0.0, self.next_run - self.clock())),
+            'new_listings_per_hour': None if self.new_rate is None else round(self.new_rate * 3600, 2),
+            'runs': self.runs,
+            'running': self.running,
+            'last_run_at': self.last_run_at,
+            'last_new_listings': self.last_new,
+            'last_error': self.last_error
+        }
+
+class CategoryScheduler:
+    """Polls categories concurrently, each on its own adaptive interval.
+    
+    At most ``max_concurrency`` categories are scraped at once; due
+    categories queue for a slot in due-time order, so a hot category cannot
+    jump ahead of an overdue cold one. After each run the category's
+    new-listing rate is smoothed and its interval set so that a run is
+    expected to find about ``target_new`` new listings, clamped to
+    [``min_interval``, ``max_interval``]. A run that finds nothing backs the
+    interval off by ``backoff``, and ``max_interval`` bounds how long any
+    category waits.
+    
+    A run that takes longer than ``run_timeout`` seconds is cancelled and
+    recorded as an error, so one stuck category cannot hold a slot forever.
+    ``clock`` returns monotonic seconds and can be replaced in tests.
+    """
+    def __init__(self, pipeline, categories, max_concurrency: int = 2,
+                 initial_interval: float = 300, min_interval: float = 60,
+                 max_interval: float = 1800, target_new: int = 20,
+                 smoothing: float = 0.5, backoff: float = 1.5,
+                 run_timeout: float = 900, clock=time.monotonic):
+        self.pipeline = pipeline
+        self.max_concurrency = max_concurrency
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_new = target_new
+        self.smoothing = smoothing
+        self.backoff = backoff
+        self.run_timeout = run_timeout
+        self.clock = clock
+        self.schedules = {
+            category: CategorySchedule(category, initial_interval, clock)
+            for category in categories
+        }
+        self._semaphore = None
+        self._wakeup = None
+        
+    def schedule(self) -> list:
+        """Current schedule, soonest first"""
+        return [
+            schedule.to_dict()
+            for schedule in sorted(self.schedules.values(), key=lambda schedule: schedule.next_run)
+        ]
+        
+    async def run(self):
+        """Scrape due categories forever"""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._wakeup = asyncio.Event()
+        tasks = set()
+        try:
+            while True:
+                now = self.clock()
+                due = sorted(
+                    (schedule for schedule in self.schedules.values()
+                     if not schedule.running and schedule.next_run <= now),
+                    key=lambda schedule: schedule.next_run
+                )
+                for schedule in due:
+                    schedule.running = True
+                    task = asyncio.ensure_future(self._run_category(schedule))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    
+                waiting = [schedule.next_run for schedule in self.schedules.values() if not schedule.running]
+                timeout = max(0.0, min(waiting) - self.clock()) if waiting else None
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in tasks:
+                task.cancel()
+                
+    async def _run_category(self, schedule: CategorySchedule):
+        try:
+            async with self._semaphore:
+                started = self.clock()
+                previous_started = schedule.started
+                schedule.started = started
+                schedule.last_run_at = datetime.utcnow()
+                try:
+                    counts = await asyncio.wait_for(
+                        self.pipeline.process_category(schedule.category), self.run_timeout
+                    )
+                    SCRAPE_COUNTER.labels(category=schedule.category, scraper_type='pipeline').inc()
+                    schedule.last_error = None
+                    self._adapt(schedule, counts['new'], previous_started)
+                except asyncio.TimeoutError:
+                    logger.error(f"Category {schedule.category} timed out after {self.run_timeout}s")
+                    schedule.last_error = f"timed out after {self.run_timeout}s"
+                except Exception as e:
+                    logger.error(f"Error processing category {schedule.category}: {str(e)}")
+                    schedule.last_error = str(e)
+                finally:
+                    SCRAPE_DURATION.labels(category=schedule.category, scraper_type='pipeline').observe(
+                        self.clock() - started
+                    )
+                    schedule.runs += 1
+                    schedule.next_run = self.clock() + schedule.interval
+        finally:
+            schedule.running = False
+            self._wakeup.set()
+            
+    def _adapt(self, schedule: CategorySchedule, new: int, previous_started):
+        schedule.last_new = new
+        if previous_started is None:
+            # First run sees the whole backlog, which says nothing about the rate
+            return
+        elapsed = max(schedule.started - previous_started, 0.001)
+        rate = new / elapsed
+        if schedule.new_rate is None:
+            schedule.new_rate = rate
+        else:
+            schedule.new_rate = self.smoothing * rate + (1 - self.smoothing) * schedule.new_rate
+            
+        if new == 0 or schedule.new_rate <= 0:
+            interval = schedule.interval * self.backoff
+        else:
+            interval = self.target_new / schedule.new_rate
+        schedule.interval = min(self.max_interval, max(self.min_interval, interval))
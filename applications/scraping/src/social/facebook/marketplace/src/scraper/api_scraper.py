@@ -1,75 +1,101 @@
 from src.scraper.base import BaseScraper
+from src.scraper.utils import get_http_session, request_json
 from src.logging.logger import log_execution_time
-import aiohttp
+import asyncio
+
+# Fields requested for every listing; each batched listing gets an aliased copy
+LISTING_FIELDS = """
+        description
+        seller {
+            id
+            name
+        }
+        images {
+            url
+        }
+"""
 
 class APIScraper(BaseScraper):
-    def __init__(self):
+    def __init__(self, concurrency: int = 20, retries: int = 3, batch_size: int = 25):
         super().__init__(name="api")
+        self.concurrency = concurrency
+        self.retries = retries
+        self.batch_size = batch_size
         
     @log_execution_time
     async def enrich_listings(self, listings):
         """Enrich listings with additional data from Facebook API"""
         try:
-            enriched_listings = []
-            async with aiohttp.ClientSession() as session:
-                for listing in listings:
-                    if not listing:
-                        continue
-                    
-                    enriched_data = await self._fetch_listing_details(session, listing)
+            session = get_http_session()
+            semaphore = asyncio.Semaphore(self.concurrency)
+            listings = [listing for listing in listings if listing]
+            batches = [
+                listings[start:start + self.batch_size]
+                for start in range(0, len(listings), self.batch_size)
+            ]
+            
+            async def enrich(batch):
+                async with semaphore:
+                    details = await self._fetch_batch_details(session, batch)
+                for listing, enriched_data in zip(batch, details):
                     if enriched_data:
                         listing.update(enriched_data)
-                    enriched_listings.append(listing)
-                    
-            return enriched_listings
+                        
+            await asyncio.gather(*(enrich(batch) for batch in batches))
+            return listings
             
         except Exception as e:
             self.logger.error(f"Error enriching listings: {str(e)}")
             raise
             
-    async def _fetch_listing_details(self, session, listing):
-        """Fetch additional details for a listing from Facebook API"""
+    async def _fetch_batch_details(self, session, batch):
+        """Fetch details for a batch of listings in one aliased GraphQL request"""
         try:
-            listing_id = listing['url'].split('/')[-1]
+            listing_ids = [listing['url'].split('/')[-1] for listing in batch]
             url = f"{self.base_url}/api/graphql"
+            query, variables = self._build_batch_query(listing_ids)
             
-            # Facebook GraphQL query for listing details
-            query = """
-            query MarketplaceListingQuery($listingId: ID!) {
-                marketplace_listing(listing_id: $listingId) {
-                    description
-                    seller {
-                        id
-                        name
-                    }
-                    images {
-                        url
-                    }
-                }
-            }
-            """
-            
-            async with session.post(url, json={'query': query, 'variables': {'listingId': listing_id}}) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self._parse_api_response(data)
-                return None
+            data = await request_json(
+                session, 'POST', url,
+                retries=self.retries,
+                json={'query': query, 'variables': variables}
+            )
+            if data is None:
+                return [None] * len(batch)
                 
+            # Demultiplex the aliased results back to their listings
+            results = data.get('data') or {}
+            return [
+                self._parse_listing_data(results.get(f"l{index}"))
+                for index in range(len(batch))
+            ]
+            
         except Exception as e:
             self.logger.error(f"Error fetching listing details: {str(e)}")
-            return None
+            return [None] * len(batch)
             
-    def _parse_api_response(self, response_data):
-        """Parse the API response and extract relevant data"""
+    def _build_batch_query(self, listing_ids):
+        """Build one GraphQL query with an aliased marketplace_listing per id"""
+        parameters = ", ".join(f"$id{index}: ID!" for index in range(len(listing_ids)))
+        fields = "\n".join(
+            f"    l{index}: marketplace_listing(listing_id: $id{index}) {{{LISTING_FIELDS}    }}"
+            for index in range(len(listing_ids))
+        )
+        query = f"query MarketplaceListingsBatch({parameters}) {{\n{fields}\n}}"
+        variables = {f"id{index}": listing_id for index, listing_id in enumerate(listing_ids)}
+        return query, variables
+        
+    def _parse_listing_data(self, listing_data):
+        """Extract relevant fields from a marketplace_listing result"""
+        if not listing_data:
+            return None
         try:
-            listing_data = response_data.get('data', {}).get('marketplace_listing', {})
             return {
                 'description': listing_data.get('description', ''),
-                'seller_id': listing_data.get('seller', {}).get('id'),
-                'seller_name': listing_data.get('seller', {}).get('name'),
-                'images': [img['url'] for img in listing_data.get('images', [])]
+                'seller_id': (listing_data.get('seller') or {}).get('id'),
+                'seller_name': (listing_data.get('seller') or {}).get('name'),
+                'images': [img['url'] for img in listing_data.get('images') or []]
             }
         except Exception as e:
             self.logger.error(f"Error parsing API response: {str(e)}")
             return None
-
@@ -0,0 +1,165 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Requests a marketplace page does not need to expose listing data:
+# media, fonts and third-party trackers
+BLOCKED_URL_PATTERNS = [
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.m3u8', '*.mpd',
+    '*scontent*.fbcdn.net/*', '*video*.fbcdn.net/*',
+    '*google-analytics.com/*', '*googletagmanager.com/*', '*doubleclick.net/*',
+    '*connect.facebook.net/*', '*facebook.com/tr/*', '*facebook.com/ajax/bz*'
+]
+
+def chrome_options(block_resources: bool = True) -> Options:
+    """Headless Chrome options used for marketplace pages"""
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.binary_location = '/usr/bin/chromium'
+    if block_resources:
+        # Return from get() at DOMContentLoaded instead of waiting for every subresource
+        options.page_load_strategy = 'eager'
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.managed_default_content_settings.media_stream': 2
+        })
+    return options
+
+def launch_chrome(block_resources: bool = True):
+    """Start Chrome, optionally blocking media, fonts and trackers at the network layer"""
+    driver = webdriver.Chrome(options=chrome_options(block_resources))
+    if block_resources:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    return driver
+
+class PooledBrowser:
+    """A pooled WebDriver and the number of pages it has served"""
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+class BrowserPool:
+    """Pool of warm headless browsers shared by dynamic scrapers.
+    
+    Browsers are checked out one caller at a time, health-checked on
+    checkout, and recycled after ``max_pages`` pages or any failure. All
+    WebDriver calls, including launch and quit, run on the pool's own
+    threads so they never block the event loop.
+    """
+    def __init__(self, size: int = 2, max_pages: int = 50, driver_factory=launch_chrome):
+        self.size = size
+        self.max_pages = max_pages
+        self.driver_factory = driver_factory
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix='browser')
+        self._slots = None
+        
+    async def start(self):
+        """Launch every browser up front instead of on first checkout.
+        
+        If a launch fails, the browsers already started go back into the
+        pool and the failed slot stays empty, to be launched on checkout.
+        """
+        browsers = []
+        try:
+            for _ in range(self.size):
+                browsers.append(await self._checkout())
+        finally:
+            for browser in browsers:
+                self._slots.put_nowait(browser)
+            
+    @asynccontextmanager
+    async def browser(self):
+        """Check a browser out for the duration of the block"""
+        browser = await self._checkout()
+        healthy = True
+        try:
+            yield browser
+        except BaseException:
+            # Includes cancellation: the driver may still be mid-command
+            healthy = False
+            raise
+        finally:
+            browser.pages += 1
+            if self._slots is None:
+                await self._discard(browser)
+            elif healthy and browser.pages < self.max_pages:
+                self._slots.put_nowait(browser)
+            else:
+                await self._discard(browser)
+                self._slots.put_nowait(None)
+                
+    async def run(self, func, *args):
+        """Call func(driver, *args) on a pooled browser, off the event loop"""
+        async with self.browser() as browser:
+            return await self._call(func, browser.driver, *args)
+            
+    async def close(self):
+        """Quit every idle browser"""
+        if self._slots is None:
+            return
+        while not self._slots.empty():
+            browser = self._slots.get_nowait()
+            if browser is not None:
+                await self._discard(browser)
+        self._slots = None
+        
+    async def _checkout(self) -> PooledBrowser:
+        if self._slots is None:
+            # Empty slots (None) are launched lazily on checkout
+            self._slots = asyncio.Queue()
+            for _ in range(self.size):
+                self._slots.put_nowait(None)
+        browser = await self._slots.get()
+        try:
+            if browser is not None and not await self._is_healthy(browser):
+                await self._discard(browser)
+                browser = None
+            if browser is None:
+                browser = PooledBrowser(await self._call(self.driver_factory))
+            return browser
+        except Exception:
+            self._slots.put_nowait(None)
+            raise
+            
+    async def _is_healthy(self, browser: PooledBrowser) -> bool:
+        try:
+            return await self._call(browser.driver.execute_script, 'return 1') == 1
+        except Exception as e:
+            logger.warning(f"Discarding unresponsive browser: {str(e)}")
+            return False
+            
+    async def _discard(self, browser: PooledBrowser):
+        try:
+            await self._call(browser.driver.quit)
+        except Exception as e:
+            logger.error(f"Error quitting browser: {str(e)}")
+            
+    async def _call(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+_pool = None
+
+def get_browser_pool() -> BrowserPool:
+    """Get the process-wide browser pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
+
+async def close_browser_pool():
+    """Quit the shared browsers, e.g. on application shutdown"""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+    _pool = None
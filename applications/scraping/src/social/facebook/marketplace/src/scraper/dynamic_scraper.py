@@ -1,35 +1,46 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+import asyncio
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from src.scraper.browser_pool import get_browser_pool
+from src.scraper.embedded_data import READ_EMBEDDED_JSON, find_marketplace_listings
 from src.logging.logger import get_logger
 
 logger = get_logger(__name__)
 
 class DynamicScraper:
-    def __init__(self):
-        self.options = Options()
-        self.options.add_argument('--headless')
-        self.options.add_argument('--no-sandbox')
-        self.options.add_argument('--disable-dev-shm-usage')
-        self.options.binary_location = '/usr/bin/chromium'
+    def __init__(self, pool=None, extract: str = 'json'):
+        """extract='json' reads listings from the page's embedded JSON payloads,
+        falling back to the rendered DOM; extract='dom' always uses the DOM."""
+        if extract not in ('json', 'dom'):
+            raise ValueError(f"Invalid extract mode: {extract}")
+        self.pool = pool or get_browser_pool()
+        self.extract = extract
         
-    def __enter__(self):
-        self.driver = webdriver.Chrome(options=self.options)
-        return self
+    async def scrape_category(self, category: str):
+        return await self.pool.run(self._scrape_page, category)
         
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.driver:
-            self.driver.quit()
+    async def iter_category(self, category: str):
+        """Yield parsed listings one at a time so downstream stages can start early"""
+        for listing in await self.scrape_category(category):
+            yield listing
+            # Let the other pipeline stages run between listings
+            await asyncio.sleep(0)
             
-    async def scrape_category(self, category: str):
+    def _scrape_page(self, driver, category: str):
+        """Load and parse a category page; runs on a browser pool thread"""
         try:
             url = f"https://www.facebook.com/marketplace/category/{category}"
-            self.driver.get(url)
+            driver.get(url)
             
+            if self.extract == 'json':
+                listings = find_marketplace_listings(driver.execute_script(READ_EMBEDDED_JSON) or [])
+                if listings:
+                    return listings
+                logger.warning(f"No embedded listing data for {category}, reading the DOM")
+                
             # Wait for listings to load
-            listings = WebDriverWait(self.driver, 10).until(
+            listings = WebDriverWait(driver, 10).until(
                 EC.presence_of_all_elements_located(
                     (By.CSS_SELECTOR, "[data-testid='marketplace_listing_item']")
                 )
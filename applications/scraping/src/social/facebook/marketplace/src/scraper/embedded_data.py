@@ -0,0 +1,74 @@
+import json
+from src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Script tags in which Facebook ships the data a page renders from
+EMBEDDED_JSON_SELECTOR = 'script[type="application/json"]'
+
+# Reads every embedded payload in one WebDriver round-trip
+READ_EMBEDDED_JSON = (
+    f"return Array.from(document.querySelectorAll({json.dumps(EMBEDDED_JSON_SELECTOR)}))"
+    ".map(script => script.textContent);"
+)
+
+def find_marketplace_listings(payloads):
+    """Extract listings from embedded JSON payloads.
+    
+    Walks every payload for marketplace listing objects (those carrying a
+    ``marketplace_listing_title``) and maps them to the same fields the DOM
+    parser produces, with ``price`` as a number (None when the listing has
+    none). Listings are de-duplicated by id in first-seen order.
+    """
+    listings = {}
+    for payload in payloads:
+        if not payload or 'marketplace_listing_title' not in payload:
+            continue
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            continue
+        for node in _walk(data):
+            listing = _parse_listing_node(node)
+            if listing and listing['listing_id'] not in listings:
+                listings[listing['listing_id']] = listing
+    return [
+        {key: value for key, value in listing.items() if key != 'listing_id'}
+        for listing in listings.values()
+    ]
+
+def _walk(data):
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if 'marketplace_listing_title' in node:
+                yield node
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+def _parse_amount(amount):
+    # formatted_amount is display text ("$250", "Free"); amount is the number
+    try:
+        return float(amount)
+    except (TypeError, ValueError):
+        return None
+
+def _parse_listing_node(node):
+    try:
+        listing_id = str(node['id'])
+        price = _parse_amount((node.get('listing_price') or {}).get('amount'))
+        location = (node.get('location') or {}).get('reverse_geocode') or {}
+        return {
+            'listing_id': listing_id,
+            'title': node['marketplace_listing_title'],
+            'price': price,
+            'location': ', '.join(
+                part for part in (location.get('city'), location.get('state')) if part
+            ),
+            'url': f"https://www.facebook.com/marketplace/item/{listing_id}"
+        }
+    except Exception as e:
+        logger.error(f"Error parsing embedded listing: {str(e)}")
+        return None
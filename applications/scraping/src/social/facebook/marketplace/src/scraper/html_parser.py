@@ -0,0 +1,222 @@
+import functools
+import logging
+from typing import List, Optional
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxHTMLParser
+    except ImportError:
+        SelectolaxHTMLParser = None
+
+try:
+    import lxml.html
+    from lxml import etree
+    from cssselect import HTMLTranslator, parse as parse_css
+    from cssselect.parser import Attrib, Class, Element, Hash
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+logger = logging.getLogger(__name__)
+
+# Fastest first; bs4 is always installed and is the last resort
+BACKEND_PREFERENCE = ('selectolax', 'lxml', 'bs4')
+
+# Characters fed to the incremental lxml parser at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+
+class SoupNode:
+    """bs4 element behind the common node interface"""
+    def __init__(self, element):
+        self.element = element
+        
+    def text(self) -> str:
+        return self.element.get_text()
+        
+    @property
+    def attrs(self) -> dict:
+        # bs4 splits multi-valued attributes such as class into lists
+        return {
+            name: ' '.join(value) if isinstance(value, list) else value
+            for name, value in self.element.attrs.items()
+        }
+        
+    def select(self, selector: str) -> list:
+        return [SoupNode(element) for element in self.element.select(selector)]
+        
+    def select_one(self, selector: str):
+        element = self.element.select_one(selector)
+        return SoupNode(element) if element is not None else None
+
+class LxmlNode:
+    """lxml element behind the common node interface"""
+    def __init__(self, element):
+        self.element = element
+        
+    def text(self) -> str:
+        return self.element.xpath('string()')
+        
+    @property
+    def attrs(self) -> dict:
+        return dict(self.element.attrib)
+        
+    def select(self, selector: str) -> list:
+        return [LxmlNode(element) for element in compile_xpath(selector, 'descendant::')(self.element)]
+        
+    def select_one(self, selector: str):
+        nodes = self.select(selector)
+        return nodes[0] if nodes else None
+
+class SelectolaxNode:
+    """selectolax node behind the common node interface"""
+    def __init__(self, node):
+        self.node = node
+        
+    def text(self) -> str:
+        return self.node.text(deep=True)
+        
+    @property
+    def attrs(self) -> dict:
+        return dict(self.node.attributes)
+        
+    def select(self, selector: str) -> list:
+        # css() also matches the node itself; bs4 and lxml search descendants only
+        return [SelectolaxNode(node) for node in self.node.css(selector) if node != self.node]
+        
+    def select_one(self, selector: str):
+        nodes = self.select(selector)
+        return nodes[0] if nodes else None
+
+@functools.lru_cache(maxsize=256)
+def compile_xpath(selector: str, prefix: str):
+    """Compile a CSS selector to an lxml XPath evaluator once"""
+    return etree.XPath(HTMLTranslator().css_to_xpath(selector, prefix=prefix))
+
+@functools.lru_cache(maxsize=256)
+def is_streamable_selector(selector: str) -> bool:
+    """True if every part of the group is decided by an element's own tag and attributes.
+    
+    Such selectors can be matched as soon as an element's start tag is
+    parsed; combinators and pseudo-classes may depend on nodes not seen yet.
+    """
+    def own_attributes_only(tree) -> bool:
+        while isinstance(tree, (Class, Hash, Attrib)):
+            tree = tree.selector
+        return isinstance(tree, Element)
+        
+    return all(
+        part.pseudo_element is None and own_attributes_only(part.parsed_tree)
+        for part in parse_css(selector)
+    )
+
+class HTMLParserBackend:
+    """Parses HTML and runs CSS selectors through one parser library"""
+    name = None
+    
+    def parse(self, html: str):
+        raise NotImplementedError
+        
+    def select(self, html: str, selector: str, limit: Optional[int] = None) -> list:
+        """Nodes matching selector in document order, at most limit of them"""
+        nodes = self.parse(html).select(selector)
+        return nodes[:limit] if limit is not None else nodes
+        
+    def select_one(self, html: str, selector: str):
+        nodes = self.select(html, selector, limit=1)
+        return nodes[0] if nodes else None
+
+class SoupBackend(HTMLParserBackend):
+    name = 'bs4'
+    
+    def parse(self, html: str) -> SoupNode:
+        return SoupNode(BeautifulSoup(html, 'html.parser'))
+
+class LxmlBackend(HTMLParserBackend):
+    """lxml with CSS selectors compiled to XPath.
+    
+    With a limit and a selector that only looks at an element's own tag and
+    attributes, the document is parsed incrementally: elements are matched
+    on their start tag, so nested matches keep document order, and parsing
+    stops once the first ``limit`` matches have been closed.
+    """
+    name = 'lxml'
+    
+    def parse(self, html: str) -> LxmlNode:
+        return LxmlNode(lxml.html.document_fromstring(html))
+        
+    def select(self, html: str, selector: str, limit: Optional[int] = None) -> list:
+        if limit is None or not is_streamable_selector(selector):
+            root = lxml.html.document_fromstring(html)
+            elements = compile_xpath(selector, 'descendant-or-self::')(root)
+            return [LxmlNode(element) for element in elements[:limit]]
+            
+        matches = compile_xpath(selector, 'self::')
+        parser = etree.HTMLPullParser(events=('start', 'end'))
+        found = []
+        # Matches, in start order, whose subtree is not complete yet
+        open_matches = set()
+        chunks = [html[start:start + STREAM_CHUNK_SIZE] for start in range(0, len(html), STREAM_CHUNK_SIZE)]
+        # None closes the parser, flushing elements the markup never closed
+        for chunk in chunks + [None]:
+            if chunk is None:
+                parser.close()
+            else:
+                parser.feed(chunk)
+            for event, element in parser.read_events():
+                if event == 'start':
+                    if len(found) < limit and matches(element):
+                        found.append(element)
+                        open_matches.add(element)
+                    continue
+                open_matches.discard(element)
+                if len(found) >= limit and not open_matches:
+                    return [LxmlNode(element) for element in found]
+        return [LxmlNode(element) for element in found]
+
+class SelectolaxBackend(HTMLParserBackend):
+    name = 'selectolax'
+    
+    def parse(self, html: str) -> SelectolaxNode:
+        return SelectolaxNode(SelectolaxHTMLParser(html).root)
+        
+    def select(self, html: str, selector: str, limit: Optional[int] = None) -> list:
+        tree = SelectolaxHTMLParser(html)
+        if limit == 1:
+            node = tree.css_first(selector)
+            return [SelectolaxNode(node)] if node is not None else []
+        nodes = tree.css(selector)
+        return [SelectolaxNode(node) for node in nodes[:limit]]
+
+BACKENDS = {
+    'selectolax': SelectolaxBackend,
+    'lxml': LxmlBackend,
+    'bs4': SoupBackend
+}
+
+def available_backends() -> List[str]:
+    """Installed backends, fastest first"""
+    installed = {
+        'selectolax': SelectolaxHTMLParser is not None,
+        'lxml': HAS_LXML,
+        'bs4': True
+    }
+    return [name for name in BACKEND_PREFERENCE if installed[name]]
+
+@functools.lru_cache(maxsize=None)
+def get_html_parser(backend: Optional[str] = None) -> HTMLParserBackend:
+    """Get a parser backend by name, or the fastest installed one.
+    
+    A requested backend that is not installed falls back to the fastest
+    available one, ultimately bs4.
+    """
+    available = available_backends()
+    if backend is not None and backend not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {backend}")
+    if backend is None or backend not in available:
+        if backend is not None:
+            logger.warning(f"HTML parser backend {backend} is not installed, using {available[0]}")
+        backend = available[0]
+    return BACKENDS[backend]()
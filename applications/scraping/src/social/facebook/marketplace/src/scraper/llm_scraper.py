@@ -1,25 +1,38 @@
 from src.scraper.base import BaseScraper
+from src.inference import BatchInferenceEngine, get_pipeline, get_result_cache
 from src.logging.logger import log_execution_time
-from transformers import pipeline
+import asyncio
 
 class LLMScraper(BaseScraper):
-    def __init__(self):
+    def __init__(self, max_batch_size: int = 16, max_wait: float = 0.05,
+                 model_variant: str = 'default', result_cache=None):
         super().__init__(name="llm")
-        self.summarizer = pipeline("summarization")
-        self.classifier = pipeline("text-classification")
+        self.summarizer = get_pipeline("summarization", variant=model_variant)
+        self.classifier = get_pipeline("text-classification", variant=model_variant)
+        # Listings are re-scraped often; unchanged text skips inference
+        self.result_cache = result_cache or get_result_cache()
+        self.summary_engine = BatchInferenceEngine(
+            self.summarizer, name='summarization',
+            max_batch_size=max_batch_size, max_wait=max_wait, cache=self.result_cache,
+            max_length=100, truncation=True
+        )
+        self.classification_engine = BatchInferenceEngine(
+            self.classifier, name='text-classification',
+            max_batch_size=max_batch_size, max_wait=max_wait, cache=self.result_cache,
+            truncation=True
+        )
         
     @log_execution_time
     async def process_listings(self, listings):
         """Process listings with LLM for enhanced analysis"""
         try:
-            processed_listings = []
-            for listing in listings:
-                if not listing:
-                    continue
-                    
-                analysis = await self._analyze_listing(listing)
+            processed_listings = [listing for listing in listings if listing]
+            # Analyse concurrently so the engines can batch the descriptions
+            analyses = await asyncio.gather(
+                *(self._analyze_listing(listing) for listing in processed_listings)
+            )
+            for listing, analysis in zip(processed_listings, analyses):
                 listing['analysis'] = analysis
-                processed_listings.append(listing)
                 
             return processed_listings
             
@@ -32,14 +45,14 @@ class LLMScraper(BaseScraper):
         try:
             description = listing.get('description', '')
             
-            # Generate summary
-            summary = self.summarizer(description, max_length=100)[0]['summary_text']
-            
-            # Classify listing
-            classification = self.classifier(description)[0]
+            # Generate summary and classify listing
+            summary, classification = await asyncio.gather(
+                self.summary_engine.submit(description),
+                self.classification_engine.submit(description)
+            )
             
             return {
-                'summary': summary,
+                'summary': summary['summary_text'],
                 'category': classification['label'],
                 'confidence': classification['score']
             }
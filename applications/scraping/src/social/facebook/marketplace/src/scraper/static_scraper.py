@@ -1,48 +1,89 @@
 from src.scraper.base import BaseScraper
+from src.scraper.utils import get_http_session, get_revalidation_cache
+from src.scraper.html_parser import get_html_parser
 from src.logging.logger import log_execution_time
-import aiohttp
-from bs4 import BeautifulSoup
+
+LISTING_SELECTOR = '[data-testid="marketplace_listing_item"]'
 
 class StaticScraper(BaseScraper):
-    def __init__(self):
+    """Scrapes category pages over plain HTTP.
+    
+    With ``revalidate``, pages are fetched conditionally against the
+    process-wide RevalidationCache. A changed page's validators are kept
+    once its listings have been parsed, unless ``auto_commit`` is False:
+    then the caller calls ``commit(category)`` after storing the listings,
+    and until it does the page is fetched and parsed again.
+    """
+    def __init__(self, revalidate: bool = True, parser: str = None, auto_commit: bool = True):
         super().__init__(name="static")
+        self.revalidation = get_revalidation_cache() if revalidate else None
+        self.auto_commit = auto_commit
+        self.parser = get_html_parser(parser)
         
     @log_execution_time
-    async def scrape_category(self, category: str):
-        """Scrape listings using static HTML requests"""
+    async def scrape_category(self, category: str, limit: int = None):
+        """Scrape listings using static HTML requests.
+        
+        With revalidation, an unchanged page (304, or a 200 with the same
+        body as last committed) returns no listings without being parsed.
+        With a limit, parsing stops once that many listings are found; such
+        a partial parse is never committed automatically.
+        """
         try:
-            url = f"{self.base_url}/category/{category}"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        return self._parse_html(html)
+            url = self._category_url(category)
+            headers = self.revalidation.request_headers(url) if self.revalidation else {}
+            async with get_http_session().get(url, headers=headers) as response:
+                if response.status == 304:
+                    self.logger.info(f"Category {category} not modified")
                     return []
-                    
+                if response.status == 200:
+                    html = await response.text()
+                    if self.revalidation and not self.revalidation.is_changed(url, response.headers, html):
+                        self.logger.info(f"Category {category} unchanged")
+                        return []
+                    try:
+                        listings = self._select_listings(html, limit)
+                    except Exception as e:
+                        self.logger.error(f"Error parsing HTML: {str(e)}")
+                        return []
+                    if self.auto_commit and limit is None:
+                        self.commit(category)
+                    return listings
+                return []
+                
         except Exception as e:
             self.logger.error(f"Error in static scraping: {str(e)}")
             raise
             
-    def _parse_html(self, html):
+    def commit(self, category: str):
+        """Record the last fetched page of category as handled"""
+        if self.revalidation:
+            self.revalidation.commit(self._category_url(category))
+            
+    def _category_url(self, category: str) -> str:
+        return f"{self.base_url}/category/{category}"
+        
+    def _parse_html(self, html, limit=None):
         """Parse HTML content for listings"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            listings = soup.select('[data-testid="marketplace_listing_item"]')
-            
-            return [self._parse_listing(listing) for listing in listings]
+            return self._select_listings(html, limit)
             
         except Exception as e:
             self.logger.error(f"Error parsing HTML: {str(e)}")
             return []
             
+    def _select_listings(self, html, limit=None):
+        listings = self.parser.select(html, LISTING_SELECTOR, limit)
+        return [self._parse_listing(listing) for listing in listings]
+        
     def _parse_listing(self, element):
         """Parse individual listing HTML"""
         try:
             return {
-                'title': element.select_one('h2').text.strip(),
-                'price': element.select_one('[data-testid="price"]').text.strip(),
-                'location': element.select_one('[data-testid="location"]').text.strip(),
-                'url': element.select_one('a')['href']
+                'title': element.select_one('h2').text().strip(),
+                'price': element.select_one('[data-testid="price"]').text().strip(),
+                'location': element.select_one('[data-testid="location"]').text().strip(),
+                'url': element.select_one('a').attrs['href']
             }
         except Exception as e:
             self.logger.error(f"Error parsing listing element: {str(e)}")
@@ -0,0 +1,128 @@
+import asyncio
+import hashlib
+import random
+import aiohttp
+from src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+_session = None
+
+def get_http_session(limit: int = 100, limit_per_host: int = 10,
+                     dns_cache_ttl: int = 300, keepalive_timeout: int = 30) -> aiohttp.ClientSession:
+    """Get the process-wide HTTP session, creating it on first use.
+    
+    The session's connector keeps connections alive and caches DNS across
+    pipeline runs; ``limit_per_host`` caps concurrent requests to any one host.
+    """
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            ttl_dns_cache=dns_cache_ttl,
+            keepalive_timeout=keepalive_timeout
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+    return _session
+    
+async def close_http_session():
+    """Close the shared HTTP session, e.g. on application shutdown"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    
+async def request_json(session, method: str, url: str, retries: int = 3,
+                       backoff: float = 0.5, **kwargs):
+    """Send a request and return its JSON body, or None if it does not succeed.
+    
+    Rate-limited, 5xx and connection failures are retried with exponential
+    backoff and full jitter, so concurrent callers do not retry in lockstep.
+    """
+    for attempt in range(retries + 1):
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                if response.status == 200:
+                    return await response.json(content_type=None)
+                if response.status not in RETRYABLE_STATUSES:
+                    return None
+                error = f"HTTP {response.status}"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error = str(e) or type(e).__name__
+            
+        if attempt < retries:
+            await asyncio.sleep(random.uniform(0, backoff * 2 ** attempt))
+            
+    logger.error(f"{method} {url} failed after {retries + 1} attempts: {error}")
+    return None
+
+class RevalidationCache:
+    """Per-URL validators for conditional GETs and change detection.
+    
+    Remembers each URL's ETag, Last-Modified and a hash of the last body.
+    ``request_headers`` turns them into If-None-Match / If-Modified-Since,
+    and ``is_changed`` compares a fresh 200 body against the stored hash,
+    which catches servers that send no validators at all.
+    
+    A changed response's validators are only held as pending until
+    ``commit`` is called, so a page whose listings failed to parse or store
+    is fetched and processed again instead of being skipped as unchanged.
+    """
+    def __init__(self):
+        self._entries = {}
+        self._pending = {}
+        
+    def request_headers(self, url: str) -> dict:
+        entry = self._entries.get(url, {})
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+        
+    def is_changed(self, url: str, response_headers, body: str) -> bool:
+        """Check a 200 response, returning False if its body is unchanged.
+        
+        A changed body's validators become pending until ``commit(url)``.
+        """
+        body_hash = hashlib.sha256(body.encode()).hexdigest()
+        previous = self._entries.get(url)
+        if previous is not None and previous['body_hash'] == body_hash:
+            return False
+        self._pending[url] = {
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified'),
+            'body_hash': body_hash
+        }
+        return True
+        
+    def commit(self, url: str):
+        """Keep the pending validators once the response has been handled"""
+        entry = self._pending.pop(url, None)
+        if entry is not None:
+            self._entries[url] = entry
+            
+    def forget(self, url: str):
+        self._entries.pop(url, None)
+        self._pending.pop(url, None)
+            
+_revalidation_cache = None
+
+def get_revalidation_cache() -> RevalidationCache:
+    """Get the process-wide revalidation cache, creating it on first use.
+    
+    Shared so that every scraper instance, including the fresh ones
+    ScraperFactory builds, revalidates against the same validators.
+    """
+    global _revalidation_cache
+    if _revalidation_cache is None:
+        _revalidation_cache = RevalidationCache()
+    return _revalidation_cache
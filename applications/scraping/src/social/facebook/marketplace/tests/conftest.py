@@ -1,6 +1,69 @@
 import pytest
+import pytest_asyncio
+from aiohttp import web
 from src.scraper.factory import ScraperFactory
+from src.scraper.utils import close_http_session
 
 @pytest.fixture
 def scraper_factory():
     return ScraperFactory()
+    
+class GraphQLStubServer:
+    """Local stand-in for the marketplace GraphQL endpoint"""
+    method, path = 'POST', '/api/graphql'
+    
+    def __init__(self):
+        self.requests = []
+        self.base_url = None
+        
+    async def handle(self, request):
+        body = await request.json()
+        self.requests.append(body)
+        # Answer every aliased listing (idN -> lN) in the batch
+        data = {}
+        for name, listing_id in body.get('variables', {}).items():
+            data['l' + name[len('id'):]] = {
+                'description': f'Listing {listing_id}',
+                'seller': {'id': f'seller-{listing_id}', 'name': 'Seller'},
+                'images': [{'url': f'https://images.example/{listing_id}.jpg'}]
+            }
+        return web.json_response({'data': data})
+        
+class StaticPageServer:
+    """Serves a fixed category page, honouring If-None-Match when etag is set"""
+    method, path = 'GET', '/category/{category}'
+    
+    def __init__(self):
+        self.requests = []
+        self.base_url = None
+        self.etag = None
+        self.html = (
+            '<div data-testid="marketplace_listing_item"><a href="/marketplace/item/1">'
+            '<h2>Bike</h2></a><span data-testid="price">$100</span>'
+            '<span data-testid="location">Austin</span></div>'
+        )
+        
+    async def handle(self, request):
+        self.requests.append(dict(request.headers))
+        if self.etag and request.headers.get('If-None-Match') == self.etag:
+            return web.Response(status=304)
+        headers = {'ETag': self.etag} if self.etag else {}
+        return web.Response(text=self.html, content_type='text/html', headers=headers)
+        
+STUB_SERVERS = {'graphql': GraphQLStubServer, 'static_page': StaticPageServer}
+
+@pytest_asyncio.fixture
+async def stub_server(request):
+    """Run the stub named by indirect parametrisation on a local port"""
+    stub = STUB_SERVERS[request.param]()
+    app = web.Application()
+    app.router.add_route(stub.method, stub.path, stub.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    stub.base_url = f'http://127.0.0.1:{port}'
+    yield stub
+    await close_http_session()
+    await runner.cleanup()
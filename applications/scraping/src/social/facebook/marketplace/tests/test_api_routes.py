@@ -0,0 +1,36 @@
+import pytest
+from datetime import datetime
+from sqlalchemy.dialects import postgresql
+from src.api.routes import router, decode_cursor, encode_cursor, _listing_columns, _listings_query
+from src.database.session import get_primary_read_session
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    cursor = encode_cursor({'created_at': created_at, 'id': 42})
+    
+    assert decode_cursor(cursor) == (created_at, 42)
+    
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-cursor')
+        
+def test_unknown_fields_are_rejected():
+    assert _listing_columns('title, price') == ['title', 'price']
+    with pytest.raises(ValueError):
+        _listing_columns('title,password')
+        
+def test_listings_query_is_keyset_paginated_and_projected():
+    cursor = encode_cursor({'created_at': datetime(2024, 5, 1), 'id': 42})
+    query = _listings_query(['title'], 'vehicles', 24, cursor, 50)
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    
+    assert sql.startswith('SELECT marketplace_listings.title, marketplace_listings.created_at, marketplace_listings.id \n')
+    assert '(marketplace_listings.created_at, marketplace_listings.id) < (' in sql
+    assert 'OFFSET' not in sql
+    assert 'ORDER BY marketplace_listings.created_at DESC, marketplace_listings.id DESC' in sql
+    
+@pytest.mark.parametrize('path', ['/listings/', '/listings/{listing_id}/analysis'])
+def test_cached_routes_read_from_the_primary(path):
+    route = next(route for route in router.routes if route.path == path)
+    
+    assert get_primary_read_session in [dependency.call for dependency in route.dependant.dependencies]
@@ -4,3 +4,19 @@ from src.scraper.api_scraper import APIScraper
 def test_api_scraper_initialization():
     scraper = APIScraper()
     assert scraper is not None
+    
+@pytest.mark.asyncio
+@pytest.mark.parametrize('stub_server', ['graphql'], indirect=True)
+async def test_enrich_listings_batches_requests(stub_server):
+    scraper = APIScraper(batch_size=10)
+    scraper.base_url = stub_server.base_url
+    listings = [
+        {'url': f'https://www.facebook.com/marketplace/item/{i}'}
+        for i in range(25)
+    ]
+    
+    enriched = await scraper.enrich_listings(listings)
+    
+    assert len(stub_server.requests) == 3
+    assert [listing['seller_id'] for listing in enriched] == [f'seller-{i}' for i in range(25)]
+    assert enriched[0]['images'] == ['https://images.example/0.jpg']
@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+from src.inference import BatchInferenceEngine, InferenceCache
+
+class EchoModel:
+    """Pipeline stand-in that records the batches it is called with"""
+    def __init__(self):
+        self.batches = []
+        self.calls = []
+        
+    def __call__(self, texts, **kwargs):
+        self.batches.append(list(texts))
+        self.calls.append(kwargs)
+        if 'bad' in texts:
+            raise ValueError('bad input')
+        return [{'label': text.upper(), 'score': 1.0} for text in texts]
+        
+@pytest.mark.asyncio
+async def test_engine_batches_concurrent_submissions():
+    model = EchoModel()
+    engine = BatchInferenceEngine(model, max_batch_size=4, max_wait=0.1)
+    texts = [f'text{i}' for i in range(10)]
+    
+    results = await engine.submit_many(texts)
+    await engine.close()
+    
+    assert [result['label'] for result in results] == [text.upper() for text in texts]
+    assert [len(batch) for batch in model.batches] == [4, 4, 2]
+    
+@pytest.mark.asyncio
+async def test_engine_runs_each_batch_as_one_padded_forward_pass():
+    model = EchoModel()
+    engine = BatchInferenceEngine(model, max_batch_size=8, max_wait=0.1, truncation=True)
+    
+    await engine.submit_many([f'text{i}' for i in range(5)])
+    await engine.close()
+    
+    assert model.batches == [[f'text{i}' for i in range(5)]]
+    assert model.calls == [{'batch_size': 5, 'truncation': True}]
+    
+@pytest.mark.asyncio
+async def test_engine_isolates_failing_inputs():
+    model = EchoModel()
+    engine = BatchInferenceEngine(model, max_batch_size=8, max_wait=0.1)
+    
+    results = await asyncio.gather(
+        *(engine.submit(text) for text in ['good', 'bad', 'fine']),
+        return_exceptions=True
+    )
+    await engine.close()
+    
+    assert results[0]['label'] == 'GOOD'
+    assert isinstance(results[1], ValueError)
+    assert results[2]['label'] == 'FINE'
+    
+@pytest.mark.asyncio
+async def test_engine_skips_cached_texts(tmp_path):
+    model = EchoModel()
+    cache = InferenceCache(str(tmp_path / 'cache.sqlite'))
+    engine = BatchInferenceEngine(model, max_batch_size=8, max_wait=0.05, cache=cache)
+    
+    await engine.submit_many(['a', 'b', 'a'])
+    results = await engine.submit_many(['a', 'b', 'c'])
+    await engine.close()
+    
+    assert [result['label'] for result in results] == ['A', 'B', 'C']
+    assert model.batches == [['a', 'b'], ['c']]
@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from src.scraper.browser_pool import BrowserPool
+
+class FakeDriver:
+    """WebDriver stand-in that tracks launches and quits"""
+    launched = 0
+    
+    def __init__(self):
+        FakeDriver.launched += 1
+        self.alive = True
+        self.quit_called = False
+        
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError('browser crashed')
+        return 1
+        
+    def quit(self):
+        self.quit_called = True
+
+@pytest.fixture(autouse=True)
+def reset_launches():
+    FakeDriver.launched = 0
+
+@pytest.mark.asyncio
+async def test_pool_reuses_warm_browsers():
+    pool = BrowserPool(size=2, max_pages=100, driver_factory=FakeDriver)
+    await pool.start()
+    
+    results = await asyncio.gather(*(pool.run(lambda driver, i: i * 2, i) for i in range(10)))
+    await pool.close()
+    
+    assert results == [i * 2 for i in range(10)]
+    assert FakeDriver.launched == 2
+
+@pytest.mark.asyncio
+async def test_failed_start_keeps_launched_browsers_in_the_pool():
+    drivers = []
+    
+    def flaky_factory():
+        if drivers:
+            raise RuntimeError('chrome failed to start')
+        drivers.append(FakeDriver())
+        return drivers[-1]
+        
+    pool = BrowserPool(size=2, driver_factory=flaky_factory)
+    with pytest.raises(RuntimeError):
+        await pool.start()
+        
+    assert pool._slots.qsize() == 2
+    await pool.close()
+    assert drivers[0].quit_called
+
+@pytest.mark.asyncio
+async def test_pool_recycles_after_max_pages():
+    pool = BrowserPool(size=1, max_pages=3, driver_factory=FakeDriver)
+    drivers = [await pool.run(lambda driver: driver) for _ in range(4)]
+    await pool.close()
+    
+    assert drivers[0] is drivers[2]
+    assert drivers[0].quit_called
+    assert drivers[3] is not drivers[0]
+
+@pytest.mark.asyncio
+async def test_pool_replaces_unhealthy_browser():
+    pool = BrowserPool(size=1, driver_factory=FakeDriver)
+    first = await pool.run(lambda driver: driver)
+    first.alive = False
+    second = await pool.run(lambda driver: driver)
+    await pool.close()
+    
+    assert second is not first
+    assert first.quit_called
@@ -1,6 +1,61 @@
+import json
 import pytest
+from src.scraper.browser_pool import BrowserPool
 from src.scraper.dynamic_scraper import DynamicScraper
+from src.scraper.embedded_data import find_marketplace_listings
 
 def test_dynamic_scraper_initialization():
     scraper = DynamicScraper()
     assert scraper is not None
+
+EMBEDDED_PAYLOAD = json.dumps({'require': [{'marketplace_search': {'feed_units': {'edges': [
+    {'node': {'listing': {
+        'id': '123',
+        'marketplace_listing_title': 'Road bike',
+        'listing_price': {'amount': '250.00', 'formatted_amount': '$250'},
+        'location': {'reverse_geocode': {'city': 'Austin', 'state': 'TX'}}
+    }}},
+    {'node': {'listing': {'id': '123', 'marketplace_listing_title': 'Road bike'}}}
+]}}}]})
+
+class EmbeddedJSONDriver:
+    """Driver stand-in serving a page with embedded listing data"""
+    def get(self, url):
+        self.url = url
+        
+    def execute_script(self, script):
+        return 1 if script == 'return 1' else ['{}', EMBEDDED_PAYLOAD]
+        
+    def quit(self):
+        pass
+
+def test_find_marketplace_listings_from_embedded_json():
+    listings = find_marketplace_listings(['not json', EMBEDDED_PAYLOAD])
+    
+    assert listings == [{
+        'title': 'Road bike',
+        'price': 250.0,
+        'location': 'Austin, TX',
+        'url': 'https://www.facebook.com/marketplace/item/123'
+    }]
+
+def test_embedded_listing_prices_are_numeric_or_none():
+    payload = json.dumps([
+        {'id': '1', 'marketplace_listing_title': 'Sofa',
+         'listing_price': {'amount': '0', 'formatted_amount': 'Free'}},
+        {'id': '2', 'marketplace_listing_title': 'Lamp'}
+    ])
+    
+    listings = find_marketplace_listings([payload])
+    
+    assert [listing['price'] for listing in listings] == [0.0, None]
+
+@pytest.mark.asyncio
+async def test_dynamic_scraper_reads_embedded_json():
+    pool = BrowserPool(size=1, driver_factory=EmbeddedJSONDriver)
+    scraper = DynamicScraper(pool=pool)
+    
+    listings = await scraper.scrape_category('bikes')
+    await pool.close()
+    
+    assert [listing['title'] for listing in listings] == ['Road bike']
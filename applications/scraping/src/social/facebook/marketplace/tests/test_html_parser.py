@@ -0,0 +1,48 @@
+from pathlib import Path
+import pytest
+from src.scraper.html_parser import available_backends, get_html_parser
+from src.scraper.static_scraper import StaticScraper
+
+PAGE = (Path(__file__).parent / 'fixtures' / 'pages' / 'marketplace_category.html').read_text()
+
+# The marketplace image ships only this directory, so it keeps its own copy
+# of the parser; in the monorepo it must match the shared one
+SHARED_PARSER = Path(__file__).resolve().parents[4] / 'shared' / 'html_parser.py'
+
+@pytest.mark.parametrize('backend', available_backends())
+def test_backends_extract_the_same_listings(backend):
+    expected = StaticScraper(parser='bs4')._parse_html(PAGE)
+    listings = StaticScraper(parser=backend)._parse_html(PAGE)
+    
+    assert len(listings) == 120
+    assert listings == expected
+
+@pytest.mark.parametrize('backend', available_backends())
+def test_backends_stop_at_limit(backend):
+    listings = StaticScraper(parser=backend)._parse_html(PAGE, limit=3)
+    
+    assert listings == StaticScraper(parser='bs4')._parse_html(PAGE)[:3]
+
+NESTED = (
+    '<div class="a" id="outer">Outer <div class="a" id="inner">Inner</div></div>'
+    '<div class="a" id="last">Last</div>'
+)
+
+@pytest.mark.parametrize('backend', available_backends())
+@pytest.mark.parametrize('limit', [None, 1, 2])
+def test_nested_matches_come_back_in_document_order(backend, limit):
+    nodes = get_html_parser(backend).select(NESTED, 'div.a', limit)
+    
+    assert [node.attrs['id'] for node in nodes] == ['outer', 'inner', 'last'][:limit]
+    assert nodes[0].text() == 'Outer Inner'
+
+def test_missing_backend_falls_back():
+    assert get_html_parser('bs4').name == 'bs4'
+    with pytest.raises(ValueError):
+        get_html_parser('html5lib')
+        
+@pytest.mark.skipif(not SHARED_PARSER.exists(), reason='shared package not checked out')
+def test_parser_matches_shared_copy():
+    local = Path(__file__).resolve().parents[1] / 'src' / 'scraper' / 'html_parser.py'
+    
+    assert local.read_text() == SHARED_PARSER.read_text()
@@ -0,0 +1,38 @@
+import threading
+from src.inference import InferenceCache
+
+def test_cache_persists_to_disk(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    key = InferenceCache.make_key('summarization', 'a red bike', {'max_length': 100})
+    cache = InferenceCache(path)
+    cache.set(key, {'summary_text': 'bike'})
+    cache.close()
+    
+    reopened = InferenceCache(path)
+    assert reopened.get_memory(key) is None
+    assert reopened.get(key) == {'summary_text': 'bike'}
+    assert reopened.get(InferenceCache.make_key('summarization', 'a red bike', {})) is None
+    
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = InferenceCache(str(tmp_path / 'cache.sqlite'), memory_size=1, max_bytes=80)
+    cache.set('old', 'x' * 30)
+    cache.set('used', 'y' * 30)
+    cache.get('old')
+    cache.set('new', 'z' * 30)
+    
+    assert cache.get('used') is None
+    assert cache.get('old') == 'x' * 30
+    assert cache.get('new') == 'z' * 30
+    
+def test_memory_lookups_do_not_wait_for_disk_writes(tmp_path):
+    cache = InferenceCache(str(tmp_path / 'cache.sqlite'))
+    cache.set('key', 'value')
+    found = []
+    
+    # Stand-in for a slow write or eviction holding the database
+    with cache._db_lock:
+        reader = threading.Thread(target=lambda: found.append(cache.get_memory('key')))
+        reader.start()
+        reader.join(timeout=1)
+        
+    assert found == ['value']
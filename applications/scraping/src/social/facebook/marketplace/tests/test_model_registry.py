@@ -0,0 +1,62 @@
+import asyncio
+import time
+import pytest
+from src.inference import BatchInferenceEngine
+from src.inference.registry import ModelRegistry
+import src.inference.registry as registry_module
+
+def test_registry_loads_each_model_once(monkeypatch):
+    loads = []
+    monkeypatch.setattr(registry_module, 'pipeline', lambda task, model=None: loads.append(task) or object())
+    registry = ModelRegistry()
+    
+    first = registry.get('summarization')
+    second = registry.get('summarization')
+    registry.get('text-classification')
+    
+    assert first is second
+    assert loads == ['summarization', 'text-classification']
+    
+def test_registry_rejects_unknown_variant():
+    with pytest.raises(ValueError):
+        ModelRegistry().get('summarization', variant='fp4')
+        
+def test_registry_keeps_one_executor_per_pipeline():
+    registry = ModelRegistry()
+    first, second = object(), object()
+    
+    executor = registry.executor(first)
+    
+    assert registry.executor(first) is executor
+    assert registry.executor(second) is not executor
+    
+    registry.shutdown()
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
+    assert registry.executor(first) is not executor
+    registry.shutdown()
+    
+class SerialModel:
+    """Pipeline stand-in that fails if it is ever called concurrently"""
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        
+    def __call__(self, texts, **kwargs):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        self.active -= 1
+        return [{'label': text} for text in texts]
+        
+@pytest.mark.asyncio
+async def test_engines_sharing_a_pipeline_never_call_it_concurrently():
+    model = SerialModel()
+    engines = [BatchInferenceEngine(model, name=f'engine{i}', max_batch_size=2, max_wait=0) for i in range(3)]
+    
+    await asyncio.gather(*(engine.submit_many(['a', 'b', 'c', 'd']) for engine in engines))
+    for engine in engines:
+        await engine.close()
+        
+    assert engines[0].executor is engines[1].executor is engines[2].executor
+    assert model.max_active == 1
@@ -1,6 +1,191 @@
+import asyncio
 import pytest
-from src.pipeline.data_pipeline import MarketplacePipeline
+from sqlalchemy.dialects import postgresql
+from src.pipeline import data_pipeline
+from src.pipeline.data_pipeline import MarketplacePipeline, build_listing_upsert, listing_row, parse_price
 
 def test_pipeline_initialization():
     pipeline = MarketplacePipeline()
     assert pipeline is not None
+    
+def test_listing_upsert_is_one_statement():
+    rows = [
+        listing_row({'url': f'https://www.facebook.com/marketplace/item/{i}',
+                     'title': 'Bike', 'price': '$100', 'location': 'Austin'})
+        for i in range(3)
+    ]
+    sql = str(build_listing_upsert(rows).compile(dialect=postgresql.dialect()))
+    
+    assert sql.count('INSERT INTO marketplace_listings') == 1
+    assert 'ON CONFLICT (listing_id) DO UPDATE' in sql
+    assert 'RETURNING marketplace_listings.id, marketplace_listings.listing_id, xmax = 0' in sql
+    
+@pytest.mark.parametrize('price, expected', [
+    ('$1,200', 1200.0), (250.0, 250.0), (0, 0.0), ('Free', None), ('', None), (None, None)
+])
+def test_parse_price(price, expected):
+    assert parse_price(price) == expected
+    
+def test_listing_row_keeps_free_and_unpriced_listings():
+    free = listing_row({'url': 'https://www.facebook.com/marketplace/item/1', 'title': 'Sofa',
+                        'price': 'Free', 'location': 'Austin'})
+    unpriced = listing_row({'url': 'https://www.facebook.com/marketplace/item/2', 'title': 'Lamp',
+                            'price': None, 'location': 'Austin'})
+    
+    assert free['price'] is None
+    assert unpriced['price'] is None
+    
+class FakeStage:
+    """Records when each batch passes through a pipeline stage"""
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.events = []
+        
+    async def iter_category(self, category):
+        for i in range(20):
+            await asyncio.sleep(self.delay)
+            self.events.append(('scraped', i))
+            yield {'url': f'https://www.facebook.com/marketplace/item/{i}'}
+            
+    async def process(self, batch):
+        await asyncio.sleep(self.delay)
+        return batch
+        
+@pytest.mark.asyncio
+async def test_pipeline_streams_listings_through_stages():
+    stage = FakeStage()
+    stored = []
+    
+    async def store(batch):
+        stage.events.append(('stored', len(batch)))
+        stored.extend(batch)
+        return {listing['url']: index for index, listing in enumerate(batch)}, set()
+        
+    pipeline = MarketplacePipeline(queue_size=4, store_batch_size=5, batch_wait=0.02)
+    pipeline.dynamic_scraper = stage
+    pipeline.api_scraper.enrich_listings = stage.process
+    pipeline.llm_scraper.process_listings = stage.process
+    pipeline._store_listings = store
+    
+    counts = await pipeline.process_category('bikes')
+    
+    assert counts == {'stored': 20, 'new': 0}
+    assert len(stored) == 20
+    # Storage starts before scraping has finished
+    assert stage.events.index(('scraped', 19)) > min(
+        index for index, event in enumerate(stage.events) if event[0] == 'stored'
+    )
+    
+@pytest.mark.asyncio
+async def test_failing_store_stops_stages_blocked_on_full_queues():
+    stage = FakeStage(delay=0)
+    
+    async def store(batch):
+        # Let every upstream queue fill up before failing
+        await asyncio.sleep(0.05)
+        raise RuntimeError('database unavailable')
+        
+    pipeline = MarketplacePipeline(queue_size=1, llm_concurrency=1, store_batch_size=1,
+                                   batch_wait=0)
+    pipeline.dynamic_scraper = stage
+    pipeline.api_scraper.enrich_listings = stage.process
+    pipeline.llm_scraper.process_listings = stage.process
+    pipeline._store_listings = store
+    
+    with pytest.raises(Exception, match='database unavailable'):
+        await asyncio.wait_for(pipeline.process_category('bikes'), timeout=5)
+    # The scraper was still blocked on its full queue when the store failed
+    assert ('scraped', 19) not in stage.events
+    
+class FakeResult(list):
+    pass
+    
+class FakeSession:
+    """Records the transaction lifecycle _store_listings drives"""
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.events = []
+        
+    async def __aenter__(self):
+        return self
+        
+    async def __aexit__(self, *exc_info):
+        self.events.append('closed')
+        
+    def begin(self):
+        session = self
+        
+        class Transaction:
+            async def __aenter__(self):
+                session.events.append('begin')
+                
+            async def __aexit__(self, exc_type, *exc_info):
+                session.events.append('rollback' if exc_type else 'commit')
+                
+        return Transaction()
+        
+    async def execute(self, statement):
+        if self.fail:
+            raise RuntimeError('database unavailable')
+        rows = statement.compile().params
+        return FakeResult([(1, rows.get('listing_id_m0', rows.get('listing_id')), True)])
+        
+@pytest.mark.asyncio
+async def test_store_listings_commits_and_closes_its_session(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(data_pipeline, 'async_session', lambda: session)
+    pipeline = MarketplacePipeline()
+    
+    ids, inserted = await pipeline._store_listings([
+        {'url': 'https://www.facebook.com/marketplace/item/1', 'title': 'Bike',
+         'price': '$100', 'location': 'Austin'}
+    ])
+    
+    assert ids == {'1': 1}
+    assert inserted == {'1'}
+    assert session.events == ['begin', 'commit', 'closed']
+    
+@pytest.mark.asyncio
+async def test_store_listings_rolls_back_and_closes_on_error(monkeypatch):
+    session = FakeSession(fail=True)
+    monkeypatch.setattr(data_pipeline, 'async_session', lambda: session)
+    pipeline = MarketplacePipeline()
+    
+    with pytest.raises(RuntimeError):
+        await pipeline._store_listings([
+            {'url': 'https://www.facebook.com/marketplace/item/1', 'title': 'Bike',
+             'price': '$100', 'location': 'Austin'}
+        ])
+        
+    assert session.events == ['begin', 'rollback', 'closed']
+    
+class RescrapeSession(FakeSession):
+    """Reports listing 1 as new and listing 2 as already stored"""
+    def __init__(self):
+        super().__init__()
+        self.analyses = []
+        
+    async def execute(self, statement):
+        if statement.table.name == 'listing_analyses':
+            self.analyses.extend(
+                value for name, value in statement.compile().params.items()
+                if name.startswith('listing_id')
+            )
+            return FakeResult()
+        return FakeResult([(1, '1', True), (2, '2', False)])
+        
+@pytest.mark.asyncio
+async def test_store_listings_analyses_only_new_listings(monkeypatch):
+    session = RescrapeSession()
+    monkeypatch.setattr(data_pipeline, 'async_session', lambda: session)
+    pipeline = MarketplacePipeline()
+    
+    ids, inserted = await pipeline._store_listings([
+        {'url': f'https://www.facebook.com/marketplace/item/{i}', 'title': 'Bike',
+         'price': '$100', 'location': 'Austin', 'analysis': {'confidence': 0.9}}
+        for i in (1, 2)
+    ])
+    
+    assert ids == {'1': 1, '2': 2}
+    assert inserted == {'1'}
+    assert session.analyses == [1]
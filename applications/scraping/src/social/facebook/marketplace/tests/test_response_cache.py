@@ -0,0 +1,86 @@
+import pytest
+from fastapi import Request
+from src.api.cache import MemoryBackend, ResponseCache
+
+def make_request(query: str = 'category=bikes&limit=10', headers: dict = None):
+    return Request({
+        'type': 'http',
+        'method': 'GET',
+        'path': '/listings/',
+        'query_string': query.encode(),
+        'headers': [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    })
+    
+class Source:
+    """Counts how often the cache falls through to the database"""
+    def __init__(self):
+        self.calls = 0
+        
+    async def compute(self):
+        self.calls += 1
+        return [{'title': f'Bike {self.calls}'}], {'X-Next-Cursor': 'abc'}
+        
+@pytest.mark.asyncio
+async def test_responses_are_cached_by_query_parameters():
+    cache = ResponseCache()
+    source = Source()
+    
+    first = await cache.respond(make_request(), source.compute)
+    second = await cache.respond(make_request('limit=10&category=bikes'), source.compute)
+    await cache.respond(make_request('category=furniture'), source.compute)
+    
+    assert source.calls == 2
+    assert first.body == second.body
+    assert second.headers['x-next-cursor'] == 'abc'
+    
+@pytest.mark.asyncio
+async def test_matching_etag_returns_not_modified():
+    cache = ResponseCache()
+    source = Source()
+    etag = (await cache.respond(make_request(), source.compute)).headers['etag']
+    
+    response = await cache.respond(make_request(headers={'If-None-Match': etag}), source.compute)
+    
+    assert response.status_code == 304
+    assert response.body == b''
+    assert response.headers['etag'] == etag
+    
+@pytest.mark.asyncio
+async def test_invalidation_drops_cached_responses():
+    cache = ResponseCache()
+    source = Source()
+    etag = (await cache.respond(make_request(), source.compute)).headers['etag']
+    
+    await cache.invalidate()
+    response = await cache.respond(make_request(headers={'If-None-Match': etag}), source.compute)
+    
+    assert source.calls == 2
+    assert response.status_code == 200
+    assert b'Bike 2' in response.body
+    
+@pytest.mark.asyncio
+async def test_response_computed_across_invalidation_is_not_served():
+    cache = ResponseCache()
+    source = Source()
+    
+    async def racing_compute():
+        # The pipeline commits while this response is being built
+        await cache.invalidate()
+        return await source.compute()
+        
+    await cache.respond(make_request(), racing_compute)
+    await cache.respond(make_request(), source.compute)
+    
+    assert source.calls == 2
+    
+@pytest.mark.asyncio
+async def test_memory_backend_expires_and_evicts():
+    backend = MemoryBackend(max_entries=2)
+    await backend.set('expired', {}, ttl=0)
+    await backend.set('a', {'n': 1}, ttl=60)
+    await backend.set('b', {'n': 2}, ttl=60)
+    await backend.set('c', {'n': 3}, ttl=60)
+    
+    assert await backend.get('expired') is None
+    assert await backend.get('a') is None
+    assert await backend.get('c') == {'n': 3}
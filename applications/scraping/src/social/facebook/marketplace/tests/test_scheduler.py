@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+from src.pipeline.scheduler import CategoryScheduler
+
+class FakeClock:
+    """Monotonic clock that only moves when the test advances it"""
+    def __init__(self):
+        self.now = 0.0
+        
+    def __call__(self):
+        return self.now
+        
+class FakePipeline:
+    """Finds new listings only in the hot category"""
+    def __init__(self, release=None):
+        self.release = release
+        self.runs = []
+        self.active = 0
+        self.max_active = 0
+        
+    async def process_category(self, category):
+        self.runs.append(category)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            if self.release is not None:
+                await self.release.wait()
+        finally:
+            self.active -= 1
+        new = 40 if category == 'hot' else 0
+        return {'stored': new, 'new': new}
+        
+async def until(condition):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0)
+    await asyncio.wait_for(poll(), timeout=1)
+    
+def start(scheduler):
+    # run() sets these up; tests that drive single runs need them too
+    scheduler._semaphore = asyncio.Semaphore(scheduler.max_concurrency)
+    scheduler._wakeup = asyncio.Event()
+    
+@pytest.mark.asyncio
+async def test_scheduler_polls_hot_categories_more_often():
+    clock = FakeClock()
+    scheduler = CategoryScheduler(
+        FakePipeline(), ['hot', 'cold'], initial_interval=300, min_interval=60,
+        max_interval=1800, target_new=20, clock=clock
+    )
+    start(scheduler)
+    
+    for _ in range(3):
+        for schedule in scheduler.schedules.values():
+            await scheduler._run_category(schedule)
+        clock.now += 300
+        
+    hot, cold = scheduler.schedules['hot'], scheduler.schedules['cold']
+    # 40 new listings every 300s -> 20 new listings every 150s
+    assert hot.interval == pytest.approx(150)
+    assert hot.new_rate == pytest.approx(40 / 300)
+    # Nothing new: back off by 1.5 on each run after the first
+    assert cold.interval == pytest.approx(300 * 1.5 ** 2)
+    assert hot.next_run == pytest.approx(600 + 150)
+    assert [entry['category'] for entry in scheduler.schedule()] == ['hot', 'cold']
+    
+@pytest.mark.asyncio
+async def test_scheduler_runs_at_most_max_concurrency_categories():
+    release = asyncio.Event()
+    pipeline = FakePipeline(release)
+    scheduler = CategoryScheduler(pipeline, ['hot', 'cold', 'other'], max_concurrency=2,
+                                  clock=FakeClock())
+                                  
+    task = asyncio.ensure_future(scheduler.run())
+    try:
+        await until(lambda: pipeline.active == 2)
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert len(pipeline.runs) == 2
+        
+        release.set()
+        await until(lambda: len(pipeline.runs) == 3)
+        assert pipeline.max_active == 2
+    finally:
+        task.cancel()
+        
+@pytest.mark.asyncio
+async def test_run_that_times_out_frees_the_category():
+    pipeline = FakePipeline(asyncio.Event())
+    clock = FakeClock()
+    scheduler = CategoryScheduler(pipeline, ['hot'], initial_interval=300, run_timeout=0.01,
+                                  clock=clock)
+    start(scheduler)
+    schedule = scheduler.schedules['hot']
+    schedule.running = True
+    
+    await scheduler._run_category(schedule)
+    
+    assert pipeline.active == 0
+    assert not schedule.running
+    assert schedule.runs == 1
+    assert 'timed out' in schedule.last_error
+    assert schedule.next_run == 300
@@ -0,0 +1,32 @@
+from src.database import session
+from src.database.session import engine_settings, make_engine
+
+def test_engine_settings_from_environment(monkeypatch):
+    monkeypatch.setenv('DATABASE_READ_POOL_SIZE', '3')
+    monkeypatch.setenv('DATABASE_READ_ECHO', 'true')
+    monkeypatch.setenv('DATABASE_READ_STATEMENT_CACHE_SIZE', '0')
+    
+    settings = engine_settings('DATABASE_READ')
+    
+    assert settings['pool_size'] == 3
+    assert settings['echo'] is True
+    assert settings['statement_cache_size'] == 0
+    assert settings['pool_pre_ping'] is True
+    
+def test_engine_defaults_to_quiet_pooled_connections():
+    engine = make_engine(pool_size=4, max_overflow=2)
+    
+    assert engine.echo is False
+    assert engine.pool.size() == 4
+    assert engine.sync_engine.pool._pre_ping is True
+    
+def test_statement_cache_size_reaches_sqlalchemy_and_asyncpg(monkeypatch):
+    calls = []
+    monkeypatch.setattr(session, 'create_async_engine', lambda url, **kwargs: calls.append(kwargs))
+    
+    make_engine(statement_cache_size=0)
+    
+    assert calls[0]['connect_args'] == {
+        'prepared_statement_cache_size': 0,
+        'statement_cache_size': 0
+    }
@@ -1,6 +1,79 @@
 import pytest
+from src.scraper import utils
+from src.scraper.factory import ScraperFactory
 from src.scraper.static_scraper import StaticScraper
+from src.scraper.utils import RevalidationCache
+
+@pytest.fixture(autouse=True)
+def fresh_revalidation_cache(monkeypatch):
+    monkeypatch.setattr(utils, '_revalidation_cache', None)
 
 def test_static_scraper_initialization():
     scraper = StaticScraper()
     assert scraper is not None
+
+def test_revalidation_keeps_validators_only_once_committed():
+    cache = RevalidationCache()
+    url = 'https://example.com/category/bikes'
+    
+    assert cache.is_changed(url, {'ETag': '"v1"'}, 'page')
+    assert cache.request_headers(url) == {}
+    assert cache.is_changed(url, {'ETag': '"v1"'}, 'page')
+    
+    cache.commit(url)
+    
+    assert cache.request_headers(url) == {'If-None-Match': '"v1"'}
+    assert not cache.is_changed(url, {'ETag': '"v1"'}, 'page')
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('stub_server', ['static_page'], indirect=True)
+async def test_static_scraper_skips_not_modified_pages(stub_server):
+    stub_server.etag = '"v1"'
+    # The factory builds a new scraper each time; they share validators
+    first_scraper = ScraperFactory.get_scraper('static')
+    second_scraper = ScraperFactory.get_scraper('static')
+    first_scraper.base_url = second_scraper.base_url = stub_server.base_url
+    
+    first = await first_scraper.scrape_category('bikes')
+    second = await second_scraper.scrape_category('bikes')
+    
+    assert [listing['title'] for listing in first] == ['Bike']
+    assert second == []
+    assert stub_server.requests[1]['If-None-Match'] == '"v1"'
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('stub_server', ['static_page'], indirect=True)
+async def test_static_scraper_skips_identical_bodies(stub_server):
+    scraper = StaticScraper()
+    scraper.base_url = stub_server.base_url
+    
+    assert len(await scraper.scrape_category('bikes')) == 1
+    assert await scraper.scrape_category('bikes') == []
+    stub_server.html += '<div data-testid="marketplace_listing_item"></div>'
+    assert len(await scraper.scrape_category('bikes')) == 2
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('stub_server', ['static_page'], indirect=True)
+async def test_uncommitted_page_is_fetched_and_parsed_again(stub_server):
+    stub_server.etag = '"v1"'
+    scraper = StaticScraper(auto_commit=False)
+    scraper.base_url = stub_server.base_url
+    
+    # Storing the first page's listings failed, so it was never committed
+    await scraper.scrape_category('bikes')
+    retried = await scraper.scrape_category('bikes')
+    scraper.commit('bikes')
+    
+    assert [listing['title'] for listing in retried] == ['Bike']
+    assert 'If-None-Match' not in stub_server.requests[1]
+    assert await scraper.scrape_category('bikes') == []
+    
+@pytest.mark.asyncio
+@pytest.mark.parametrize('stub_server', ['static_page'], indirect=True)
+async def test_partial_parse_is_not_committed(stub_server):
+    scraper = StaticScraper()
+    scraper.base_url = stub_server.base_url
+    
+    await scraper.scrape_category('bikes', limit=1)
+    
+    assert len(await scraper.scrape_category('bikes')) == 1
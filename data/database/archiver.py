@@ -0,0 +1,144 @@
+from bson import json_util
+from bson.json_util import JSONOptions
+from pymongo import ASCENDING
+from pathlib import Path
+from typing import Dict, Any, List, Optional, AsyncIterator, Union
+from .mongo_manager import MongoManager
+from ..models.base import as_utc, utcnow
+from datetime import datetime, date, timedelta, timezone
+import pyarrow as pa
+import asyncio
+import logging
+import uuid
+
+# Archived dates read back as aware UTC datetimes, like documents from MongoDB
+ARCHIVE_JSON_OPTIONS = JSONOptions(tz_aware=True, tzinfo=timezone.utc)
+
+class RawDataArchiver:
+    """Tiers aged raw data out of MongoDB into day-bucketed archive files.
+
+    Documents older than ``hot_days`` that are no longer queued for
+    processing are written to ``<root>/<data_type>/<YYYY-MM-DD>/*.jsonl.zst``
+    (Extended JSON, one document per line) and then deleted from the hot
+    collection. Each archived batch is its own file, so an interrupted run
+    can at worst archive a batch twice, never lose it.
+
+    With ``ttl_days`` a TTL index on ``finished_at`` lets MongoDB expire
+    documents ``ttl_days`` after they were processed or failed, if the
+    archiver has not moved them yet. Pending and claimed work never has
+    ``finished_at`` and is excluded by the index's partial filter as well,
+    so it is never expired.
+    """
+
+    TTL_INDEX_NAME = "finished_at_ttl"
+
+    def __init__(self, mongo: MongoManager, root: Union[str, Path] = "data/raw",
+                 hot_days: int = 30, batch_size: int = 5000,
+                 ttl_days: Optional[int] = None):
+        self.mongo = mongo
+        self.root = Path(root)
+        self.hot_days = hot_days
+        self.batch_size = batch_size
+        self.ttl_days = ttl_days
+        self.logger = logging.getLogger(__name__)
+
+    async def ensure_indexes(self, data_type: str):
+        """Index created_at so age and time-range queries are range scans"""
+        collection = self.mongo.db[f"raw_{data_type}"]
+        indexes = await collection.index_information()
+        if "expireAfterSeconds" in indexes.get("created_at", {}):
+            # Earlier versions expired created_at, including pending work
+            await collection.drop_index("created_at")
+        await collection.create_index([("created_at", ASCENDING)], name="created_at")
+        if self.ttl_days is not None:
+            await collection.create_index(
+                [("finished_at", ASCENDING)],
+                name=self.TTL_INDEX_NAME,
+                expireAfterSeconds=self.ttl_days * 86400,
+                # Processed and failed documents have their lease cleared
+                partialFilterExpression={"lease_expires_at": {"$type": "null"}}
+            )
+
+    async def archive(self, data_type: str) -> int:
+        """Move aged, finished raw data to archive files"""
+        await self.ensure_indexes(data_type)
+        cutoff = utcnow() - timedelta(days=self.hot_days)
+        query = {
+            "created_at": {"$lt": cutoff},
+            # Pending and claimed work carries a lease date; leave it alone
+            "lease_expires_at": {"$not": {"$type": "date"}}
+        }
+        collection = self.mongo.db[f"raw_{data_type}"]
+        loop = asyncio.get_running_loop()
+        archived = 0
+        async for batch in self.mongo.stream_raw_data(data_type, query, batch_size=self.batch_size):
+            await loop.run_in_executor(None, self._write_batch, data_type, batch)
+            await collection.delete_many({"_id": {"$in": [document["_id"] for document in batch]}})
+            archived += len(batch)
+        if archived:
+            self.logger.info(f"Archived {archived} raw_{data_type} documents older than {cutoff:%Y-%m-%d}")
+        return archived
+
+    async def run(self, data_types: List[str], interval: float = 3600):
+        """Archive the given data types forever, once per interval"""
+        while True:
+            for data_type in data_types:
+                try:
+                    await self.archive(data_type)
+                except Exception as e:
+                    self.logger.error(f"Archiving raw_{data_type} failed: {str(e)}")
+            await asyncio.sleep(interval)
+
+    async def find_by_time(self, data_type: str, start: datetime, end: datetime,
+                           query: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict]:
+        """Raw documents created in [start, end), from the hot collection and
+        only the archive buckets whose day overlaps the range"""
+        start, end = as_utc(start), as_utc(end)
+        time_query = {**(query or {}), "created_at": {"$gte": start, "$lt": end}}
+        async for batch in self.mongo.stream_raw_data(data_type, time_query, batch_size=self.batch_size):
+            for document in batch:
+                yield document
+
+        loop = asyncio.get_running_loop()
+        for path in self.archive_files(data_type, start.date(), end.date()):
+            documents = await loop.run_in_executor(None, self._read_file, path)
+            for document in documents:
+                if start <= document["created_at"] < end and self._matches(document, query):
+                    yield document
+
+    def archive_files(self, data_type: str, start: date, end: date) -> List[Path]:
+        """Archive files for the days between start and end inclusive"""
+        directory = self.root / data_type
+        if not directory.exists():
+            return []
+        files = []
+        for day_directory in sorted(directory.iterdir()):
+            if start.isoformat() <= day_directory.name <= end.isoformat():
+                files.extend(sorted(day_directory.glob("*.jsonl.zst")))
+        return files
+
+    def _write_batch(self, data_type: str, batch: List[Dict]):
+        by_day: Dict[str, List[Dict]] = {}
+        for document in batch:
+            by_day.setdefault(document["created_at"].date().isoformat(), []).append(document)
+        for day, documents in by_day.items():
+            directory = self.root / data_type / day
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"{utcnow():%H%M%S}-{uuid.uuid4().hex[:8]}.jsonl.zst"
+            temp_path = path.with_name(path.name + ".tmp")
+            with pa.CompressedOutputStream(str(temp_path), "zstd") as stream:
+                for document in documents:
+                    stream.write(json_util.dumps(document).encode() + b"\n")
+            # Only complete files get the .jsonl.zst name readers look for
+            temp_path.rename(path)
+
+    @staticmethod
+    def _read_file(path: Path) -> List[Dict]:
+        with pa.input_stream(str(path), compression="zstd") as stream:
+            lines = stream.read().splitlines()
+        return [json_util.loads(line, json_options=ARCHIVE_JSON_OPTIONS) for line in lines if line]
+
+    @staticmethod
+    def _matches(document: Dict, query: Optional[Dict[str, Any]]) -> bool:
+        # Archive files support plain equality filters only
+        return all(document.get(key) == value for key, value in (query or {}).items())
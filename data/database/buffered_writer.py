@@ -0,0 +1,106 @@
+from typing import Dict, Any, List, Optional, Callable, Set, Union
+from .mongo_manager import MongoManager
+from .deduplication import RawDataDeduplicator
+from ..models.records import RawRecord, AnyRawData
+import asyncio
+import logging
+
+class BufferedRawDataWriter:
+    """Buffers raw data and flushes it to MongoDB in bulk on size or time.
+
+    At most ``max_pending_flushes`` batches are in flight at once; when Mongo
+    falls behind, ``add`` blocks until a flush completes instead of letting
+    the buffer grow without bound.
+    """
+
+    def __init__(self, mongo: Union[MongoManager, RawDataDeduplicator], max_batch_size: int = 1000,
+                 flush_interval: float = 1.0, max_pending_flushes: int = 2,
+                 on_error: Optional[Callable[[AnyRawData, str], None]] = None,
+                 trusted: bool = False):
+        self.mongo = mongo
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.on_error = on_error or self._log_error
+        self.trusted = trusted
+        self.logger = logging.getLogger(__name__)
+        self.written = 0
+        self.duplicates = 0
+        self.failed = 0
+        self._buffer: List[AnyRawData] = []
+        self._flush_slots = asyncio.Semaphore(max_pending_flushes)
+        self._pending: Set[asyncio.Task] = set()
+        self._timer: Optional[asyncio.Task] = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def start(self):
+        """Start the periodic flush task"""
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._flush_periodically())
+
+    async def add(self, source: str, data_type: str, content: Dict[str, Any],
+                  metadata: Optional[Dict] = None):
+        """Queue a raw data record, flushing when the batch is full"""
+        self._buffer.append(RawRecord(
+            source=source,
+            data_type=data_type,
+            content=content,
+            metadata=metadata or {},
+            validate=not self.trusted
+        ))
+        if len(self._buffer) >= self.max_batch_size:
+            await self.flush()
+
+    async def flush(self):
+        """Hand the current buffer to a background bulk insert"""
+        if not self._buffer:
+            return
+        # Take the buffer only once a slot is free: a flush cancelled while
+        # waiting, e.g. the timer's on close, leaves its records buffered
+        await self._flush_slots.acquire()
+        if not self._buffer:
+            self._flush_slots.release()
+            return
+        batch, self._buffer = self._buffer, []
+        task = asyncio.create_task(self._write(batch))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def close(self):
+        """Stop the timer, flush what is left and wait for in-flight writes"""
+        if self._timer is not None:
+            self._timer.cancel()
+            await asyncio.gather(self._timer, return_exceptions=True)
+            self._timer = None
+        await self.flush()
+        if self._pending:
+            await asyncio.gather(*self._pending)
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def _write(self, batch: List[AnyRawData]):
+        try:
+            report = await self.mongo.store_raw_data_many(batch)
+            self.written += report.inserted_count
+            self.duplicates += len(report.duplicates)
+            for index, error in report.errors.items():
+                self.failed += 1
+                self.on_error(batch[index], error)
+        except Exception as e:
+            self.logger.error(f"Bulk flush of {len(batch)} records failed: {str(e)}")
+            self.failed += len(batch)
+            for record in batch:
+                self.on_error(record, str(e))
+        finally:
+            self._flush_slots.release()
+
+    def _log_error(self, record: AnyRawData, error: str):
+        self.logger.error(f"Failed to store raw_{record.data_type} record from {record.source}: {error}")
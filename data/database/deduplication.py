@@ -0,0 +1,162 @@
+from collections import OrderedDict
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from typing import Dict, Any, List, Optional, Iterable, Set, Tuple
+from .mongo_manager import MongoManager
+from ..models.base import BulkWriteReport
+from ..models.records import AnyRawData
+import hashlib
+import json
+import logging
+
+# Content keys that change on every scrape without the item itself changing
+DEFAULT_IGNORED_FIELDS = frozenset({"timestamp", "scraped_at"})
+
+def content_hash(source: str, data_type: str, content: Dict[str, Any],
+                 ignored_fields: Iterable[str] = DEFAULT_IGNORED_FIELDS) -> str:
+    """Stable SHA-256 of a raw record's identity"""
+    ignored = set(ignored_fields)
+    payload = {key: value for key, value in content.items() if key not in ignored}
+    canonical = json.dumps([source, data_type, payload], sort_keys=True,
+                           separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+class RawDataDeduplicator:
+    """Drops re-submitted raw data before it reaches MongoDB.
+
+    Every record gets a ``content_hash``. Recently stored hashes are kept in
+    an exact LRU (hash -> stored id), so repeats from the same scrape cycle
+    are skipped without a round-trip. A unique partial index on
+    ``content_hash`` catches everything the LRU has forgotten. In ``upsert``
+    mode, duplicates that reach MongoDB get their ``last_seen_at`` refreshed.
+
+    Duplicates are reported in ``BulkWriteReport.duplicates`` and resolve to
+    the id of the copy already stored.
+    """
+
+    def __init__(self, mongo: MongoManager, mode: str = "skip", cache_size: int = 100000,
+                 ignored_fields: Iterable[str] = DEFAULT_IGNORED_FIELDS):
+        if mode not in ("skip", "upsert"):
+            raise ValueError(f"Invalid deduplication mode: {mode}")
+        self.mongo = mongo
+        self.mode = mode
+        self.cache_size = cache_size
+        self.ignored_fields = frozenset(ignored_fields)
+        self.logger = logging.getLogger(__name__)
+        self._recent: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._indexed: Set[str] = set()
+
+    def hash(self, record: AnyRawData) -> str:
+        if record.content_hash is None:
+            record.content_hash = content_hash(
+                record.source, record.data_type, record.content, self.ignored_fields
+            )
+        return record.content_hash
+
+    async def ensure_index(self, data_type: str):
+        """Create the unique content_hash index for a raw collection once"""
+        if data_type in self._indexed:
+            return
+        try:
+            await self.mongo.db[f"raw_{data_type}"].create_index(
+                "content_hash",
+                name="content_hash_unique",
+                unique=True,
+                partialFilterExpression={"content_hash": {"$type": "string"}}
+            )
+        except OperationFailure as e:
+            # Typically existing duplicates; the LRU still filters new writes
+            self.logger.error(f"Could not create content_hash index on raw_{data_type}: {str(e)}")
+        self._indexed.add(data_type)
+
+    async def store_raw_data(self, record: AnyRawData) -> str:
+        """Store one record, returning the existing id if it is a duplicate"""
+        key = (record.data_type, self.hash(record))
+        await self.ensure_index(record.data_type)
+        existing = self._lookup(key)
+        if existing is not None:
+            return existing
+        if self.mode == "upsert":
+            report = await self.mongo.upsert_raw_data_many([record])
+            if report.errors:
+                raise RuntimeError(report.errors[0])
+            data_id = report.inserted_ids[0]
+        else:
+            try:
+                data_id = await self.mongo.store_raw_data(record)
+            except DuplicateKeyError:
+                data_id = None
+        if data_id is None:
+            found = await self.mongo.find_raw_ids_by_hash(record.data_type, [record.content_hash])
+            data_id = found.get(record.content_hash)
+        self._remember(key, data_id)
+        return data_id
+
+    async def store_raw_data_many(self, records: List[AnyRawData]) -> BulkWriteReport:
+        """Store a batch, skipping records already stored or repeated in the batch"""
+        report = BulkWriteReport(inserted_ids=[None] * len(records))
+        first_in_batch: Dict[Tuple[str, str], int] = {}
+        repeats: Dict[int, int] = {}
+        pending: List[int] = []
+        for index, record in enumerate(records):
+            key = (record.data_type, self.hash(record))
+            existing = self._lookup(key)
+            if existing is not None:
+                report.inserted_ids[index] = existing
+                report.duplicates.append(index)
+            elif key in first_in_batch:
+                repeats[index] = first_in_batch[key]
+            else:
+                first_in_batch[key] = index
+                pending.append(index)
+
+        for data_type in {records[index].data_type for index in pending}:
+            await self.ensure_index(data_type)
+        write = self.mongo.upsert_raw_data_many if self.mode == "upsert" else self.mongo.store_raw_data_many
+        written = await write([records[index] for index in pending])
+
+        stored_elsewhere: Dict[str, List[int]] = {}
+        written_duplicates = set(written.duplicates)
+        for position, index in enumerate(pending):
+            if position in written.errors:
+                report.errors[index] = written.errors[position]
+            elif position in written_duplicates:
+                stored_elsewhere.setdefault(records[index].data_type, []).append(index)
+            else:
+                report.inserted_ids[index] = written.inserted_ids[position]
+
+        # Duplicates caught by the unique index resolve to the stored copy
+        for data_type, indexes in stored_elsewhere.items():
+            found = await self.mongo.find_raw_ids_by_hash(
+                data_type, [records[index].content_hash for index in indexes]
+            )
+            for index in indexes:
+                report.inserted_ids[index] = found.get(records[index].content_hash)
+                report.duplicates.append(index)
+
+        for index, first in repeats.items():
+            if first in report.errors:
+                report.errors[index] = report.errors[first]
+            else:
+                report.inserted_ids[index] = report.inserted_ids[first]
+                report.duplicates.append(index)
+
+        for index in first_in_batch.values():
+            if report.inserted_ids[index] is not None:
+                self._remember((records[index].data_type, records[index].content_hash),
+                               report.inserted_ids[index])
+        report.duplicates.sort()
+        return report
+
+    def _lookup(self, key: Tuple[str, str]) -> Optional[str]:
+        data_id = self._recent.get(key)
+        if data_id is not None:
+            self._recent.move_to_end(key)
+        return data_id
+
+    def _remember(self, key: Tuple[str, str], data_id: Optional[str]):
+        if data_id is None:
+            return
+        self._recent[key] = data_id
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.cache_size:
+            self._recent.popitem(last=False)
@@ -1,26 +1,161 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Dict, Any, List
-from ..models.base import RawData
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from typing import Dict, Any, List, Optional, AsyncIterator
+from ..models.base import BulkWriteReport, utcnow
+from ..models.records import AnyRawData
+import asyncio
 import logging
 
+DUPLICATE_KEY_ERROR = 11000
+
 class MongoManager:
     def __init__(self, uri: str):
-        self.client = AsyncIOMotorClient(uri)
+        # Dates come back as aware UTC datetimes, matching what is written
+        self.client = AsyncIOMotorClient(uri, tz_aware=True)
         self.db = self.client.global_data
         self.logger = logging.getLogger(__name__)
     
-    async def store_raw_data(self, data: RawData) -> str:
+    async def store_raw_data(self, data: AnyRawData) -> str:
         """Store raw data in appropriate collection"""
         collection = self.db[f"raw_{data.data_type}"]
         result = await collection.insert_one(data.dict())
         return str(result.inserted_id)
     
+    async def store_raw_data_many(self, records: List[AnyRawData]) -> BulkWriteReport:
+        """Store a batch of raw data with one unordered insert per collection"""
+        report = BulkWriteReport(inserted_ids=[None] * len(records))
+        by_collection: Dict[str, List[int]] = {}
+        for index, record in enumerate(records):
+            by_collection.setdefault(f"raw_{record.data_type}", []).append(index)
+        
+        for name, indexes in by_collection.items():
+            documents = [records[index].dict() for index in indexes]
+            failed: Dict[int, str] = {}
+            duplicates = set()
+            try:
+                await self.db[name].insert_many(documents, ordered=False)
+            except BulkWriteError as e:
+                # Unordered inserts keep going past bad documents, so only
+                # the reported indexes were rejected
+                for error in e.details.get("writeErrors", []):
+                    if error.get("code") == DUPLICATE_KEY_ERROR:
+                        duplicates.add(indexes[error["index"]])
+                    else:
+                        failed[indexes[error["index"]]] = error.get("errmsg", "write error")
+                if failed:
+                    self.logger.error(f"Bulk insert into {name} rejected {len(failed)} documents")
+        
+            for index, document in zip(indexes, documents):
+                if index in failed:
+                    report.errors[index] = failed[index]
+                elif index in duplicates:
+                    report.duplicates.append(index)
+                else:
+                    report.inserted_ids[index] = str(document["_id"])
+        
+        report.duplicates.sort()
+        return report
+    
+    async def upsert_raw_data_many(self, records: List[AnyRawData]) -> BulkWriteReport:
+        """Insert raw data keyed by content_hash, touching last_seen_at on duplicates"""
+        report = BulkWriteReport(inserted_ids=[None] * len(records))
+        by_collection: Dict[str, List[int]] = {}
+        for index, record in enumerate(records):
+            by_collection.setdefault(f"raw_{record.data_type}", []).append(index)
+        
+        now = utcnow()
+        for name, indexes in by_collection.items():
+            operations = [
+                UpdateOne(
+                    {"content_hash": records[index].content_hash},
+                    {"$setOnInsert": records[index].dict(), "$set": {"last_seen_at": now}},
+                    upsert=True
+                )
+                for index in indexes
+            ]
+            failed: Dict[int, str] = {}
+            try:
+                result = await self.db[name].bulk_write(operations, ordered=False)
+                upserted_ids = result.upserted_ids
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    failed[indexes[error["index"]]] = error.get("errmsg", "write error")
+                upserted_ids = {item["index"]: item["_id"] for item in e.details.get("upserted", [])}
+                self.logger.error(f"Bulk upsert into {name} rejected {len(failed)} documents")
+        
+            for position, index in enumerate(indexes):
+                if index in failed:
+                    report.errors[index] = failed[index]
+                elif position in upserted_ids:
+                    report.inserted_ids[index] = str(upserted_ids[position])
+                else:
+                    report.duplicates.append(index)
+        
+        report.duplicates.sort()
+        return report
+    
+    async def find_raw_ids_by_hash(self, data_type: str, hashes: List[str]) -> Dict[str, str]:
+        """Map content hashes to the ids of the documents already stored"""
+        collection = self.db[f"raw_{data_type}"]
+        cursor = collection.find({"content_hash": {"$in": hashes}}, {"content_hash": 1})
+        return {document["content_hash"]: str(document["_id"]) async for document in cursor}
+    
     async def get_raw_data(self, data_type: str, query: Dict[str, Any]) -> List[Dict]:
         """Retrieve raw data for processing"""
         collection = self.db[f"raw_{data_type}"]
         cursor = collection.find(query)
         return await cursor.to_list(length=None)
     
+    async def stream_raw_data(self, data_type: str, query: Dict[str, Any],
+                            batch_size: int = 1000,
+                            projection: Optional[Dict[str, Any]] = None,
+                            resume_after: Optional[Any] = None,
+                            max_in_flight: int = 2) -> AsyncIterator[List[Dict]]:
+        """Stream raw data in _id order, one batch at a time.
+
+        Each batch is a keyset page on ``_id``, so the ``_id`` of the last
+        document in a batch can be passed back as ``resume_after`` to pick up
+        where a worker stopped. At most ``max_in_flight`` batches are fetched
+        ahead of the consumer, which keeps memory bounded on large backlogs.
+        """
+        collection = self.db[f"raw_{data_type}"]
+        if projection is not None and projection.get("_id", 1) == 0:
+            raise ValueError("projection must include _id to stream raw data")
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_in_flight)
+        
+        async def fetch_batches():
+            last_id = resume_after
+            try:
+                while True:
+                    page_query = query
+                    if last_id is not None:
+                        page_query = {"$and": [query, {"_id": {"$gt": last_id}}]}
+                    cursor = collection.find(page_query, projection)\
+                        .sort("_id", 1)\
+                        .limit(batch_size)
+                    batch = await cursor.to_list(length=batch_size)
+                    if batch:
+                        await queue.put(batch)
+                    if len(batch) < batch_size:
+                        break
+                    last_id = batch[-1]["_id"]
+                await queue.put(None)
+            except Exception as e:
+                await queue.put(e)
+        
+        producer = asyncio.create_task(fetch_batches())
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    return
+                if isinstance(batch, Exception):
+                    raise batch
+                yield batch
+        finally:
+            producer.cancel()
+    
     async def update_raw_data(self, data_type: str, data_id: str, 
                             updates: Dict[str, Any]) -> bool:
         """Update raw data document"""
@@ -0,0 +1,237 @@
+from typing import Dict, Any, List, Optional, Iterable, Union
+from pathlib import Path
+from .sql_manager import SQLManager
+from ..models.base import as_utc, utcnow
+from ..models.records import AnyValidatedData
+from datetime import datetime, date, timedelta
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+import asyncio
+import json
+import logging
+import os
+import uuid
+
+# Fixed columns are always written with these types; feature columns are inferred
+COLUMN_TYPES = {
+    "id": pa.string(),
+    "source_id": pa.string(),
+    "data_type": pa.string(),
+    "content": pa.string(),
+    "validation_status": pa.string(),
+    "processing_metadata": pa.string(),
+    "validated_by": pa.string(),
+    "validation_score": pa.float64(),
+    "created_at": pa.timestamp("us", tz="UTC"),
+    "updated_at": pa.timestamp("us", tz="UTC"),
+    "validation_date": pa.timestamp("us", tz="UTC"),
+}
+
+class ParquetExporter:
+    """Exports the validated tier to a columnar Parquet dataset.
+
+    Files are laid out as ``<root>/data_type=<type>/date=<YYYY-MM-DD>/part-*.parquet``
+    and each export only adds new part files. ``_manifest.json`` lists every
+    file with its row count and keeps a per data_type ``(updated_at, id)``
+    watermark, so repeated exports from SQL only pick up new rows.
+
+    ``updated_at`` is stamped before an upsert's transaction commits, so an
+    export only takes rows older than ``export_lag``; a transaction that
+    takes longer than that to commit can still be skipped. A row updated
+    after it was exported is appended again, and ``read`` keeps only the
+    latest copy of each source_id unless asked for every version.
+
+    Features are flattened into ``feature_<name>`` columns (integers widened
+    to float64) so training jobs can read them without decoding JSON.
+    """
+
+    MANIFEST = "_manifest.json"
+
+    def __init__(self, root: Union[str, Path] = "data/validated", compression: str = "zstd",
+                 export_lag: timedelta = timedelta(minutes=5)):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+        self.export_lag = export_lag
+        self.logger = logging.getLogger(__name__)
+        self.manifest = self._load_manifest()
+
+    def export(self, records: Iterable[Union[AnyValidatedData, Dict[str, Any]]]) -> List[str]:
+        """Append records as new part files, one per (data_type, date) partition"""
+        partitions: Dict[tuple, List[Dict[str, Any]]] = {}
+        for record in records:
+            row = self._to_row(record)
+            partition_date = row["validation_date"].date().isoformat()
+            partitions.setdefault((row["data_type"], partition_date), []).append(row)
+
+        written = []
+        for (data_type, partition_date), rows in partitions.items():
+            directory = self.root / f"data_type={data_type}" / f"date={partition_date}"
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"part-{utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+            pq.write_table(self._to_table(rows), path, compression=self.compression)
+
+            relative = path.relative_to(self.root).as_posix()
+            self.manifest["files"].append({
+                "path": relative,
+                "data_type": data_type,
+                "date": partition_date,
+                "rows": len(rows),
+                "written_at": utcnow().isoformat()
+            })
+            written.append(relative)
+
+        if written:
+            self._save_manifest()
+        return written
+
+    async def export_from_sql(self, sql: SQLManager, data_type: str,
+                              batch_size: int = 10000) -> int:
+        """Incrementally export validated rows updated since the last export.
+
+        Rows updated within ``export_lag`` of now are left for the next
+        export, so upserts still in flight commit before the watermark
+        passes their updated_at.
+        """
+        since, after_id = self._watermark(data_type)
+        loop = asyncio.get_running_loop()
+        exported = 0
+        async for batch in sql.stream_validated_data(data_type, batch_size=batch_size,
+                                                     updated_since=since, after_id=after_id,
+                                                     updated_before=utcnow() - self.export_lag):
+            await loop.run_in_executor(None, self.export, batch)
+            exported += len(batch)
+            # Rows arrive in (updated_at, id) order, so the watermark can advance per batch
+            self.manifest["watermarks"][data_type] = {
+                "updated_at": batch[-1]["updated_at"].isoformat(),
+                "id": batch[-1]["id"]
+            }
+            self._save_manifest()
+        self.logger.info(f"Exported {exported} validated {data_type} rows to {self.root}")
+        return exported
+
+    def files(self, data_type: str, start: Optional[date] = None,
+              end: Optional[date] = None) -> List[Path]:
+        """Part files for a data_type, optionally limited to a date range"""
+        return [
+            self.root / entry["path"]
+            for entry in self.manifest["files"]
+            if entry["data_type"] == data_type
+            and (start is None or entry["date"] >= start.isoformat())
+            and (end is None or entry["date"] <= end.isoformat())
+        ]
+
+    def read(self, data_type: str, start: Optional[date] = None,
+             end: Optional[date] = None, columns: Optional[List[str]] = None,
+             all_versions: bool = False) -> pa.Table:
+        """Read a data_type's partitions as one memory-mapped Arrow table.
+
+        Only the latest exported copy of each source_id is returned, by
+        updated_at, unless ``all_versions`` is set.
+        """
+        paths = [str(path) for path in self.files(data_type, start, end)]
+        if not paths:
+            return pa.table({})
+        # Feature columns may differ between exports; missing ones read as null
+        schema = self._unified_schema(paths)
+        dataset = ds.dataset(paths, schema=schema, format="parquet",
+                             filesystem=pafs.LocalFileSystem(use_mmap=True))
+        if all_versions:
+            return dataset.to_table(columns=columns)
+        table = self._latest_versions(dataset.to_table())
+        return table.select(columns) if columns is not None else table
+
+    def _watermark(self, data_type: str):
+        watermark = self.manifest["watermarks"].get(data_type)
+        if watermark is None:
+            return None, None
+        if isinstance(watermark, str):
+            # Manifests written before ids were tracked
+            return as_utc(datetime.fromisoformat(watermark)), None
+        return as_utc(datetime.fromisoformat(watermark["updated_at"])), watermark["id"]
+
+    @staticmethod
+    def _latest_versions(table: pa.Table) -> pa.Table:
+        """Drop rows superseded by a later export of the same source_id,
+        keeping the survivors in file order"""
+        if table.num_rows == 0:
+            return table
+        order = pc.sort_indices(table, sort_keys=[
+            ("source_id", "ascending"), ("updated_at", "descending")
+        ])
+        source_ids = table.column("source_id").take(order)
+        # The first row of each source_id run is its latest version
+        first = pc.not_equal(source_ids.slice(1), source_ids.slice(0, len(source_ids) - 1))
+        keep = pa.concat_arrays([pa.array([True]), first.combine_chunks()])
+        latest = order.filter(keep)
+        return table.take(latest.take(pc.array_sort_indices(latest)))
+
+    @staticmethod
+    def _unified_schema(paths: List[str]) -> pa.Schema:
+        """One schema for all files, resolving columns whose type changed
+        between exports: numbers widen to float64, anything else to string"""
+        types: Dict[str, List[pa.DataType]] = {}
+        for path in paths:
+            for field in pq.read_schema(path):
+                types.setdefault(field.name, [])
+                if field.type not in types[field.name]:
+                    types[field.name].append(field.type)
+        fields = []
+        for name, candidates in types.items():
+            candidates = [t for t in candidates if not pa.types.is_null(t)] or [pa.null()]
+            if len(candidates) == 1:
+                column_type = candidates[0]
+            elif all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in candidates):
+                column_type = pa.float64()
+            elif all(pa.types.is_timestamp(t) for t in candidates):
+                column_type = pa.timestamp("us", tz="UTC")
+            else:
+                column_type = pa.string()
+            fields.append(pa.field(name, column_type))
+        return pa.schema(fields)
+
+    def _to_row(self, record: Union[AnyValidatedData, Dict[str, Any]]) -> Dict[str, Any]:
+        row = dict(record) if isinstance(record, dict) else record.dict()
+        for name in ("created_at", "updated_at", "validation_date"):
+            if isinstance(row.get(name), datetime):
+                row[name] = as_utc(row[name])
+        features = row.pop("features", None) or {}
+        row["content"] = json.dumps(row.get("content", {}), default=str)
+        row["processing_metadata"] = json.dumps(row.get("processing_metadata", {}), default=str)
+        for name, value in features.items():
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value, default=str)
+            elif isinstance(value, int) and not isinstance(value, bool):
+                value = float(value)
+            row[f"feature_{name}"] = value
+        return row
+
+    def _to_table(self, rows: List[Dict[str, Any]]) -> pa.Table:
+        names = list(dict.fromkeys(name for row in rows for name in row))
+        arrays = []
+        for name in names:
+            values = [row.get(name) for row in rows]
+            try:
+                arrays.append(pa.array(values, type=COLUMN_TYPES.get(name)))
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # Mixed types within a column fall back to strings
+                arrays.append(pa.array([None if v is None else str(v) for v in values]))
+        return pa.Table.from_arrays(arrays, names=names)
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        path = self.root / self.MANIFEST
+        if path.exists():
+            with open(path) as f:
+                return json.load(f)
+        return {"files": [], "watermarks": {}}
+
+    def _save_manifest(self):
+        # Write then rename so readers never see a partial manifest
+        path = self.root / self.MANIFEST
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(temp_path, path)
@@ -0,0 +1,134 @@
+from sqlalchemy import Table, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from typing import Dict, Any, List, Optional, AsyncIterator
+from datetime import datetime
+from ..models.base import utcnow
+from ..models.records import AnyProcessedData, AnyValidatedData
+from ..models.tables import metadata, processed_data, validated_data
+import json
+import logging
+import uuid
+
+# asyncpg rejects statements with more bind parameters than this
+MAX_BIND_PARAMS = 32767
+
+class SQLManager:
+    def __init__(self, uri: str, pool_size: int = 10, max_overflow: int = 20,
+                 pool_recycle: int = 1800, **engine_kwargs):
+        self.engine = create_async_engine(
+            uri,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=True,
+            json_serializer=lambda obj: json.dumps(obj, default=str),
+            **engine_kwargs
+        )
+        self.logger = logging.getLogger(__name__)
+
+    async def create_tables(self):
+        """Create the processed and validated data tables if missing"""
+        async with self.engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+
+    async def close(self):
+        """Dispose of pooled connections"""
+        await self.engine.dispose()
+
+    async def store_processed_data_many(self, records: List[AnyProcessedData],
+                                        batch_size: int = 1000) -> Dict[str, str]:
+        """Upsert processed data, returning a source_id -> id mapping"""
+        return await self._upsert(processed_data, records, batch_size)
+
+    async def store_validated_data_many(self, records: List[AnyValidatedData],
+                                        batch_size: int = 1000) -> Dict[str, str]:
+        """Upsert validated data, returning a source_id -> id mapping"""
+        return await self._upsert(validated_data, records, batch_size)
+
+    async def stream_processed_data(self, data_type: str,
+                                    filters: Optional[Dict[str, Any]] = None,
+                                    batch_size: int = 1000) -> AsyncIterator[List[Dict]]:
+        """Stream processed data through a server-side cursor in batches"""
+        async for batch in self._stream(processed_data, data_type, filters, batch_size):
+            yield batch
+
+    async def stream_validated_data(self, data_type: str,
+                                    filters: Optional[Dict[str, Any]] = None,
+                                    batch_size: int = 1000,
+                                    updated_since: Optional[datetime] = None,
+                                    after_id: Optional[str] = None,
+                                    updated_before: Optional[datetime] = None) -> AsyncIterator[List[Dict]]:
+        """Stream validated data through a server-side cursor in batches.
+
+        Rows come in (updated_at, id) order. With ``updated_since`` only rows
+        after that point are streamed; pass the last row's id as ``after_id``
+        to resume exactly after it when several rows share an updated_at.
+        ``updated_before`` leaves out rows updated at or after that time.
+        """
+        async for batch in self._stream(validated_data, data_type, filters, batch_size,
+                                        updated_since, after_id, updated_before):
+            yield batch
+
+    async def _upsert(self, table: Table, records: List[AnyProcessedData],
+                      batch_size: int) -> Dict[str, str]:
+        if not records:
+            return {}
+        columns = [column.name for column in table.columns]
+
+        # A multi-row ON CONFLICT statement cannot touch the same row twice,
+        # so keep only the last record per key
+        rows = {}
+        updated_at = utcnow()
+        for record in records:
+            row = self._to_row(record, columns)
+            row["updated_at"] = updated_at
+            rows[(row["data_type"], row["source_id"])] = row
+        rows = list(rows.values())
+
+        rows_per_statement = max(1, min(batch_size, MAX_BIND_PARAMS // len(columns)))
+        stored = {}
+        async with self.engine.begin() as conn:
+            for start in range(0, len(rows), rows_per_statement):
+                statement = insert(table).values(rows[start:start + rows_per_statement])
+                statement = statement.on_conflict_do_update(
+                    index_elements=["data_type", "source_id"],
+                    set_={
+                        name: statement.excluded[name]
+                        for name in columns
+                        if name not in ("id", "data_type", "source_id", "created_at")
+                    }
+                ).returning(table.c.source_id, table.c.id)
+                result = await conn.execute(statement)
+                stored.update({source_id: data_id for source_id, data_id in result})
+        return stored
+
+    async def _stream(self, table: Table, data_type: str,
+                      filters: Optional[Dict[str, Any]],
+                      batch_size: int,
+                      updated_since: Optional[datetime] = None,
+                      after_id: Optional[str] = None,
+                      updated_before: Optional[datetime] = None) -> AsyncIterator[List[Dict]]:
+        query = select(table).where(table.c.data_type == data_type)
+        for name, value in (filters or {}).items():
+            query = query.where(table.c[name] == value)
+        if updated_since is not None and after_id is not None:
+            query = query.where(tuple_(table.c.updated_at, table.c.id) > (updated_since, after_id))
+        elif updated_since is not None:
+            query = query.where(table.c.updated_at > updated_since)
+        if updated_before is not None:
+            query = query.where(table.c.updated_at < updated_before)
+        # A total order, so the last row streamed is a safe resume point
+        query = query.order_by(table.c.updated_at, table.c.id)
+        async with self.engine.connect() as conn:
+            result = await conn.stream(query)
+            async for partition in result.mappings().partitions(batch_size):
+                yield [dict(row) for row in partition]
+
+    @staticmethod
+    def _to_row(record: AnyProcessedData, columns: List[str]) -> Dict[str, Any]:
+        data = record.dict()
+        row = {name: data[name] for name in columns}
+        if row["id"] is None:
+            row["id"] = str(uuid.uuid4())
+        return row
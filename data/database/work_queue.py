@@ -0,0 +1,146 @@
+from bson import ObjectId
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+from typing import Dict, Any, List, Optional, Iterable
+from .mongo_manager import MongoManager
+from ..models.base import ProcessingStatus, QUEUE_EPOCH, utcnow
+from datetime import timedelta
+import logging
+import uuid
+
+class RawDataWorkQueue:
+    """Lease-based work queue over a raw_<data_type> collection.
+
+    Queued documents carry a ``lease_expires_at`` date: ``QUEUE_EPOCH`` while
+    pending, the lease deadline while claimed, and ``None`` once processed or
+    failed, which also sets ``finished_at``. A partial index on that field means claims only ever touch
+    outstanding work, and a crashed worker's documents become claimable again
+    as soon as its lease runs out.
+    """
+
+    INDEX_NAME = "work_queue_lease"
+
+    def __init__(self, mongo: MongoManager, data_type: str,
+                 worker_id: Optional[str] = None, lease_seconds: int = 300,
+                 max_attempts: int = 5):
+        self.collection = mongo.db[f"raw_{data_type}"]
+        self.data_type = data_type
+        self.worker_id = worker_id or uuid.uuid4().hex
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max_attempts
+        self.logger = logging.getLogger(__name__)
+
+    async def ensure_indexes(self):
+        """Create the partial index that claims are served from"""
+        await self.collection.create_index(
+            [("lease_expires_at", ASCENDING)],
+            name=self.INDEX_NAME,
+            partialFilterExpression={"lease_expires_at": {"$type": "date"}}
+        )
+
+    async def enqueue_unqueued(self) -> int:
+        """Queue unprocessed documents stored before the work queue existed"""
+        result = await self.collection.update_many(
+            {"lease_expires_at": {"$exists": False}, "processed": {"$ne": True}},
+            {"$set": {
+                "status": ProcessingStatus.PENDING.value,
+                "lease_expires_at": QUEUE_EPOCH
+            }}
+        )
+        return result.modified_count
+
+    async def claim(self) -> Optional[Dict]:
+        """Atomically claim the next available document"""
+        now = utcnow()
+        return await self.collection.find_one_and_update(
+            {"lease_expires_at": {"$lte": now}},
+            {
+                "$set": {
+                    "status": ProcessingStatus.CLAIMED.value,
+                    "claimed_by": self.worker_id,
+                    "lease_expires_at": now + self.lease
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("lease_expires_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def claim_many(self, limit: int) -> List[Dict]:
+        """Claim up to ``limit`` documents, stopping early when the queue is drained"""
+        claimed = []
+        while len(claimed) < limit:
+            document = await self.claim()
+            if document is None:
+                break
+            claimed.append(document)
+        return claimed
+
+    async def extend_lease(self, data_ids: Iterable[Any]) -> int:
+        """Push back the lease deadline for documents still being worked on"""
+        result = await self.collection.update_many(
+            self._owned(data_ids),
+            {"$set": {"lease_expires_at": utcnow() + self.lease}}
+        )
+        return result.modified_count
+
+    async def ack(self, processed_ids: Dict[Any, str]) -> int:
+        """Mark claimed documents as processed in a single bulk write"""
+        if not processed_ids:
+            return 0
+        processed_at = utcnow()
+        operations = [
+            UpdateOne(
+                self._owned([data_id]),
+                {"$set": {
+                    "status": ProcessingStatus.PROCESSED.value,
+                    "processed": True,
+                    "processed_id": processed_id,
+                    "processed_at": processed_at,
+                    "finished_at": processed_at,
+                    "lease_expires_at": None
+                }}
+            )
+            for data_id, processed_id in processed_ids.items()
+        ]
+        result = await self.collection.bulk_write(operations, ordered=False)
+        if result.modified_count < len(operations):
+            self.logger.warning(
+                f"{len(operations) - result.modified_count} acks on raw_{self.data_type} "
+                f"were ignored because the lease had moved to another worker"
+            )
+        return result.modified_count
+
+    async def release(self, data_ids: Iterable[Any], error: Optional[str] = None) -> int:
+        """Return claimed documents to the queue, failing those out of attempts"""
+        owned = self._owned(data_ids)
+        failed = await self.collection.update_many(
+            {**owned, "attempts": {"$gte": self.max_attempts}},
+            {"$set": {
+                "status": ProcessingStatus.FAILED.value,
+                "last_error": error,
+                "finished_at": utcnow(),
+                "lease_expires_at": None
+            }}
+        )
+        retried = await self.collection.update_many(
+            owned,
+            {"$set": {
+                "status": ProcessingStatus.PENDING.value,
+                "last_error": error,
+                "lease_expires_at": QUEUE_EPOCH
+            }}
+        )
+        return failed.modified_count + retried.modified_count
+
+    def _owned(self, data_ids: Iterable[Any]) -> Dict[str, Any]:
+        return {
+            "_id": {"$in": [self._object_id(data_id) for data_id in data_ids]},
+            "status": ProcessingStatus.CLAIMED.value,
+            "claimed_by": self.worker_id
+        }
+
+    @staticmethod
+    def _object_id(data_id: Any) -> Any:
+        if isinstance(data_id, str) and ObjectId.is_valid(data_id):
+            return ObjectId(data_id)
+        return data_id
@@ -1,15 +1,25 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator
 from .database.mongo_manager import MongoManager
 from .database.sql_manager import SQLManager
-from .models.base import RawData, ProcessedData, ValidatedData
-from datetime import datetime
+from .database.archiver import RawDataArchiver
+from .database.buffered_writer import BufferedRawDataWriter
+from .database.deduplication import RawDataDeduplicator
+from .database.work_queue import RawDataWorkQueue
+from .models.base import RawData, ProcessedData, ValidatedData, BulkWriteReport, ProcessingStatus, utcnow
+from .models.records import RawRecord
 import logging
 
 class GlobalDataManager:
-    def __init__(self, mongo_uri: str, sql_uri: str):
+    def __init__(self, mongo_uri: str, sql_uri: str,
+                 deduplication: Optional[str] = "skip"):
         self.mongo = MongoManager(mongo_uri)
         self.sql = SQLManager(sql_uri)
         self.logger = logging.getLogger(__name__)
+        # Raw writes go through the deduplicator unless it is disabled
+        self.raw_store = (
+            RawDataDeduplicator(self.mongo, mode=deduplication)
+            if deduplication else self.mongo
+        )
     
     async def store_raw_data(self, source: str, data_type: str, 
                             content: Dict[str, Any], 
@@ -21,7 +31,32 @@ class GlobalDataManager:
             content=content,
             metadata=metadata or {}
         )
-        return await self.mongo.store_raw_data(raw_data)
+        return await self.raw_store.store_raw_data(raw_data)
+    
+    async def store_raw_data_many(self, source: str, data_type: str,
+                                  contents: List[Dict[str, Any]],
+                                  metadata: Optional[Dict] = None,
+                                  trusted: bool = False) -> BulkWriteReport:
+        """Store a batch of raw data in bulk, reporting per-record failures.
+        
+        Records are built as slotted RawRecords rather than pydantic models;
+        ``trusted`` producers also skip their type check.
+        """
+        records = [
+            RawRecord(
+                source=source,
+                data_type=data_type,
+                content=content,
+                metadata=metadata or {},
+                validate=not trusted
+            )
+            for content in contents
+        ]
+        return await self.raw_store.store_raw_data_many(records)
+    
+    def raw_data_writer(self, **kwargs) -> BufferedRawDataWriter:
+        """Create a buffered writer that flushes raw data on size or time"""
+        return BufferedRawDataWriter(self.raw_store, **kwargs)
     
     async def get_data_for_processing(self, data_type: str, 
                                     filters: Optional[Dict] = None) -> List[Dict]:
@@ -30,15 +65,51 @@ class GlobalDataManager:
         query["processed"] = {"$ne": True}
         return await self.mongo.get_raw_data(data_type, query)
     
+    async def stream_data_for_processing(self, data_type: str,
+                                       filters: Optional[Dict] = None,
+                                       **kwargs) -> AsyncIterator[List[Dict]]:
+        """Stream raw data ready for processing in bounded batches"""
+        query = filters or {}
+        query["processed"] = {"$ne": True}
+        async for batch in self.mongo.stream_raw_data(data_type, query, **kwargs):
+            yield batch
+    
+    def raw_data_archiver(self, **kwargs) -> RawDataArchiver:
+        """Create an archiver that tiers aged raw data out to compressed files"""
+        return RawDataArchiver(self.mongo, **kwargs)
+    
+    async def work_queue(self, data_type: str, **kwargs) -> RawDataWorkQueue:
+        """Get a claim/lease work queue for concurrent processing workers"""
+        queue = RawDataWorkQueue(self.mongo, data_type, **kwargs)
+        await queue.ensure_indexes()
+        return queue
+    
+    async def store_processed_data(self, records: List[ProcessedData]) -> Dict[str, str]:
+        """Upsert processed data in bulk, returning source_id -> processed id"""
+        return await self.sql.store_processed_data_many(records)
+    
+    async def store_validated_data(self, records: List[ValidatedData]) -> Dict[str, str]:
+        """Upsert validated data in bulk, returning source_id -> validated id"""
+        return await self.sql.store_validated_data_many(records)
+    
     async def mark_as_processed(self, data_type: str, data_id: str, 
                               processed_id: str) -> bool:
         """Mark raw data as processed"""
+        processed_at = utcnow()
         return await self.mongo.update_raw_data(
             data_type, 
             data_id,
             {
                 "processed": True,
                 "processed_id": processed_id,
-                "processed_at": datetime.now()
+                "processed_at": processed_at,
+                "finished_at": processed_at,
+                "status": ProcessingStatus.PROCESSED.value,
+                "lease_expires_at": None
             }
         )
+    
+    async def close(self):
+        """Release database connections"""
+        self.mongo.client.close()
+        await self.sql.close()
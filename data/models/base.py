@@ -1,17 +1,43 @@
-from datetime import datetime
-from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Dict, Any, Optional, List
 from pydantic import BaseModel, Field
 
+def utcnow() -> datetime:
+    """Current time as a timezone-aware UTC datetime"""
+    return datetime.now(timezone.utc)
+
+def as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC and convert aware ones to UTC"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+# Lease timestamp given to queued raw data so it is immediately claimable
+QUEUE_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+class ProcessingStatus(str, Enum):
+    PENDING = "pending"
+    CLAIMED = "claimed"
+    PROCESSED = "processed"
+    FAILED = "failed"
+
 class BaseData(BaseModel):
     id: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
 class RawData(BaseData):
     source: str
     data_type: str
     content: Dict[str, Any]
     metadata: Dict[str, Any] = Field(default_factory=dict)
+    content_hash: Optional[str] = None
+    status: ProcessingStatus = ProcessingStatus.PENDING
+    lease_expires_at: Optional[datetime] = QUEUE_EPOCH
+
+    class Config:
+        use_enum_values = True
 
 class ProcessedData(BaseData):
     source_id: str
@@ -24,4 +50,20 @@ class ProcessedData(BaseData):
 class ValidatedData(ProcessedData):
     validation_score: float
     validated_by: str
-    validation_date: datetime = Field(default_factory=datetime.now)
+    validation_date: datetime = Field(default_factory=utcnow)
+
+
+class BulkWriteReport(BaseModel):
+    """Outcome of a bulk write, aligned with the order of the input records"""
+    inserted_ids: List[Optional[str]] = Field(default_factory=list)
+    errors: Dict[int, str] = Field(default_factory=dict)
+    # Indexes skipped as duplicates; their inserted_ids hold the existing id when known
+    duplicates: List[int] = Field(default_factory=list)
+
+    @property
+    def inserted_count(self) -> int:
+        duplicates = set(self.duplicates)
+        return sum(
+            1 for index, data_id in enumerate(self.inserted_ids)
+            if data_id is not None and index not in duplicates
+        )
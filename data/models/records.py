@@ -0,0 +1,134 @@
+from datetime import datetime
+from typing import Dict, Any, Optional, Union, Tuple
+from .base import RawData, ProcessedData, ValidatedData, ProcessingStatus, QUEUE_EPOCH, utcnow
+import bson
+import json
+
+class Record:
+    """Slotted counterpart of the pydantic data models for hot ingest paths.
+
+    Records hold the same fields as their pydantic model but skip model
+    validation and copying: ``to_document`` hands the original ``content``
+    and ``metadata`` dicts straight to the driver. Pass ``validate=True``
+    (the default) for a cheap type check on data from untrusted producers;
+    trusted internal producers can pass ``validate=False``.
+    """
+
+    __slots__ = ("id", "created_at", "updated_at")
+    FIELDS: Tuple[str, ...] = __slots__
+    MODEL = None
+    REQUIRED_TYPES: Dict[str, Any] = {}
+
+    def __init__(self, id: Optional[str] = None, created_at: Optional[datetime] = None,
+                 updated_at: Optional[datetime] = None):
+        now = utcnow()
+        self.id = id
+        self.created_at = created_at or now
+        self.updated_at = updated_at or now
+
+    def validate(self):
+        """Raise ValueError if a required field has the wrong type"""
+        for name, expected in self.REQUIRED_TYPES.items():
+            if not isinstance(getattr(self, name), expected):
+                raise ValueError(f"{type(self).__name__}.{name} must be {expected}")
+
+    def to_document(self) -> Dict[str, Any]:
+        """Shallow dict of the fields, ready for the Mongo driver"""
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def dict(self) -> Dict[str, Any]:
+        # Same call the pydantic models expose, so managers accept either
+        return self.to_document()
+
+    def to_bson(self) -> bytes:
+        return bson.encode(self.to_document())
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_document(), default=str)
+
+    def to_model(self):
+        """Convert to the pydantic model, running its validation"""
+        return self.MODEL(**self.to_document())
+
+    @classmethod
+    def from_model(cls, model, validate: bool = False):
+        return cls(**model.dict(), validate=validate)
+
+    @classmethod
+    def from_document(cls, document: Dict[str, Any], validate: bool = False):
+        return cls(**{name: document[name] for name in cls.FIELDS if name in document},
+                   validate=validate)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.to_document() == other.to_document()
+
+class RawRecord(Record):
+    __slots__ = ("source", "data_type", "content", "metadata", "content_hash",
+                 "status", "lease_expires_at")
+    FIELDS = Record.FIELDS + __slots__
+    MODEL = RawData
+    REQUIRED_TYPES = {"source": str, "data_type": str, "content": dict, "metadata": dict}
+
+    def __init__(self, source: str, data_type: str, content: Dict[str, Any],
+                 metadata: Optional[Dict[str, Any]] = None,
+                 content_hash: Optional[str] = None,
+                 status: str = ProcessingStatus.PENDING.value,
+                 lease_expires_at: Optional[datetime] = QUEUE_EPOCH,
+                 validate: bool = True, **base):
+        super().__init__(**base)
+        self.source = source
+        self.data_type = data_type
+        self.content = content
+        self.metadata = metadata if metadata is not None else {}
+        self.content_hash = content_hash
+        self.status = status
+        self.lease_expires_at = lease_expires_at
+        if validate:
+            self.validate()
+
+class ProcessedRecord(Record):
+    __slots__ = ("source_id", "data_type", "content", "features",
+                 "validation_status", "processing_metadata")
+    FIELDS = Record.FIELDS + __slots__
+    MODEL = ProcessedData
+    REQUIRED_TYPES = {"source_id": str, "data_type": str, "content": dict, "features": dict}
+
+    def __init__(self, source_id: str, data_type: str, content: Dict[str, Any],
+                 features: Dict[str, Any], validation_status: str = "pending",
+                 processing_metadata: Optional[Dict[str, Any]] = None,
+                 validate: bool = True, **base):
+        super().__init__(**base)
+        self.source_id = source_id
+        self.data_type = data_type
+        self.content = content
+        self.features = features
+        self.validation_status = validation_status
+        self.processing_metadata = processing_metadata if processing_metadata is not None else {}
+        if validate:
+            self.validate()
+
+class ValidatedRecord(ProcessedRecord):
+    __slots__ = ("validation_score", "validated_by", "validation_date")
+    FIELDS = ProcessedRecord.FIELDS + __slots__
+    MODEL = ValidatedData
+    REQUIRED_TYPES = {**ProcessedRecord.REQUIRED_TYPES,
+                      "validation_score": (int, float), "validated_by": str}
+
+    def __init__(self, source_id: str, data_type: str, content: Dict[str, Any],
+                 features: Dict[str, Any], validation_score: float, validated_by: str,
+                 validation_date: Optional[datetime] = None,
+                 validate: bool = True, **processed):
+        super().__init__(source_id, data_type, content, features, validate=False, **processed)
+        self.validation_score = validation_score
+        self.validated_by = validated_by
+        self.validation_date = validation_date or utcnow()
+        if validate:
+            self.validate()
+
+AnyRawData = Union[RawData, RawRecord]
+AnyProcessedData = Union[ProcessedData, ProcessedRecord]
+AnyValidatedData = Union[ValidatedData, ValidatedRecord]
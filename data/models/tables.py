@@ -0,0 +1,39 @@
+from sqlalchemy import MetaData, Table, Column, String, Float, DateTime, JSON, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import JSONB
+
+metadata = MetaData()
+
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+def _processed_columns():
+    return [
+        Column("id", String(36), primary_key=True),
+        Column("source_id", String(64), nullable=False),
+        Column("data_type", String(100), nullable=False),
+        Column("content", JSONType, nullable=False),
+        Column("features", JSONType, nullable=False),
+        Column("validation_status", String(20), nullable=False),
+        Column("processing_metadata", JSONType, nullable=False),
+        Column("created_at", DateTime(timezone=True), nullable=False),
+        Column("updated_at", DateTime(timezone=True), nullable=False),
+    ]
+
+# One row per raw document, keyed by (data_type, source_id) so reprocessing
+# the same raw data updates the existing row
+processed_data = Table(
+    "processed_data", metadata,
+    *_processed_columns(),
+    UniqueConstraint("data_type", "source_id", name="uq_processed_data_source"),
+    Index("ix_processed_data_updated", "data_type", "updated_at", "id")
+)
+
+validated_data = Table(
+    "validated_data", metadata,
+    *_processed_columns(),
+    Column("validation_score", Float, nullable=False),
+    Column("validated_by", String(100), nullable=False),
+    Column("validation_date", DateTime(timezone=True), nullable=False),
+    UniqueConstraint("data_type", "source_id", name="uq_validated_data_source"),
+    # Serves incremental exports, which stream in (updated_at, id) order
+    Index("ix_validated_data_updated", "data_type", "updated_at", "id")
+)
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from data.database.mongo_manager import MongoManager
+import pytest
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "integration: needs a live database server")
+
+class BulkWriteCollection:
+    """mongomock collection with a working ``bulk_write``.
+
+    mongomock's own bulk_write does not accept the operations current
+    pymongo builds, so UpdateOne operations are applied one at a time and
+    reported the way MongoDB reports them.
+    """
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    async def bulk_write(self, operations, ordered: bool = True):
+        upserted_ids = {}
+        modified = 0
+        errors = []
+        for index, operation in enumerate(operations):
+            try:
+                result = await self._collection.update_one(
+                    operation._filter, operation._doc, upsert=operation._upsert
+                )
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": 11000, "errmsg": str(e)})
+                if ordered:
+                    break
+                continue
+            modified += result.modified_count
+            if result.upserted_id is not None:
+                upserted_ids[index] = result.upserted_id
+        if errors:
+            raise BulkWriteError({
+                "writeErrors": errors,
+                "upserted": [{"index": index, "_id": _id} for index, _id in upserted_ids.items()]
+            })
+        return SimpleNamespace(upserted_ids=upserted_ids, modified_count=modified)
+
+class MockDatabase:
+    def __init__(self, database):
+        self._database = database
+
+    def __getitem__(self, name):
+        return BulkWriteCollection(self._database[name])
+
+    def __getattr__(self, name):
+        return getattr(self._database, name)
+
+@pytest.fixture
+def mongo():
+    """MongoManager backed by an in-memory mongomock database"""
+    manager = MongoManager("mongodb://localhost:27017")
+    manager.client = AsyncMongoMockClient(tz_aware=True)
+    manager.db = MockDatabase(manager.client.global_data)
+    return manager
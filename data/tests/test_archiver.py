@@ -0,0 +1,78 @@
+from data.database.archiver import RawDataArchiver
+from data.database.work_queue import RawDataWorkQueue
+from data.models.base import QUEUE_EPOCH, utcnow
+from datetime import datetime, timedelta, timezone
+import pytest
+
+DAY = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+async def insert(mongo, n: int, created_at: datetime, lease_expires_at=None):
+    await mongo.db["raw_text"].insert_one({
+        "source": "news", "content": {"n": n},
+        "created_at": created_at, "lease_expires_at": lease_expires_at
+    })
+
+@pytest.mark.asyncio
+async def test_archive_moves_aged_finished_documents_to_day_files(mongo, tmp_path):
+    archiver = RawDataArchiver(mongo, root=tmp_path, hot_days=30, batch_size=2)
+    for n in range(3):
+        await insert(mongo, n, DAY + timedelta(days=n % 2))
+    await insert(mongo, 10, DAY, lease_expires_at=QUEUE_EPOCH)
+    await insert(mongo, 11, DAY, lease_expires_at=utcnow() + timedelta(minutes=5))
+    await insert(mongo, 12, utcnow())
+
+    assert await archiver.archive("text") == 3
+
+    remaining = [document["content"]["n"] async for document in mongo.db["raw_text"].find({})]
+    assert sorted(remaining) == [10, 11, 12]
+    assert [path.parent.name for path in archiver.archive_files("text", DAY.date(), DAY.date())] == ["2024-05-01"] * 2
+    assert len(archiver.archive_files("text", DAY.date(), (DAY + timedelta(days=1)).date())) == 3
+    assert not list(tmp_path.rglob("*.tmp"))
+
+@pytest.mark.asyncio
+async def test_find_by_time_reads_hot_data_and_overlapping_archives(mongo, tmp_path):
+    archiver = RawDataArchiver(mongo, root=tmp_path, hot_days=30)
+    for n in range(4):
+        await insert(mongo, n, DAY + timedelta(days=n))
+    await archiver.archive("text")
+    await insert(mongo, 99, DAY + timedelta(days=1, hours=1))
+
+    # Naive bounds are read as UTC
+    found = [
+        document async for document in archiver.find_by_time(
+            "text", datetime(2024, 5, 2), datetime(2024, 5, 4)
+        )
+    ]
+
+    assert sorted(document["content"]["n"] for document in found) == [1, 2, 99]
+    assert all(document["created_at"].tzinfo is not None for document in found)
+
+@pytest.mark.asyncio
+async def test_ttl_index_only_covers_finished_work(mongo, tmp_path):
+    collection = mongo.db["raw_text"]
+    await collection.create_index("created_at", name="created_at", expireAfterSeconds=60)
+
+    await RawDataArchiver(mongo, root=tmp_path, ttl_days=7).ensure_indexes("text")
+
+    indexes = await collection.index_information()
+    assert "expireAfterSeconds" not in indexes["created_at"]
+    ttl = indexes[RawDataArchiver.TTL_INDEX_NAME]
+    assert ttl["key"] == [("finished_at", 1)]
+    assert ttl["expireAfterSeconds"] == 7 * 86400
+    assert ttl["partialFilterExpression"] == {"lease_expires_at": {"$type": "null"}}
+
+@pytest.mark.asyncio
+async def test_only_finished_documents_get_finished_at(mongo):
+    for n in range(3):
+        await insert(mongo, n, DAY, lease_expires_at=QUEUE_EPOCH)
+    queue = RawDataWorkQueue(mongo, "text", worker_id="a", max_attempts=1)
+    done, failed, _ = await queue.claim_many(3)
+
+    await queue.ack({done["_id"]: "p-1"})
+    await queue.release([failed["_id"]], error="bad input")
+
+    finished = {
+        document["content"]["n"]: "finished_at" in document
+        async for document in mongo.db["raw_text"].find({})
+    }
+    assert sorted(finished.values()) == [False, True, True]
@@ -0,0 +1,133 @@
+from data.database.buffered_writer import BufferedRawDataWriter
+from data.models.records import RawRecord
+from types import SimpleNamespace
+import asyncio
+import pytest
+
+def make_records(count: int, data_type: str = "text"):
+    return [RawRecord(source="news", data_type=data_type, content={"n": n}) for n in range(count)]
+
+@pytest.mark.asyncio
+async def test_bulk_insert_reports_ids_in_input_order(mongo):
+    records = make_records(3) + make_records(2, data_type="market")
+
+    report = await mongo.store_raw_data_many(records)
+
+    assert report.inserted_count == 5
+    assert not report.errors
+    assert await mongo.db["raw_text"].count_documents({}) == 3
+    assert await mongo.db["raw_market"].count_documents({}) == 2
+    stored = await mongo.db["raw_market"].find_one({"content.n": 1})
+    assert report.inserted_ids[4] == str(stored["_id"])
+
+@pytest.mark.asyncio
+async def test_bulk_insert_reports_duplicate_keys(mongo):
+    await mongo.db["raw_text"].create_index("content_hash", unique=True)
+    records = make_records(3)
+    for record, content_hash in zip(records, ["a", "a", "b"]):
+        record.content_hash = content_hash
+
+    report = await mongo.store_raw_data_many(records)
+
+    assert report.duplicates == [1]
+    assert report.inserted_ids[1] is None
+    assert report.inserted_count == 2
+
+@pytest.mark.asyncio
+async def test_writer_flushes_when_batch_is_full(mongo):
+    writer = BufferedRawDataWriter(mongo, max_batch_size=10, flush_interval=60)
+    for n in range(25):
+        await writer.add("news", "text", {"n": n})
+    await asyncio.gather(*writer._pending)
+
+    assert writer.written == 20
+    assert len(writer._buffer) == 5
+
+    await writer.close()
+    assert writer.written == 25
+    assert await mongo.db["raw_text"].count_documents({}) == 25
+
+@pytest.mark.asyncio
+async def test_writer_flushes_on_interval(mongo):
+    async with BufferedRawDataWriter(mongo, max_batch_size=1000, flush_interval=0.01) as writer:
+        await writer.add("news", "text", {"n": 1})
+        for _ in range(100):
+            if writer.written:
+                break
+            await asyncio.sleep(0.01)
+        assert writer.written == 1
+
+class FailingStore:
+    async def store_raw_data_many(self, records):
+        raise ConnectionError("mongo unavailable")
+
+@pytest.mark.asyncio
+async def test_failed_flush_reports_every_record():
+    failures = []
+    writer = BufferedRawDataWriter(FailingStore(), max_batch_size=2,
+                                   on_error=lambda record, error: failures.append(error))
+    await writer.add("news", "text", {"n": 1})
+    await writer.add("news", "text", {"n": 2})
+    await writer.close()
+
+    assert writer.failed == 2
+    assert failures == ["mongo unavailable"] * 2
+
+class SlowStore:
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.calls = 0
+
+    async def store_raw_data_many(self, records):
+        self.calls += 1
+        await self.release.wait()
+        raise ConnectionError("unused")
+
+@pytest.mark.asyncio
+async def test_add_blocks_while_flushes_are_pending():
+    store = SlowStore()
+    writer = BufferedRawDataWriter(store, max_batch_size=1, max_pending_flushes=2,
+                                   on_error=lambda record, error: None)
+    await writer.add("news", "text", {"n": 1})
+    await writer.add("news", "text", {"n": 2})
+    blocked = asyncio.create_task(writer.add("news", "text", {"n": 3}))
+    await asyncio.sleep(0.01)
+
+    assert not blocked.done()
+
+    store.release.set()
+    await blocked
+    await writer.close()
+    assert store.calls == 3
+
+class GatedStore:
+    """Stores each batch once released, recording what it was given"""
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.stored = []
+
+    async def store_raw_data_many(self, records):
+        await self.release.wait()
+        self.stored.extend(record.content["n"] for record in records)
+        return SimpleNamespace(inserted_count=len(records), duplicates=[], errors={})
+
+@pytest.mark.asyncio
+async def test_close_keeps_a_batch_the_timer_was_waiting_to_flush():
+    store = GatedStore()
+    writer = BufferedRawDataWriter(store, flush_interval=0.001, max_pending_flushes=1)
+    writer.start()
+    await writer.add("news", "text", {"n": 1})
+    while not writer._pending:
+        await asyncio.sleep(0.001)
+    # The only slot is busy, so the timer's next flush waits for it
+    await writer.add("news", "text", {"n": 2})
+    await asyncio.sleep(0.01)
+
+    closing = asyncio.create_task(writer.close())
+    await asyncio.sleep(0.01)
+    store.release.set()
+    await closing
+
+    assert sorted(store.stored) == [1, 2]
+    assert writer.written == 2
+    assert writer.failed == 0
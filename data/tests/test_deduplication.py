@@ -0,0 +1,67 @@
+from data.database.deduplication import RawDataDeduplicator, content_hash
+from data.models.records import RawRecord
+import pytest
+
+def record(n: int, **content) -> RawRecord:
+    return RawRecord(source="news", data_type="text", content={"n": n, **content})
+
+def test_content_hash_ignores_volatile_fields():
+    assert content_hash("news", "text", {"n": 1, "scraped_at": "today"}) == \
+        content_hash("news", "text", {"scraped_at": "yesterday", "n": 1})
+    assert content_hash("news", "text", {"n": 1}) != content_hash("blog", "text", {"n": 1})
+
+@pytest.mark.asyncio
+async def test_batch_skips_repeats_and_previously_stored_records(mongo):
+    deduplicator = RawDataDeduplicator(mongo)
+    first = await deduplicator.store_raw_data_many([record(1), record(2), record(1)])
+
+    assert first.duplicates == [2]
+    assert first.inserted_ids[2] == first.inserted_ids[0]
+    assert first.inserted_count == 2
+
+    second = await deduplicator.store_raw_data_many([record(2, scraped_at="later"), record(3)])
+
+    assert second.duplicates == [0]
+    assert second.inserted_ids[0] == first.inserted_ids[1]
+    assert await mongo.db["raw_text"].count_documents({}) == 3
+
+@pytest.mark.asyncio
+async def test_unique_index_catches_duplicates_the_cache_forgot(mongo):
+    deduplicator = RawDataDeduplicator(mongo, cache_size=1)
+    stored = await deduplicator.store_raw_data_many([record(1), record(2)])
+
+    # record(1) has been evicted from the LRU; only the index knows it
+    report = await deduplicator.store_raw_data_many([record(1)])
+
+    assert report.duplicates == [0]
+    assert report.inserted_ids[0] == stored.inserted_ids[0]
+    assert await mongo.db["raw_text"].count_documents({}) == 2
+
+@pytest.mark.asyncio
+async def test_single_store_returns_existing_id(mongo):
+    deduplicator = RawDataDeduplicator(mongo, cache_size=0)
+
+    first = await deduplicator.store_raw_data(record(1))
+    second = await deduplicator.store_raw_data(record(1))
+
+    assert first == second
+    assert await mongo.db["raw_text"].count_documents({}) == 1
+
+@pytest.mark.asyncio
+async def test_upsert_mode_touches_last_seen_at_on_duplicates(mongo):
+    deduplicator = RawDataDeduplicator(mongo, mode="upsert", cache_size=0)
+    first = await deduplicator.store_raw_data_many([record(1)])
+    stored = await mongo.db["raw_text"].find_one({})
+    seen = stored["last_seen_at"]
+
+    report = await deduplicator.store_raw_data_many([record(1), record(2)])
+
+    assert report.duplicates == [0]
+    assert report.inserted_ids[0] == first.inserted_ids[0]
+    refreshed = await mongo.db["raw_text"].find_one({"_id": stored["_id"]})
+    assert refreshed["last_seen_at"] >= seen
+    assert await mongo.db["raw_text"].count_documents({}) == 2
+
+def test_invalid_mode_is_rejected(mongo):
+    with pytest.raises(ValueError):
+        RawDataDeduplicator(mongo, mode="merge")
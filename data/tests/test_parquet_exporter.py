@@ -0,0 +1,113 @@
+from data.database.parquet_exporter import ParquetExporter
+from data.models.base import ValidatedData, utcnow
+from datetime import date, datetime, timedelta, timezone
+import pyarrow as pa
+import pytest
+
+def validated(source_id: str, features: dict, day: int = 1) -> ValidatedData:
+    return ValidatedData(
+        source_id=source_id, data_type="market", content={"symbol": source_id},
+        features=features, validation_score=0.9, validated_by="test",
+        validation_date=datetime(2024, 5, day, 12, tzinfo=timezone.utc)
+    )
+
+def test_export_partitions_by_type_and_date_and_records_manifest(tmp_path):
+    exporter = ParquetExporter(tmp_path)
+
+    written = exporter.export([validated("a", {"price": 1}, day=1), validated("b", {"price": 2}, day=2)])
+
+    assert sorted(path.split("/")[:2] for path in written) == [
+        ["data_type=market", "date=2024-05-01"], ["data_type=market", "date=2024-05-02"]
+    ]
+    reloaded = ParquetExporter(tmp_path)
+    assert [entry["rows"] for entry in reloaded.manifest["files"]] == [1, 1]
+    assert len(reloaded.files("market", start=date(2024, 5, 2))) == 1
+
+def test_read_unifies_columns_whose_type_changed_between_exports(tmp_path):
+    exporter = ParquetExporter(tmp_path)
+    exporter.export([validated("a", {"price": 1.5, "rating": 4})])
+    exporter.export([validated("b", {"price": "n/a", "volume": 10})])
+
+    table = exporter.read("market")
+
+    assert table.num_rows == 2
+    assert table.schema.field("feature_price").type == pa.string()
+    assert table.schema.field("feature_rating").type == pa.float64()
+    assert sorted(table.column("feature_price").to_pylist()) == ["1.5", "n/a"]
+    assert sorted(table.column("feature_volume").to_pylist(), key=str) == [10.0, None]
+    assert table.schema.field("validation_date").type == pa.timestamp("us", tz="UTC")
+
+def test_read_of_unknown_type_is_empty(tmp_path):
+    assert ParquetExporter(tmp_path).read("market").num_rows == 0
+
+class FakeSQL:
+    """Serves validated rows in (updated_at, id) order after a watermark"""
+    def __init__(self, rows):
+        self.rows = sorted(rows, key=lambda row: (row["updated_at"], row["id"]))
+        self.calls = []
+
+    async def stream_validated_data(self, data_type, batch_size, updated_since=None, after_id=None,
+                                    updated_before=None):
+        self.calls.append((updated_since, after_id))
+        rows = [
+            row for row in self.rows
+            if (updated_since is None
+                or (row["updated_at"], row["id"]) > (updated_since, after_id or ""))
+            and (updated_before is None or row["updated_at"] < updated_before)
+        ]
+        for start in range(0, len(rows), batch_size):
+            yield rows[start:start + batch_size]
+
+def sql_row(row_id: str, updated_at: datetime) -> dict:
+    return {**validated(row_id, {"price": 1.0}).dict(), "id": row_id, "updated_at": updated_at}
+
+@pytest.mark.asyncio
+async def test_export_from_sql_resumes_from_the_last_row(tmp_path):
+    updated_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    # Rows written by one upsert share an updated_at
+    sql = FakeSQL([sql_row(f"id-{n}", updated_at) for n in range(5)])
+    exporter = ParquetExporter(tmp_path)
+
+    assert await exporter.export_from_sql(sql, "market", batch_size=2) == 5
+    assert exporter.manifest["watermarks"]["market"] == {"updated_at": updated_at.isoformat(), "id": "id-4"}
+
+    sql.rows.append(sql_row("id-5", updated_at))
+    sql.rows.append(sql_row("id-0", updated_at + timedelta(seconds=1)))
+    assert await ParquetExporter(tmp_path).export_from_sql(sql, "market") == 2
+    assert sql.calls[-1] == (updated_at, "id-4")
+
+@pytest.mark.asyncio
+async def test_export_from_sql_reads_legacy_watermarks(tmp_path):
+    exporter = ParquetExporter(tmp_path)
+    exporter.manifest["watermarks"]["market"] = "2024-05-01T00:00:00"
+    sql = FakeSQL([])
+
+    await exporter.export_from_sql(sql, "market")
+
+    assert sql.calls == [(datetime(2024, 5, 1, tzinfo=timezone.utc), None)]
+
+@pytest.mark.asyncio
+async def test_export_from_sql_leaves_recent_rows_for_the_next_export(tmp_path):
+    recent = utcnow() - timedelta(seconds=30)
+    # Written by an upsert that may not have committed everything yet
+    sql = FakeSQL([sql_row("old", recent - timedelta(hours=1)), sql_row("recent", recent)])
+
+    assert await ParquetExporter(tmp_path, export_lag=timedelta(minutes=5)).export_from_sql(sql, "market") == 1
+    assert await ParquetExporter(tmp_path, export_lag=timedelta(0)).export_from_sql(sql, "market") == 1
+    assert sorted(ParquetExporter(tmp_path).read("market").column("source_id").to_pylist()) == ["old", "recent"]
+
+def test_read_keeps_the_latest_export_of_each_row(tmp_path):
+    exporter = ParquetExporter(tmp_path)
+    first = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    exporter.export([
+        {**validated("a", {"price": 1.0}).dict(), "updated_at": first},
+        {**validated("b", {"price": 2.0}).dict(), "updated_at": first}
+    ])
+    exporter.export([{**validated("a", {"price": 3.0}).dict(), "updated_at": first + timedelta(hours=1)}])
+
+    latest = exporter.read("market", columns=["source_id", "feature_price"])
+
+    assert latest.to_pylist() == [
+        {"source_id": "b", "feature_price": 2.0}, {"source_id": "a", "feature_price": 3.0}
+    ]
+    assert exporter.read("market", all_versions=True).num_rows == 3
@@ -0,0 +1,45 @@
+from data.models.base import RawData, ValidatedData, QUEUE_EPOCH
+from data.models.records import RawRecord, ValidatedRecord
+import bson
+import json
+import pytest
+
+def test_raw_record_matches_the_pydantic_model():
+    record = RawRecord(source="news", data_type="text", content={"title": "a"})
+
+    model = record.to_model()
+
+    assert isinstance(model, RawData)
+    assert RawRecord.from_model(model) == record
+    assert record.to_document()["lease_expires_at"] == QUEUE_EPOCH
+    assert record.created_at.tzinfo is not None
+
+def test_documents_share_the_original_content():
+    content = {"title": "a"}
+    record = RawRecord(source="news", data_type="text", content=content)
+
+    assert record.to_document()["content"] is content
+    assert bson.decode(record.to_bson())["content"] == content
+    assert json.loads(record.to_json())["source"] == "news"
+
+def test_records_are_slotted():
+    record = RawRecord(source="news", data_type="text", content={})
+    with pytest.raises(AttributeError):
+        record.extra = 1
+
+def test_validation_can_be_skipped_for_trusted_producers():
+    with pytest.raises(ValueError):
+        RawRecord(source="news", data_type="text", content="not a dict")
+    assert RawRecord(source="news", data_type="text", content="trusted", validate=False).content == "trusted"
+
+def test_validated_record_round_trip():
+    record = ValidatedRecord(source_id="1", data_type="text", content={}, features={"n": 1.0},
+                             validation_score=0.9, validated_by="test")
+
+    model = record.to_model()
+
+    assert isinstance(model, ValidatedData)
+    assert ValidatedRecord.from_document(record.to_document()) == record
+    with pytest.raises(ValueError):
+        ValidatedRecord(source_id="1", data_type="text", content={}, features={},
+                        validation_score="high", validated_by="test")
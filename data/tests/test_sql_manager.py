@@ -0,0 +1,80 @@
+from data.database.sql_manager import SQLManager
+from data.models.base import ProcessedData, ValidatedData
+from data.models.tables import metadata
+import os
+import pytest
+import pytest_asyncio
+
+# Upserts rely on Postgres ON CONFLICT, so these tests need a real server
+POSTGRES_URL = os.getenv("DATA_TEST_POSTGRES_URL")
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(not POSTGRES_URL, reason="DATA_TEST_POSTGRES_URL is not set"),
+]
+
+@pytest_asyncio.fixture
+async def sql():
+    manager = SQLManager(POSTGRES_URL)
+    async with manager.engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+    await manager.create_tables()
+    yield manager
+    await manager.close()
+
+def processed(source_id: str, score: float = 1.0) -> ProcessedData:
+    return ProcessedData(source_id=source_id, data_type="text",
+                         content={"title": source_id}, features={"score": score})
+
+@pytest.mark.asyncio
+async def test_upsert_inserts_then_updates_in_place(sql):
+    first = await sql.store_processed_data_many([processed("a"), processed("b")])
+    second = await sql.store_processed_data_many([processed("a", score=2.0)])
+
+    assert set(first) == {"a", "b"}
+    assert second["a"] == first["a"]
+    rows = [row async for batch in sql.stream_processed_data("text") for row in batch]
+    assert len(rows) == 2
+    assert {row["source_id"]: row["features"]["score"] for row in rows} == {"a": 2.0, "b": 1.0}
+
+@pytest.mark.asyncio
+async def test_upsert_keeps_last_record_per_key_and_chunks_statements(sql):
+    records = [processed(str(n % 250), score=n) for n in range(500)]
+
+    stored = await sql.store_processed_data_many(records, batch_size=100)
+
+    assert len(stored) == 250
+    rows = [row async for batch in sql.stream_processed_data("text", batch_size=100) for row in batch]
+    assert len(rows) == 250
+    assert {row["source_id"]: row["features"]["score"] for row in rows}["0"] == 250
+    assert all(row["updated_at"].tzinfo is not None for row in rows)
+
+def validated(source_id: str) -> ValidatedData:
+    return ValidatedData(source_id=source_id, data_type="text", content={}, features={},
+                         validation_score=0.9, validated_by="test")
+
+@pytest.mark.asyncio
+async def test_validated_stream_is_ordered_and_resumable_within_a_timestamp(sql):
+    await sql.store_validated_data_many([validated(str(n)) for n in range(10)])
+    await sql.store_validated_data_many([validated("late")])
+
+    rows = [row async for batch in sql.stream_validated_data("text", batch_size=4) for row in batch]
+    keys = [(row["updated_at"], row["id"]) for row in rows]
+    assert keys == sorted(keys)
+    assert rows[-1]["source_id"] == "late"
+
+    # Resume after the fourth row: the rest of its upsert shares its updated_at
+    resumed = [
+        row async for batch in sql.stream_validated_data(
+            "text", updated_since=rows[3]["updated_at"], after_id=rows[3]["id"]
+        ) for row in batch
+    ]
+    assert [row["id"] for row in resumed] == [row["id"] for row in rows[4:]]
+
+    # Rows updated at or after the cutoff are left out
+    settled = [
+        row async for batch in sql.stream_validated_data(
+            "text", updated_before=rows[-1]["updated_at"]
+        ) for row in batch
+    ]
+    assert [row["source_id"] for row in settled] == [row["source_id"] for row in rows[:-1]]
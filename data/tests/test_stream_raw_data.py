@@ -0,0 +1,45 @@
+from data.models.records import RawRecord
+import pytest
+
+async def store(mongo, count: int):
+    records = [RawRecord(source="news", data_type="text", content={"n": n}) for n in range(count)]
+    await mongo.store_raw_data_many(records)
+
+async def collect(stream):
+    return [batch async for batch in stream]
+
+@pytest.mark.asyncio
+async def test_stream_yields_bounded_batches_in_id_order(mongo):
+    await store(mongo, 25)
+
+    batches = await collect(mongo.stream_raw_data("text", {}, batch_size=10))
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    ids = [document["_id"] for batch in batches for document in batch]
+    assert ids == sorted(ids)
+
+@pytest.mark.asyncio
+async def test_stream_resumes_after_last_id(mongo):
+    await store(mongo, 25)
+    first = await collect(mongo.stream_raw_data("text", {}, batch_size=10))
+
+    resumed = await collect(mongo.stream_raw_data(
+        "text", {}, batch_size=10, resume_after=first[0][-1]["_id"]
+    ))
+
+    assert [document["content"]["n"] for batch in resumed for document in batch] == list(range(10, 25))
+
+@pytest.mark.asyncio
+async def test_stream_applies_query_and_projection(mongo):
+    await store(mongo, 10)
+
+    batches = await collect(mongo.stream_raw_data(
+        "text", {"content.n": {"$gte": 7}}, projection={"content": 1}
+    ))
+
+    assert [sorted(document) for document in batches[0]] == [["_id", "content"]] * 3
+
+@pytest.mark.asyncio
+async def test_stream_requires_id_in_projection(mongo):
+    with pytest.raises(ValueError):
+        await collect(mongo.stream_raw_data("text", {}, projection={"_id": 0}))
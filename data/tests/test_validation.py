@@ -0,0 +1,78 @@
+from data.models.base import ProcessedData
+from data.models.records import RawRecord
+from data.utils.validation import DataValidator, ValidationBitmap, compile_schema
+import json
+import jsonschema
+import numpy as np
+import pytest
+
+SCHEMA = {
+    "type": "object",
+    "required": ["source", "data_type", "content"],
+    "properties": {"content": {"type": "object", "required": ["title"]}}
+}
+
+@pytest.fixture
+def validator(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(SCHEMA))
+    return DataValidator(str(path), quality_rules={
+        "market": {"required_features": ["price", "volume"], "ranges": {"price": [0, 1000]}}
+    })
+
+def test_compiled_validators_are_shared_per_schema():
+    assert compile_schema(dict(SCHEMA)) is compile_schema(json.loads(json.dumps(SCHEMA)))
+    with pytest.raises(jsonschema.exceptions.SchemaError):
+        compile_schema({"type": "not-a-type"})
+
+def test_bitmap_records_failures():
+    bitmap = ValidationBitmap()
+    for invalid in [False, True, False] * 4:
+        bitmap.append(invalid)
+
+    assert len(bitmap) == 12
+    assert bitmap.invalid_count == 4
+    assert list(bitmap.invalid_indexes()) == [1, 4, 7, 10]
+    with pytest.raises(IndexError):
+        bitmap[12]
+
+@pytest.mark.parametrize("processes", [0, 2])
+def test_validate_many_flags_invalid_records(validator, processes):
+    records = [
+        RawRecord(source="news", data_type="text", content={"title": "ok"} if n % 3 else {})
+        for n in range(30)
+    ]
+
+    bitmap = validator.validate_many(records, processes=processes, chunk_size=7)
+
+    assert list(bitmap.invalid_indexes()) == list(range(0, 30, 3))
+
+def test_quality_scores_penalise_missing_and_out_of_range_features(validator):
+    records = [
+        ProcessedData(source_id=str(n), data_type="market", content={},
+                      features={"price": 100.0 + n, "volume": 10.0})
+        for n in range(5)
+    ]
+    records.append(ProcessedData(source_id="missing", data_type="market", content={},
+                                 features={"price": 5000.0}))
+
+    scores = validator.score_processed_data(records)
+    validated, rejected = validator.promote_processed_data(records)
+
+    assert np.allclose(scores[:5], 1.0)
+    assert scores[5] < validator.min_quality_score
+    assert [record.source_id for record in rejected] == ["missing"]
+    assert all(record.validation_status == "validated" for record in validated)
+
+def test_outliers_lower_the_score(validator):
+    records = [
+        ProcessedData(source_id=str(n), data_type="text", content={}, features={"length": 100.0 + n})
+        for n in range(10)
+    ]
+    records.append(ProcessedData(source_id="outlier", data_type="text", content={},
+                                 features={"length": 100000.0}))
+
+    scores = validator.score_processed_data(records)
+
+    assert np.allclose(scores[:10], 1.0)
+    assert scores[10] == pytest.approx(0.8)
@@ -0,0 +1,85 @@
+from data.database.work_queue import RawDataWorkQueue
+from data.models.base import ProcessingStatus, QUEUE_EPOCH, utcnow
+from data.models.records import RawRecord
+from datetime import timedelta
+import pytest
+
+async def enqueue(mongo, count: int):
+    records = [RawRecord(source="news", data_type="text", content={"n": n}) for n in range(count)]
+    report = await mongo.store_raw_data_many(records)
+    return report.inserted_ids
+
+@pytest.mark.asyncio
+async def test_claims_are_exclusive_until_the_lease_expires(mongo):
+    await enqueue(mongo, 3)
+    first = RawDataWorkQueue(mongo, "text", worker_id="a")
+    second = RawDataWorkQueue(mongo, "text", worker_id="b")
+
+    claimed = await first.claim_many(10)
+
+    assert len(claimed) == 3
+    assert {document["claimed_by"] for document in claimed} == {"a"}
+    assert all(document["lease_expires_at"] > utcnow() for document in claimed)
+    assert await second.claim() is None
+
+    # A crashed worker's documents become claimable once its lease runs out
+    await mongo.db["raw_text"].update_many({}, {"$set": {"lease_expires_at": utcnow() - timedelta(seconds=1)}})
+    reclaimed = await second.claim()
+    assert reclaimed["claimed_by"] == "b"
+    assert reclaimed["attempts"] == 2
+
+@pytest.mark.asyncio
+async def test_ack_marks_owned_documents_processed(mongo):
+    await enqueue(mongo, 2)
+    queue = RawDataWorkQueue(mongo, "text", worker_id="a")
+    other = RawDataWorkQueue(mongo, "text", worker_id="b")
+    first, second = await queue.claim_many(2)
+
+    assert await other.ack({str(first["_id"]): "p-0"}) == 0
+    assert await queue.ack({str(first["_id"]): "p-1", str(second["_id"]): "p-2"}) == 2
+
+    document = await mongo.db["raw_text"].find_one({"_id": first["_id"]})
+    assert document["status"] == ProcessingStatus.PROCESSED.value
+    assert document["processed_id"] == "p-1"
+    assert document["lease_expires_at"] is None
+    assert document["processed_at"].tzinfo is not None
+    assert await queue.claim() is None
+
+@pytest.mark.asyncio
+async def test_extend_lease_only_touches_own_claims(mongo):
+    await enqueue(mongo, 1)
+    queue = RawDataWorkQueue(mongo, "text", worker_id="a", lease_seconds=60)
+    document = await queue.claim()
+
+    assert await RawDataWorkQueue(mongo, "text", worker_id="b").extend_lease([document["_id"]]) == 0
+    queue.lease = timedelta(hours=1)
+    assert await queue.extend_lease([str(document["_id"])]) == 1
+
+    stored = await mongo.db["raw_text"].find_one({"_id": document["_id"]})
+    assert stored["lease_expires_at"] > utcnow() + timedelta(minutes=59)
+
+@pytest.mark.asyncio
+async def test_release_retries_then_fails_out_of_attempts(mongo):
+    await enqueue(mongo, 1)
+    queue = RawDataWorkQueue(mongo, "text", worker_id="a", max_attempts=2)
+
+    document = await queue.claim()
+    assert await queue.release([document["_id"]], error="timeout") == 1
+    stored = await mongo.db["raw_text"].find_one({"_id": document["_id"]})
+    assert stored["status"] == ProcessingStatus.PENDING.value
+    assert stored["lease_expires_at"] == QUEUE_EPOCH
+
+    document = await queue.claim()
+    await queue.release([document["_id"]], error="timeout")
+    stored = await mongo.db["raw_text"].find_one({"_id": document["_id"]})
+    assert stored["status"] == ProcessingStatus.FAILED.value
+    assert stored["last_error"] == "timeout"
+    assert await queue.claim() is None
+
+@pytest.mark.asyncio
+async def test_enqueue_unqueued_picks_up_legacy_documents(mongo):
+    await mongo.db["raw_text"].insert_many([{"content": {"n": 1}}, {"content": {"n": 2}, "processed": True}])
+    queue = RawDataWorkQueue(mongo, "text")
+
+    assert await queue.enqueue_unqueued() == 1
+    assert (await queue.claim())["content"] == {"n": 1}
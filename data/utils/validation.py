@@ -1,26 +1,214 @@
-from typing import Dict, Any, Tuple, Optional
-from ..models.base import RawData, ProcessedData
+from typing import Dict, Any, Tuple, Optional, List, Iterable, Iterator, Union
+from concurrent.futures import ProcessPoolExecutor
+from ..models.base import RawData, ProcessedData, ValidatedData
+from ..models.records import RawRecord, AnyRawData
+from collections import deque
+from itertools import islice
+import hashlib
 import json
 import jsonschema
 import logging
+import numpy as np
+import pandas as pd
+
+# Compiled validators shared by every DataValidator in the process
+_VALIDATOR_CACHE: Dict[str, Any] = {}
+
+def schema_hash(schema: Dict[str, Any]) -> str:
+    """Stable hash of a JSON schema"""
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()
+
+def compile_schema(schema: Dict[str, Any]):
+    """Check a schema once and return a cached validator instance for it"""
+    key = schema_hash(schema)
+    validator = _VALIDATOR_CACHE.get(key)
+    if validator is None:
+        validator_class = jsonschema.validators.validator_for(schema)
+        validator_class.check_schema(schema)
+        validator = _VALIDATOR_CACHE[key] = validator_class(schema)
+    return validator
+
+# Weights of the quality components, overridable per data_type
+DEFAULT_QUALITY_WEIGHTS = {"completeness": 0.5, "range": 0.3, "outlier": 0.2}
+
+def _invalid_indexes(schema: Dict[str, Any], instances: List[Dict[str, Any]]) -> List[int]:
+    validator = compile_schema(schema)
+    return [index for index, instance in enumerate(instances) if not validator.is_valid(instance)]
+
+class ValidationBitmap:
+    """One bit per validated record, set when the record failed validation"""
+
+    def __init__(self):
+        self.bits = bytearray()
+        self.size = 0
+        self.invalid_count = 0
+
+    def append(self, invalid: bool):
+        if self.size % 8 == 0:
+            self.bits.append(0)
+        if invalid:
+            self.bits[-1] |= 1 << (self.size % 8)
+            self.invalid_count += 1
+        self.size += 1
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> bool:
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        return bool(self.bits[index // 8] & (1 << (index % 8)))
+
+    def invalid_indexes(self) -> Iterator[int]:
+        return (index for index in range(self.size) if self[index])
 
 class DataValidator:
-    def __init__(self, schema_path: str):
+    def __init__(self, schema_path: str, quality_rules: Optional[Dict[str, Dict]] = None,
+                 min_quality_score: float = 0.7, outlier_threshold: float = 3.5):
         self.logger = logging.getLogger(__name__)
         with open(schema_path) as f:
             self.schema = json.load(f)
+        self.validator = compile_schema(self.schema)
+        # Per data_type: required_features, ranges {feature: [min, max]},
+        # weights and min_score
+        self.quality_rules = quality_rules or {}
+        self.min_quality_score = min_quality_score
+        self.outlier_threshold = outlier_threshold
     
     def validate_raw_data(self, data: RawData) -> Tuple[bool, Optional[str]]:
         """Validate raw data against schema"""
-        try:
-            jsonschema.validate(instance=data.dict(), schema=self.schema)
+        error = jsonschema.exceptions.best_match(self.validator.iter_errors(data.dict()))
+        if error is None:
             return True, None
-        except jsonschema.exceptions.ValidationError as e:
-            self.logger.error(f"Validation error: {str(e)}")
-            return False, str(e)
+        self.logger.error(f"Validation error: {str(error)}")
+        return False, str(error)
+    
+    def validate_many(self, records: Iterable[Union[AnyRawData, Dict[str, Any]]],
+                      processes: int = 0, chunk_size: int = 1000) -> ValidationBitmap:
+        """Validate a list or stream of raw data, returning a bitmap of failures.
+        
+        With ``processes`` > 0 the records are validated in chunks across a
+        process pool, which pays off once batches reach tens of thousands.
+        """
+        instances = (
+            record.dict() if isinstance(record, (RawData, RawRecord)) else record
+            for record in records
+        )
+        bitmap = ValidationBitmap()
+        if processes > 0:
+            self._validate_parallel(instances, bitmap, processes, chunk_size)
+        else:
+            for instance in instances:
+                bitmap.append(not self.validator.is_valid(instance))
+        if bitmap.invalid_count:
+            self.logger.error(f"{bitmap.invalid_count} of {len(bitmap)} records failed validation")
+        return bitmap
+    
+    def _validate_parallel(self, instances: Iterator[Dict[str, Any]], bitmap: ValidationBitmap,
+                           processes: int, chunk_size: int):
+        # Keep a bounded number of chunks in flight so streams are not
+        # materialized, and collect results in submission order
+        pending = deque()
+        chunks = iter(lambda: list(islice(instances, chunk_size)), [])
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            for chunk in chunks:
+                pending.append((len(chunk), executor.submit(_invalid_indexes, self.schema, chunk)))
+                if len(pending) > processes * 2:
+                    self._collect_chunk(*pending.popleft(), bitmap)
+            while pending:
+                self._collect_chunk(*pending.popleft(), bitmap)
+    
+    @staticmethod
+    def _collect_chunk(length: int, future, bitmap: ValidationBitmap):
+        invalid = set(future.result())
+        for index in range(length):
+            bitmap.append(index in invalid)
     
     def validate_processed_data(self, data: ProcessedData) -> Tuple[bool, float]:
         """Validate processed data and return quality score"""
-        # Implement validation logic based on data type
-        # Return validation success and quality score
-        raise NotImplementedError
+        score = float(self.score_processed_data([data])[0])
+        return score >= self._min_score(data.data_type), score
+    
+    def promote_processed_data(self, records: List[ProcessedData],
+                               validated_by: str = "data_validator"
+                               ) -> Tuple[List[ValidatedData], List[ProcessedData]]:
+        """Score a batch and split it into validated and rejected records"""
+        scores = self.score_processed_data(records)
+        validated, rejected = [], []
+        for record, score in zip(records, scores):
+            if score >= self._min_score(record.data_type):
+                validated.append(ValidatedData(
+                    **{**record.dict(), "validation_status": "validated"},
+                    validation_score=float(score),
+                    validated_by=validated_by
+                ))
+            else:
+                record.validation_status = "rejected"
+                rejected.append(record)
+        return validated, rejected
+    
+    def score_processed_data(self, records: List[ProcessedData]) -> np.ndarray:
+        """Quality score in [0, 1] for each record, computed per data_type in one pass.
+        
+        The score is a weighted mean of completeness (share of required
+        features present), range (share of numeric features inside the
+        configured bounds) and outlier (share of numeric features within
+        ``outlier_threshold`` robust z-scores of the batch median).
+        """
+        scores = np.ones(len(records))
+        if not records:
+            return scores
+        features = pd.DataFrame.from_records([record.features for record in records])
+        data_types = pd.Series([record.data_type for record in records])
+        for data_type, index in data_types.groupby(data_types).groups.items():
+            positions = np.asarray(index)
+            group = features.iloc[positions].dropna(axis=1, how="all")
+            scores[positions] = self._score_group(group, self.quality_rules.get(data_type, {}))
+        return scores
+    
+    def _score_group(self, group: pd.DataFrame, rules: Dict[str, Any]) -> np.ndarray:
+        required = rules.get("required_features", list(group.columns))
+        completeness = np.ones(len(group))
+        if required:
+            completeness = group.reindex(columns=required).notna().mean(axis=1).to_numpy()
+        
+        numeric = group.apply(pd.to_numeric, errors="coerce").dropna(axis=1, how="all")
+        values = numeric.to_numpy(dtype=float)
+        present = ~np.isnan(values)
+        
+        range_score = np.ones(len(group))
+        ranges = {name: bounds for name, bounds in rules.get("ranges", {}).items() if name in numeric}
+        if ranges:
+            bounded = numeric[list(ranges)].to_numpy(dtype=float)
+            lows, highs = np.array(list(ranges.values()), dtype=float).T
+            range_score = self._share(
+                (bounded >= lows) & (bounded <= highs),
+                ~np.isnan(bounded)
+            )
+        
+        outlier_score = np.ones(len(group))
+        if values.size and len(group) > 1:
+            median = np.nanmedian(values, axis=0)
+            deviation = np.abs(values - median)
+            mad = np.nanmedian(deviation, axis=0) * 1.4826
+            with np.errstate(divide="ignore", invalid="ignore"):
+                z = np.where(mad > 0, deviation / mad, np.where(deviation > 0, np.inf, 0.0))
+            outlier_score = self._share(z <= self.outlier_threshold, present)
+        
+        weights = {**DEFAULT_QUALITY_WEIGHTS, **rules.get("weights", {})}
+        total = sum(weights.values())
+        return (
+            weights["completeness"] * completeness
+            + weights["range"] * range_score
+            + weights["outlier"] * outlier_score
+        ) / total
+    
+    @staticmethod
+    def _share(passed: np.ndarray, present: np.ndarray) -> np.ndarray:
+        # Share of present values that passed; rows with nothing to check score 1
+        counts = present.sum(axis=1)
+        hits = (passed & present).sum(axis=1)
+        return np.divide(hits, counts, out=np.ones(len(counts)), where=counts > 0)
+    
+    def _min_score(self, data_type: str) -> float:
+        return self.quality_rules.get(data_type, {}).get("min_score", self.min_quality_score)